@@ -0,0 +1,76 @@
+"""
+Compara o caminho por objetos (CsvDto) com o dataset colunar: tempo total e pico de memória (RSS).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_columnar --rows 5000000
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_catalog import generate_catalog
+
+def _digest(results) -> str:
+    return hashlib.sha1(json.dumps(results, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _run_path(path: str, csv_path: str) -> dict:
+    logging.disable(logging.CRITICAL)
+    start = time.perf_counter()
+    if path == "dto":
+        from src.models.model import read_csv_to_dto
+        from src.utils.aggregator import aggregate
+        results = aggregate(read_csv_to_dto(csv_path))
+    else:
+        from src.models.columnar import read_csv_to_columnar
+        from src.utils.vectorized import aggregate_columnar
+        results = aggregate_columnar(read_csv_to_columnar(csv_path))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "path": path,
+        "seconds": round(elapsed, 3),
+        # ru_maxrss é informado em KiB no Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "digest": _digest(results),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--csv", help="Usa um CSV existente em vez de gerar um catálogo sintético.")
+    parser.add_argument("--child", choices=("dto", "columnar"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_path(args.child, args.csv)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = args.csv
+        if not csv_path:
+            csv_path = os.path.join(tmp_dir, "catalog.csv")
+            print(f"Gerando catálogo sintético com {args.rows} linhas...")
+            generate_catalog(csv_path, args.rows)
+
+        # Cada caminho roda em um processo próprio para que o pico de RSS não se misture
+        reports = []
+        for path in ("dto", "columnar"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_columnar", "--child", path, "--csv", csv_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            reports.append(json.loads(output.strip().splitlines()[-1]))
+
+    for report in reports:
+        print(f"{report['path']:>9}: {report['seconds']:>9.3f} s  pico RSS {report['peak_rss_mb']:>9.1f} MB")
+    print("Resultados idênticos:", reports[0]["digest"] == reports[1]["digest"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Mede o custo por linha do CsvDto: memória retida após a carga (tracemalloc) e tempo de leitura,
+comparando com um DTO de referência com um dicionário por objeto (o formato anterior, em que
+as colunas ficavam como texto e eram convertidas a cada análise).
+
+O tempo das análises sobre o CsvDto também é informado; para comparar com uma versão anterior
+do projeto, use `python -m benchmarks.bench_suite --baseline`.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_dto --rows 200000
+"""
+import argparse
+import csv
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic_catalog import generate_catalog
+
+class DictDto:
+    """DTO de referência: um dicionário por objeto e todas as colunas como texto."""
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        if hasattr(self, 'cast'):
+            self.cast = self.cast.split(", ") if self.cast else []
+
+def _load(csv_path: str, factory: Callable[..., Any]) -> List[Any]:
+    with open(csv_path, mode='r', encoding='utf-8') as csvfile:
+        return [factory(**row) for row in csv.DictReader(csvfile)]
+
+def measure_load(csv_path: str, factory: Callable[..., Any]) -> Dict[str, Any]:
+    """Carrega o CSV com `factory` e mede o tempo e a memória retida pelas linhas."""
+    gc.collect()
+    start = time.perf_counter()
+    rows = _load(csv_path, factory)
+    seconds = time.perf_counter() - start
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = _load(csv_path, factory)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(seconds, 3),
+        "retained_mb": round(retained / 2 ** 20, 1),
+        "bytes_per_row": round(retained / len(rows)) if rows else None,
+        "rows": rows,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--csv", help="Usa um CSV existente em vez de gerar um catálogo sintético.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.models.model import CsvDto
+    from src.utils.aggregator import aggregate
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = args.csv
+        if not csv_path:
+            csv_path = os.path.join(tmp_dir, "catalog.csv")
+            print(f"Gerando catálogo sintético com {args.rows} linhas...")
+            generate_catalog(csv_path, args.rows, args.seed)
+
+        reference = measure_load(csv_path, DictDto)
+        del reference["rows"]
+        current = measure_load(csv_path, CsvDto)
+        dtos = current.pop("rows")
+
+        gc.collect()
+        start = time.perf_counter()
+        aggregate(dtos)
+        analysis_seconds = time.perf_counter() - start
+
+    for name, report in (("dict", reference), ("CsvDto", current)):
+        print(f"{name:>7}: carga {report['seconds']:>8.3f} s  retido {report['retained_mb']:>8.1f} MB  "
+              f"{report['bytes_per_row']:>6} bytes/linha")
+    if reference["bytes_per_row"]:
+        print(f"Economia de memória por linha: {(1 - current['bytes_per_row'] / reference['bytes_per_row']) * 100:.0f}%")
+    print(f"Análises (aggregate) sobre o CsvDto: {analysis_seconds:.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Compara o pico de memória e o tempo do relatório Excel:
+
+- o escritor anterior (`pd.ExcelWriter` em modo normal, com a lista de títulos inteira em uma célula);
+- o mesmo conteúdo do relatório atual (planilhas em formato longo) gravado com o workbook em memória;
+- o escritor em streaming (`src.services.excel_renderer`, workbook write-only).
+
+As seções são montadas a partir de resultados sintéticos com `--titles` títulos, distribuídos
+pelas classificações e por até três países cada (o mesmo formato de `count_titles_by_rating` e
+`count_titles_by_country`). Cada escritor roda em um processo próprio, criado depois das seções,
+e o pico medido é só o do escritor: RSS acima da base e, com `--tracemalloc`, a memória alocada
+pelo Python (bem mais lento).
+
+O escritor anterior trunca as células com mais de 32.767 caracteres (limite do xlsx): com muitos
+títulos, a maior parte das listas não chega à planilha.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_excel --titles 1000000
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks.synthetic_catalog import RATINGS
+from src.services.excel_renderer import EXCEL_LIST_COLUMNS, EXCEL_MAX_ROWS, create_excel_report
+from src.services.report_generator import build_sections
+
+def legacy_excel_report(sections: Dict[str, pd.DataFrame], excel_path: str) -> None:
+    # Implementação anterior: workbook completo em memória e dicionários inteiros nas células
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Aviso de célula truncada, um por célula
+        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+            for title, df in sections.items():
+                df.to_excel(writer, sheet_name=title, index=False)
+
+def in_memory_long_report(sections: Dict[str, pd.DataFrame], excel_path: str) -> None:
+    # Mesmas planilhas do escritor em streaming, mas com o workbook inteiro em memória até o fim
+    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+        for title, df in sections.items():
+            list_columns = [column for column in df.columns if column in EXCEL_LIST_COLUMNS]
+            df.drop(columns=list_columns).to_excel(writer, sheet_name=title, index=False)
+            for list_column in list_columns:
+                key_column = df.columns[0]
+                long_df = df[[key_column, list_column]].assign(
+                    **{list_column: df[list_column].map(lambda titles: list(titles.values()))}
+                ).explode(list_column).rename(columns={list_column: 'title'})
+                # Acima do limite de linhas do xlsx, continua em outra planilha, como o escritor em streaming
+                rows_per_sheet = EXCEL_MAX_ROWS - 1
+                for part, start in enumerate(range(0, len(long_df), rows_per_sheet), start=1):
+                    name = f"{title} - {list_column.capitalize()}" + (f" ({part})" if part > 1 else "")
+                    long_df.iloc[start:start + rows_per_sheet].to_excel(writer, sheet_name=name[:31], index=False)
+
+def synthetic_results(titles: int, countries: int, seed: int) -> Dict[str, Any]:
+    """Resultados das análises com `titles` títulos, só com as seções que crescem com o catálogo preenchidas."""
+    rng = random.Random(seed)
+    by_rating: Dict[str, List[str]] = {rating or "Unknown": [] for rating in RATINGS}
+    by_country: Dict[str, List[str]] = {f"Country {i}": [] for i in range(countries)}
+    country_names = list(by_country)
+    for i in range(titles):
+        title = f"Title {i}"
+        by_rating[rng.choice(list(by_rating))].append(title)
+        for country in rng.sample(country_names, rng.randint(1, 3)):
+            by_country[country].append(title)
+
+    return {
+        'columns': ['show_id', 'type', 'title'],
+        'total_movies': {'count': titles, 'percentage': 100.0},
+        'directors': [],
+        'directors_actors': [],
+        'total_series': {'count': 0, 'percentage': 0.0},
+        'total_by_years': [],
+        'titles_by_rating': [
+            {'rating': rating, 'total': len(items), 'titles': dict(enumerate(items))}
+            for rating, items in by_rating.items()
+        ],
+        'longest_movies': [],
+        'longest_series': [],
+        'titles_by_country': [
+            {'country': country, 'total': len(items), 'percentage': round(len(items) * 100 / titles, 2),
+             'titles': dict(enumerate(items))}
+            for country, items in by_country.items()
+        ],
+    }
+
+def _measure(writer: Callable[..., None], sections: Dict[str, pd.DataFrame], path: str, trace: bool, queue) -> None:
+    # Executado em um processo filho (fork): as seções já estão na memória herdada, e o pico de RSS
+    # do processo começa no RSS atual
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        writer(sections, path)
+    except Exception as e:
+        queue.put({'error': str(e)})
+        return
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else None
+    tracemalloc.stop()
+    queue.put({
+        'seconds': round(seconds, 2),
+        'peak_mb': round(peak / 2 ** 20, 1) if trace else None,
+        'rss_mb': round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024, 1),
+        'file_mb': round(os.path.getsize(path) / 2 ** 20, 1),
+    })
+
+def measure(writer: Callable[..., None], sections: Dict[str, pd.DataFrame], path: str, trace: bool) -> Dict[str, Any]:
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(writer, sections, path, trace, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--countries", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-legacy", action="store_true", help="Mede apenas o escritor em streaming.")
+    parser.add_argument("--skip-in-memory", action="store_true", help="Não mede o formato longo em memória (o mais pesado).")
+    parser.add_argument("--tracemalloc", action="store_true", help="Mede também o pico de memória alocada pelo Python.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"Montando as seções com {args.titles} títulos...")
+    sections = build_sections(**synthetic_results(args.titles, args.countries, args.seed))
+
+    writers = {}
+    if not args.skip_legacy:
+        writers["anterior (uma célula)"] = legacy_excel_report
+    if not args.skip_in_memory:
+        writers["formato longo em memória"] = in_memory_long_report
+    writers["streaming (write-only)"] = create_excel_report
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, writer in writers.items():
+            result = measure(writer, sections, os.path.join(tmp_dir, "report.xlsx"), args.tracemalloc)
+            if 'error' in result:
+                print(f"{name:>26}: erro: {result['error']}")
+                continue
+            traced = f"  tracemalloc {result['peak_mb']:>8.1f} MB" if args.tracemalloc else ""
+            print(f"{name:>26}: {result['seconds']:>8.2f} s  RSS +{result['rss_mb']:>8.1f} MB{traced}  "
+                  f"arquivo {result['file_mb']:>6.1f} MB")
+
+if __name__ == "__main__":
+    main()
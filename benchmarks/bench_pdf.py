@@ -0,0 +1,65 @@
+"""
+Compara a renderização antiga do PDF (uma pdf.cell por linha, via df.iterrows) com o
+renderizador em tabela, para uma seção grande.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_pdf --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from src.services.pdf_renderer import PDF_FONT_FAMILY, PDF_FONT_PATH, clean_text, create_pdf_report
+
+def legacy_pdf_report(data_dict: dict, pdf_path: str) -> None:
+    # Implementação anterior: uma célula por linha
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.add_font(PDF_FONT_FAMILY, "", PDF_FONT_PATH)
+    pdf.set_font(PDF_FONT_FAMILY, "", 12)
+    for title, df in data_dict.items():
+        pdf.cell(0, 10, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        pdf.ln(5)
+        for index, row in df.iterrows():
+            row_str = ' | '.join(str(item) for item in row)
+            pdf.cell(0, 10, clean_text(row_str), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(10)
+    pdf.output(pdf_path)
+
+def _timed(function, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--uncapped", action="store_true", help="Também mede a tabela sem limite de linhas.")
+    args = parser.parse_args()
+
+    section = pd.DataFrame({
+        "country": [f"Country {i % 120}" for i in range(args.rows)],
+        "total": list(range(args.rows)),
+        "titles": [f"{{0: 'Title {i}', 1: 'Título {i + 1}'}}" for i in range(args.rows)],
+    })
+    data = {"Titles by Country": section}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {
+            "legado (cell por linha)": _timed(legacy_pdf_report, data, os.path.join(tmp_dir, "legacy.pdf")),
+            "tabela": _timed(create_pdf_report, data, os.path.join(tmp_dir, "table.pdf")),
+        }
+        if args.uncapped:
+            results["tabela sem limite"] = _timed(create_pdf_report, data, os.path.join(tmp_dir, "full.pdf"), max_rows=None)
+
+    for name, seconds in results.items():
+        print(f"{name:>26}: {seconds:8.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Teste de carga do modo serviço (`python main.py --serve`).
+
+Dispara consultas variadas (métricas, filtros, top_n diferentes, pessoas) a partir de várias
+threads, cada uma com uma conexão HTTP/1.1 mantida aberta, durante `--duration` segundos, e
+mostra as requisições por segundo e a latência (p50, p95, p99 e máxima).
+
+Sem `--url`, um serviço é iniciado em um processo separado sobre um catálogo sintético de
+`--rows` títulos (em um diretório temporário) e encerrado no final.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_service --rows 100000 --concurrency 8 --duration 10
+    python -m benchmarks.bench_service --url http://127.0.0.1:8080
+"""
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import List, Tuple
+from urllib.parse import quote, urlsplit
+
+from benchmarks.synthetic_catalog import RATINGS, generate_catalog
+
+def _paths(rng: random.Random, directors: List[str], actors: List[str]) -> List[str]:
+    """Consultas do teste: um mesmo caminho repete com frequência (cache) e os parâmetros variam."""
+    paths = [
+        "/health",
+        "/metrics",
+        "/metrics/titles_by_rating",
+        "/people/directors_as_actors",
+    ]
+    for _ in range(50):
+        top_n = rng.choice((5, 10, 20, 50))
+        paths.append(f"/directors?top_n={top_n}")
+        paths.append(f"/longest/movies?top_n={top_n}")
+        paths.append(f"/people/prolific?top_n={top_n}")
+        paths.append(f"/count?type=Movie&year_added={rng.randrange(2008, 2022)}&group_by=rating")
+        paths.append(f"/titles?rating={quote(rng.choice(RATINGS))}&month_added={rng.randrange(1, 13)}&limit=20")
+        if directors:
+            paths.append(f"/titles?director={quote(rng.choice(directors))}")
+        if actors:
+            paths.append(f"/people/titles?name={quote(rng.choice(actors))}")
+    return paths
+
+def _get(connection: http.client.HTTPConnection, path: str) -> Tuple[int, bytes]:
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+def _worker(host: str, port: int, paths: List[str], deadline: float, seed: int,
+            latencies: List[float], errors: List[int]) -> None:
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        start = time.perf_counter()
+        try:
+            status, _ = _get(connection, path)
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            status = 0
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+    connection.close()
+
+def _percentile(values: List[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))] if values else 0.0
+
+def _serve(raw_dir: str, cache_dir: str, port: int, connection: "multiprocessing.connection.Connection") -> None:
+    from src.services.catalog_service import serve
+
+    logging.disable(logging.CRITICAL)
+    # A porta reservada (escolhida pelo sistema com a porta 0) volta para o processo do teste
+    serve(port=port, raw_dir=raw_dir, cache_dir=cache_dir, ready=connection.send)
+
+def _wait_ready(server: multiprocessing.Process, connection: "multiprocessing.connection.Connection",
+                host: str, timeout: float) -> int:
+    """
+    Aguarda o serviço reservar a porta e carregar o snapshot e retorna a porta. Falha assim que o
+    processo do serviço terminar (por exemplo, porta em uso: o erro aparece na saída do processo).
+    """
+    deadline = time.monotonic() + timeout
+    port = None
+    while time.monotonic() < deadline:
+        if not server.is_alive():
+            raise RuntimeError(f"O processo do serviço terminou (código {server.exitcode}) antes de ficar pronto")
+        if port is None:
+            if connection.poll(0.2):
+                port = connection.recv()
+            continue
+        try:
+            client = http.client.HTTPConnection(host, port, timeout=1)
+            status, body = _get(client, "/health")
+            client.close()
+            if status == 200 and json.loads(body)["snapshot"] is not None:
+                return port
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Serviço não respondeu em {timeout} s")
+
+def run(host: str, port: int, concurrency: int, duration: float, seed: int) -> None:
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    # Nomes reais do catálogo servido, para as consultas por diretor e por pessoa
+    _, body = _get(connection, "/directors?top_n=200")
+    directors = [item["director"] for item in json.loads(body)]
+    _, body = _get(connection, "/people/prolific?top_n=200")
+    actors = [item["actor"] for item in json.loads(body)]
+    connection.close()
+    paths = _paths(random.Random(seed), directors, actors)
+
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, paths, deadline, seed + i, latencies, errors))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{'requisições':>14}: {len(latencies)} ({len(errors)} com erro) em {elapsed:.1f} s, {concurrency} conexões")
+    print(f"{'req/s':>14}: {len(latencies) / elapsed:.0f}")
+    print(
+        f"{'latência':>14}: p50 {_percentile(latencies, 50) * 1000:.2f} ms"
+        f"  p95 {_percentile(latencies, 95) * 1000:.2f} ms"
+        f"  p99 {_percentile(latencies, 99) * 1000:.2f} ms"
+        f"  máx {latencies[-1] * 1000 if latencies else 0:.2f} ms"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Serviço já em execução (por padrão, um é iniciado sobre um catálogo sintético)")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--port", type=int, default=0, help="Porta do serviço iniciado pelo teste (padrão: uma porta livre)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        run(url.hostname, url.port or 80, args.concurrency, args.duration, args.seed)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_dir = os.path.join(tmp_dir, "raw")
+        os.makedirs(raw_dir)
+        generate_catalog(os.path.join(raw_dir, "catalog.csv"), args.rows)
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        server = multiprocessing.Process(
+            target=_serve, args=(raw_dir, os.path.join(tmp_dir, "cache"), args.port, sender), daemon=True,
+        )
+        server.start()
+        try:
+            port = _wait_ready(server, receiver, "127.0.0.1", timeout=600)
+            run("127.0.0.1", port, args.concurrency, args.duration, args.seed)
+        finally:
+            server.terminate()
+            server.join()
+
+if __name__ == "__main__":
+    main()
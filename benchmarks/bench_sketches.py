@@ -0,0 +1,95 @@
+"""
+Compara o modo aproximado (sketches) com as contagens exatas de diretores, elenco e países.
+
+Para cada tamanho de catálogo sintético, agrega o CSV em blocos com as métricas exatas
+(`Counter` por nome) e com as do modo aproximado (`src.utils.approximate`) e mostra:
+
+- o tempo de cada agregação;
+- o tamanho do estado (acumuladores serializados com pickle): o exato cresce com os nomes
+  distintos, o aproximado fica fixo;
+- o erro das estimativas: maior diferença nas contagens dos principais diretores, atores e
+  países e erro relativo das contagens de distintos.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_sketches --sizes 50000 200000 800000
+"""
+import argparse
+import logging
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+from benchmarks.synthetic_catalog import generate_catalog
+from src.models.model import CsvDto, read_csv_in_chunks
+from src.utils.aggregator import Accumulator, accumulate_chunks, finalize, register_accumulator
+from src.utils.approximate import APPROXIMATE_METRICS
+
+class ExactCountsAccumulator(Accumulator):
+    """Contagem exata de um campo de lista do CsvDto (a referência para os sketches)."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.counts = Counter()
+
+    def add(self, dto: CsvDto) -> None:
+        self.counts.update(getattr(dto, self.field))
+
+    def merge(self, other: "ExactCountsAccumulator") -> None:
+        self.counts.update(other.counts)
+
+    def result(self) -> Counter:
+        return self.counts
+
+EXACT_FIELDS = {"exact_directors": "directors", "exact_cast": "cast", "exact_countries": "countries"}
+
+for _name, _field in EXACT_FIELDS.items():
+    register_accumulator(_name, default=False)(lambda field=_field: ExactCountsAccumulator(field))
+
+def _aggregate(csv_path: str, chunk_size: int, names: Iterable[str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    accumulators = accumulate_chunks(read_csv_in_chunks(csv_path, chunk_size), names)
+    seconds = time.perf_counter() - start
+    state_bytes = len(pickle.dumps(accumulators))
+    return {"seconds": seconds, "state_mb": state_bytes / 2 ** 20, "results": finalize(accumulators)}
+
+def _max_error(items: List[Dict[str, Any]], key: str, count: str, exact: Counter) -> int:
+    return max((abs(item[count] - exact[item[key]]) for item in items), default=0)
+
+def _relative_error(estimate: int, exact: int) -> float:
+    return abs(estimate - exact) / exact * 100 if exact else 0.0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 200_000, 800_000])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.sizes:
+            csv_path = os.path.join(tmp_dir, f"catalog_{rows}.csv")
+            generate_catalog(csv_path, rows)
+            exact = _aggregate(csv_path, args.chunk_size, EXACT_FIELDS)
+            approximate = _aggregate(csv_path, args.chunk_size, APPROXIMATE_METRICS)
+            os.remove(csv_path)
+
+            counts = exact["results"]
+            results = approximate["results"]
+            print(f"{rows:>10} linhas")
+            for name, mode in (("exato", exact), ("aproximado", approximate)):
+                print(f"{name:>14}: {mode['seconds']:8.2f} s  estado {mode['state_mb']:8.2f} MB")
+            print(
+                f"{'erro máximo':>14}: diretores {_max_error(results['approximate_directors'], 'director', 'count', counts['exact_directors'])}"
+                f"  atores {_max_error(results['approximate_cast'], 'actor', 'count', counts['exact_cast'])}"
+                f"  países {_max_error(results['approximate_countries'], 'country', 'total', counts['exact_countries'])}"
+            )
+            print(
+                f"{'distintos':>14}: diretores {_relative_error(results['unique_directors']['estimate'], len(counts['exact_directors'])):.2f}%"
+                f"  atores {_relative_error(results['unique_actors']['estimate'], len(counts['exact_cast'])):.2f}%"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Mede o tempo de inicialização com `python -X importtime`: cada cenário é executado em um
+processo novo e o relatório mostra o tempo total das importações, os módulos mais caros e quais
+bibliotecas pesadas (pandas, numpy, matplotlib, fpdf, openpyxl) foram carregadas.
+
+Cenários:
+    main          apenas `import main` (o que toda execução paga)
+    metrics-only  `import main` e o registro das análises (modo `--metrics-only`)
+    reports       `import main` e as bibliotecas de todos os formatos de relatório
+    charts        `import main` e as bibliotecas do dashboard
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'fpdf', 'openpyxl')
+
+SCENARIOS = {
+    'main': "import main",
+    'metrics-only': (
+        "import main\n"
+        "from src.utils.aggregator import registered_accumulators\n"
+        "registered_accumulators()"
+    ),
+    'reports': (
+        "import main\n"
+        "from src.services.report_generator import REPORT_FORMATS, import_report_dependencies\n"
+        "import_report_dependencies(REPORT_FORMATS)"
+    ),
+    'charts': (
+        "import main\n"
+        "from src.services.dashboard import import_chart_dependencies\n"
+        "import_chart_dependencies()"
+    ),
+}
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Converte a saída do `-X importtime` em (módulo, próprio µs, acumulado µs); o nome mantém a indentação do nível."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Um espaço separa a coluna; a indentação restante indica o nível da importação
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+def run_scenario(code: str) -> List[Tuple[str, int, int]]:
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+def measure(code: str, repeat: int, top: int) -> Dict[str, Any]:
+    """Executa o cenário `repeat` vezes e fica com a execução mais rápida (a menos afetada por ruído)."""
+    best = None
+    for _ in range(repeat):
+        modules = run_scenario(code)
+        # Os módulos de topo (sem indentação) somam o tempo de todas as importações
+        total = sum(cumulative for name, _, cumulative in modules if not name.startswith(' '))
+        if best is None or total < best[0]:
+            best = (total, modules)
+
+    total, modules = best
+    loaded = {name.strip().split('.')[0] for name, _, _ in modules}
+    # Módulos de topo e os importados diretamente por eles (indentação de até dois espaços)
+    slowest = sorted((item for item in modules if not item[0].startswith('   ')), key=lambda item: item[2], reverse=True)
+    return {
+        'total_ms': round(total / 1000, 1),
+        'heavy_modules': [module for module in HEAVY_MODULES if module in loaded],
+        'slowest': [
+            {'module': name.strip(), 'cumulative_ms': round(cumulative / 1000, 1)}
+            for name, _, cumulative in slowest[:top]
+        ],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Quantidade de módulos mais caros exibidos por cenário.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Padrão: todos.")
+    parser.add_argument("--output", help="Grava o resultado em JSON.")
+    args = parser.parse_args()
+
+    report = {}
+    for scenario in args.scenario or SCENARIOS:
+        result = report[scenario] = measure(SCENARIOS[scenario], args.repeat, args.top)
+        print(f"{scenario:>12}: {result['total_ms']:>8.1f} ms  pesados: {', '.join(result['heavy_modules']) or '-'}")
+        for item in result['slowest']:
+            print(f"{'':>14}{item['cumulative_ms']:>8.1f} ms  {item['module']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Verifica que a leitura em blocos mantém o pico de memória estável conforme o catálogo cresce.
+
+Mede o pico do tracemalloc de `aggregate_chunks` sobre um catálogo sintético de `--rows`
+linhas e sobre outro `--factor` vezes maior (4× por padrão), com nomes diferentes (mas a mesma
+quantidade de nomes distintos), partindo dos caches do processo vazios e usando as métricas cujo
+estado não depende do número de linhas (contagens, anos e top N). A verificação falha
+(AssertionError, código de saída 1) se o pico do catálogo maior passar de `--tolerance` vezes o
+do menor. O mesmo cenário é verificado em `tests/test_streaming_memory.py`.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_streaming_memory --rows 40000 --factor 4 --chunk-size 5000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic_catalog import generate_catalog
+from src.models.model import _split_directors, read_csv_in_chunks, split_countries
+from src.utils.aggregator import aggregate_chunks
+from src.utils.dates import parse_date_added
+from src.utils.durations import parse_duration
+from src.utils.people import normalize_name, person_keys
+
+# Métricas cujo estado depende só dos valores distintos (contagens, anos e top N), não das linhas
+BOUNDED_METRICS = ["columns", "total_movies", "total_series", "total_by_years", "directors", "longest_movies", "longest_series"]
+
+# Caches do processo preenchidos durante a leitura e a agregação (limitados a um número fixo de entradas)
+PROCESS_CACHES = (_split_directors, split_countries, parse_date_added, parse_duration, normalize_name, person_keys)
+
+def peak_memory(csv_path: str, chunk_size: int) -> int:
+    """Pico do tracemalloc da agregação em blocos, partindo dos caches do processo vazios."""
+    for cache in PROCESS_CACHES:
+        cache.cache_clear()
+    tracemalloc.start()
+    try:
+        aggregate_chunks(read_csv_in_chunks(csv_path, chunk_size), BOUNDED_METRICS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def check_bounded_memory(rows: int, factor: int = 4, chunk_size: int = 5_000, tolerance: float = 1.5) -> float:
+    """
+    Compara o pico de memória da agregação em blocos de `rows` e de `rows * factor` linhas e
+    retorna a razão entre eles.
+
+    Raises:
+        AssertionError: Se o pico do catálogo maior passar de `tolerance` vezes o do menor.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for seed, size in enumerate((rows, rows * factor), start=1):
+            paths.append(os.path.join(tmp_dir, f"catalog_{size}.csv"))
+            # Sementes diferentes: nomes diferentes, com o mesmo número de nomes distintos
+            generate_catalog(paths[-1], size, seed=seed, names=rows * factor)
+
+        base, large = (peak_memory(path, chunk_size) for path in paths)
+
+    ratio = large / base
+    print(f"{rows:>10} linhas: pico {base / 2 ** 20:8.2f} MB")
+    print(f"{rows * factor:>10} linhas: pico {large / 2 ** 20:8.2f} MB")
+    print(f"Razão entre os picos ({factor}× a entrada): {ratio:.2f} (tolerância {tolerance})")
+    assert ratio <= tolerance, (
+        f"O pico de memória cresce com a entrada: {ratio:.2f}× com {factor}× as linhas (tolerância {tolerance})"
+    )
+    return ratio
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=40_000)
+    parser.add_argument("--factor", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Razão máxima entre o pico maior e o menor.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    check_bounded_memory(args.rows, args.factor, args.chunk_size, args.tolerance)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Suíte de benchmarks do pipeline: mede tempo (relógio e CPU) e pico de memória (tracemalloc)
+de cada etapa sobre um catálogo sintético e grava o resultado em JSON.
+
+Etapas medidas:
+    - leitura do CSV (`read_csv_to_dto`);
+    - cada função de `src/utils/count.py` e `src/utils/list_columns.py`;
+    - cada escritor de `generate_reports` (excel, csv, pdf, txt);
+    - cada gráfico do dashboard (renderizado em arquivo).
+
+Com `--baseline`, compara o resultado com um JSON anterior e termina com código de saída 1
+se alguma etapa ficar mais lenta (ou usar mais memória) além da tolerância.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_suite --rows 100000 --output benchmarks/results/atual.json
+    python -m benchmarks.bench_suite --rows 100000 --baseline benchmarks/results/base.json
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic_catalog import generate_catalog
+
+# Diferenças abaixo destes valores são consideradas ruído, mesmo acima da tolerância
+MIN_SECONDS_DELTA = 0.05
+MIN_PEAK_MB_DELTA = 1.0
+
+def measure(function: Callable[[], Any], repeat: int = 1, memory: bool = True) -> Dict[str, Any]:
+    """
+    Executa `function` e mede a etapa.
+
+    O tempo é o menor entre `repeat` execuções sem o tracemalloc ligado; o pico de memória é
+    medido em uma execução separada, para que o custo do tracemalloc não entre no tempo.
+
+    Returns:
+        Dict[str, Any]: `seconds`, `cpu_seconds`, `peak_mb` e o valor retornado (`result`).
+    """
+    best_wall, best_cpu, result = None, None, None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = function()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        if best_wall is None or wall < best_wall:
+            best_wall, best_cpu = wall, cpu
+
+    peak_mb = None
+    if memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        result = function()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(best_wall, 4),
+        "cpu_seconds": round(best_cpu, 4),
+        "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        "result": result,
+    }
+
+def run_suite(csv_path: str, rows: int, out_dir: str, repeat: int = 1, memory: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Executa todas as etapas sobre o CSV informado.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Etapa -> métricas (`seconds`, `cpu_seconds`, `peak_mb`, `rows_per_second`).
+    """
+    from src.models.model import read_csv_to_dto
+    from src.services.dashboard import CHARTS, chart_data, render_chart
+    from src.services.report_generator import REPORT_FORMATS, _WRITERS, build_sections
+    from src.utils import count, list_columns
+
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    def stage(name: str, function: Callable[[], Any], stage_rows: Optional[int] = rows) -> Any:
+        measured = measure(function, repeat, memory)
+        result = measured.pop("result")
+        seconds = measured["seconds"]
+        measured["rows_per_second"] = round(stage_rows / seconds) if stage_rows and seconds > 0 else None
+        stages[name] = measured
+        print(f"{name:<40} {seconds:>9.3f} s  {measured['cpu_seconds']:>9.3f} s CPU  "
+              f"pico {measured['peak_mb'] if measured['peak_mb'] is not None else '-':>9} MB")
+        return result
+
+    dtos = stage("read_csv_to_dto", lambda: read_csv_to_dto(csv_path))
+
+    results = {
+        "columns": stage("list_columns.list_columns", lambda: list_columns.list_columns(dtos)),
+        "total_movies": stage("count.count_movies", lambda: count.count_movies(dtos)),
+        "directors": stage("count.top_directors", lambda: count.top_directors(dtos)),
+        "directors_actors": stage("list_columns.list_directors_as_actors", lambda: list_columns.list_directors_as_actors(dtos)),
+        "total_series": stage("count.count_series", lambda: count.count_series(dtos)),
+        "total_by_years": stage("count.count_titles_by_year", lambda: count.count_titles_by_year(dtos)),
+        "titles_by_rating": stage("count.count_titles_by_rating", lambda: count.count_titles_by_rating(dtos)),
+        "longest_movies": stage("list_columns.list_longest_movies", lambda: list_columns.list_longest_movies(dtos)),
+        "longest_series": stage("list_columns.list_longest_series", lambda: list_columns.list_longest_series(dtos)),
+        "titles_by_country": stage("count.count_titles_by_country", lambda: count.count_titles_by_country(dtos)),
+    }
+    del dtos
+
+    sections = build_sections(**results)
+    for report_format, (_, extension) in REPORT_FORMATS.items():
+        path = os.path.join(out_dir, f"report.{extension}")
+        stage(f"report.{report_format}", lambda: _WRITERS[report_format](sections, path), None)
+
+    for chart, (_, _, keys) in CHARTS.items():
+        data = tuple(chart_data(results, key) for key in keys)
+        stage(f"chart.{chart}", lambda: render_chart(chart, data, out_dir), None)
+
+    return stages
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compara dois resultados da suíte e retorna a lista de regressões encontradas.
+
+    Uma etapa regride se o tempo (ou o pico de memória) passar de `(1 + tolerance)` vezes o da
+    linha de base e a diferença absoluta for maior que o ruído mínimo.
+    """
+    regressions = []
+    for name, metrics in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            continue
+        for key, min_delta in (("seconds", MIN_SECONDS_DELTA), ("peak_mb", MIN_PEAK_MB_DELTA)):
+            new, old = metrics.get(key), base.get(key)
+            if new is None or old is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > min_delta:
+                regressions.append(f"{name}: {key} {old} -> {new} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Tamanho do catálogo sintético (até 10M).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--csv", help="Usa um CSV existente em vez de gerar um catálogo sintético.")
+    parser.add_argument("--repeat", type=int, default=1, help="Execuções por etapa (vale o menor tempo).")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória (mais rápido).")
+    parser.add_argument("--output", help="Arquivo JSON com os resultados.")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora máxima aceita (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = args.csv
+        rows = args.rows
+        if not csv_path:
+            csv_path = os.path.join(tmp_dir, "catalog.csv")
+            print(f"Gerando catálogo sintético com {rows} linhas...")
+            generate_catalog(csv_path, rows, args.seed)
+        else:
+            with open(csv_path, "rb") as file:
+                rows = max(0, sum(1 for _ in file) - 1)  # Aproximado: descrições podem ter quebras de linha
+
+        stages = run_suite(csv_path, rows, tmp_dir, args.repeat, not args.no_memory)
+
+    current = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+            "seed": args.seed if not args.csv else None,
+            "csv": args.csv,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "stages": stages,
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("meta", {}).get("rows") != rows:
+            print(f"Aviso: a linha de base foi medida com {baseline.get('meta', {}).get('rows')} linhas.")
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print("Regressões encontradas:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Nenhuma regressão em relação à linha de base.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import csv
+import random
+from typing import List, Optional
+
+# Esquema do CSV do catálogo da Netflix
+COLUMNS = [
+    "show_id", "type", "title", "director", "cast", "country",
+    "date_added", "release_year", "rating", "duration", "listed_in", "description",
+]
+
+RATINGS = [
+    "TV-MA", "TV-14", "TV-PG", "R", "PG-13", "TV-Y7", "TV-Y", "PG",
+    "TV-G", "NR", "G", "TV-Y7-FV", "NC-17", "UR", "",
+]
+GENRES = [
+    "Dramas", "Comedies", "International Movies", "Documentaries", "Action & Adventure",
+    "International TV Shows", "Independent Movies", "Thrillers", "Kids' TV", "Docuseries",
+]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+# Limites dos conjuntos de diretores e atores, para que catálogos grandes (10M linhas) caibam em memória
+MAX_DIRECTORS = 200_000
+MAX_ACTORS = 1_000_000
+
+def _names(rng: random.Random, prefix: str, size: int) -> List[str]:
+    return [f"{prefix} {rng.randrange(10 ** 6):06d}" for _ in range(size)]
+
+def generate_catalog(path: str, rows: int, seed: int = 42, names: Optional[int] = None) -> None:
+    """
+    Gera um catálogo sintético e determinístico com o mesmo esquema do dataset real.
+
+    O arquivo é gravado linha a linha, então o consumo de memória não cresce com `rows`
+    (além dos conjuntos de nomes, limitados) e o gerador escala até dezenas de milhões de linhas.
+
+    Args:
+        path (str): O caminho do CSV gerado.
+        rows (int): O número de títulos.
+        seed (int): A semente do gerador (mesma semente, mesmo arquivo).
+        names (Optional[int]): O número de linhas usado para dimensionar os conjuntos de diretores e
+            atores (padrão: `rows`). Catálogos com o mesmo `names` compartilham os mesmos nomes.
+    """
+    rng = random.Random(seed)
+    names = rows if names is None else names
+    directors = _names(rng, "Director", min(max(100, names // 20), MAX_DIRECTORS))
+    actors = _names(rng, "Actor", min(max(500, names // 4), MAX_ACTORS))
+    countries = [f"Country {i}" for i in range(120)]
+    dates = [f"{month} {day}, {year}" for year in range(2008, 2022) for month in MONTHS for day in (1, 15, 28)]
+
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            is_movie = rng.random() < 0.7
+            roll = rng.random()
+            director = "" if roll < 0.3 else ", ".join(rng.sample(directors, 2 if roll > 0.95 else 1))
+            cast = ", ".join(rng.sample(actors, rng.randint(0, 8)))
+            if director and rng.random() < 0.05:
+                cast = f"{cast}, {director}" if cast else director
+            country = "" if rng.random() < 0.1 else ", ".join(rng.sample(countries, rng.choice((1, 1, 1, 2, 3))))
+            date_added = "" if rng.random() < 0.01 else rng.choice(dates)
+            if is_movie:
+                duration = f"{rng.randint(3, 312)} min"
+            else:
+                seasons = rng.choice((1, 1, 1, 2, 2, 3, 4, 5, 8, 17))
+                duration = "1 Season" if seasons == 1 else f"{seasons} Seasons"
+            writer.writerow([
+                f"s{i + 1}",
+                "Movie" if is_movie else "TV Show",
+                f"Title {i + 1}",
+                director,
+                cast,
+                country,
+                date_added,
+                rng.randint(1925, 2021),
+                rng.choice(RATINGS),
+                duration,
+                ", ".join(rng.sample(GENRES, rng.randint(1, 3))),
+                # Descrições às vezes trazem aspas e quebras de linha dentro do campo
+                "A story about \"something\".\nSecond line." if rng.random() < 0.02 else "A synthetic description, for benchmarks.",
+            ])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um catálogo sintético da Netflix.")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_catalog(args.path, args.rows, args.seed)
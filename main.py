@@ -1,47 +1,51 @@
+import argparse
+import asyncio
+import json
 import logging
 import os
 import time
 from datetime import datetime
 from dotenv import load_dotenv
-from src.services.dashboard import (
-    plot_directors_as_actors,
-    plot_longest_movies,
-    plot_longest_series,
-    plot_movies_and_series,
-    plot_titles_by_country,
-    plot_titles_by_rating,
-    plot_titles_by_year,
-    plot_top_directors,
-)
+from src.services.batch import DEFAULT_FETCH_CONCURRENCY, load_manifest, run_batch
+from src.services.dashboard import render_dashboard
 from src.services.report_generator import generate_reports
 from src.services.download_data import download_file
-from src.models.model import read_csv_to_dto
-from src.utils.list_columns import (
-    directors_as_actors,
-    list_columns,
-    list_longest_movies,
-    list_longest_series,
-)
-from src.utils.count import (
-    count_items_by_year,
-    count_movies,
-    count_series,
-    count_titles_by_country,
-    count_titles_by_rating,
-    top_directors,
-)
+from src.services.incremental import run_incremental
+from src.services.instrumentation import METRICS_FILE, Instrumentation
+from src.services.pipeline import DEFAULT_MAX_PENDING, DEFAULT_QUEUE_SIZE, run_pipeline
+from src.services.logging_config import configure_logging
+from src.models.model import DEFAULT_CHUNK_SIZE, read_csv_in_chunks
+from src.utils.aggregator import aggregate_chunks
+from src.utils.approximate import SketchConfig, apply_approximate_results, approximate_metric_names, configure_sketches
+from src.utils.count import titles_in_results
+from src.utils.parallel import aggregate_parallel
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
-# Configuração do logger
-logging.basicConfig(
-    filename='./logs/app.log',  # Log será salvo no arquivo 'app.log'
-    level=logging.DEBUG,         # Nível mínimo de log
-    format='%(asctime)s - %(levelname)s - %(message)s'  # Formato da mensagem de log
-)
+# Diretório dos resultados do modo "somente métricas"
+METRICS_ONLY_DIR = './data/processed/metrics/'
 
-def main():
+def write_metrics_json(results: dict, date: str, output_dir: str = METRICS_ONLY_DIR) -> str:
+    """Grava o resultado das análises em JSON (modo "somente métricas", sem relatórios nem gráficos)."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f'metrics_{date}.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2, default=str)
+    return path
+
+def sketch_config_from_env() -> SketchConfig:
+    """Limites de erro dos sketches do modo aproximado (SKETCH_*), com os valores padrão de SketchConfig."""
+    defaults = SketchConfig()
+    return SketchConfig(
+        epsilon=float(os.getenv('SKETCH_EPSILON', defaults.epsilon)),
+        delta=float(os.getenv('SKETCH_DELTA', defaults.delta)),
+        capacity=int(os.getenv('SKETCH_CAPACITY', defaults.capacity)),
+        distinct_error=float(os.getenv('SKETCH_DISTINCT_ERROR', defaults.distinct_error)),
+    )
+
+def main(workers: int = 0, incremental: bool = False, pipeline: str = 'sequential', metrics_only: bool = False,
+         aggregation: str = 'exact'):
     # Definir Timestamp
     timestamp = time.time()
     timestamp_formatted = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d_%H-%M-%S')
@@ -58,71 +62,290 @@ def main():
     os.makedirs('./data/processed/pdf/', exist_ok=True)
     os.makedirs('./data/processed/txt/', exist_ok=True)
 
+    # Medição de cada etapa (tempo, CPU, memória opcional e vazão), gravada ao fim da execução
+    instrumentation = Instrumentation(
+        memory=os.getenv('METRICS_MEMORY', '0') == '1',
+        profile_stage=os.getenv('PROFILE_STAGE') or None,
+    )
+
+    approximate = aggregation == 'approximate'
+    if approximate and incremental:
+        logging.warning("O modo incremental mantém as contagens exatas; o modo aproximado será ignorado.")
+        approximate = False
+    if approximate:
+        # Configurado antes da criação dos processos da agregação paralela, que o herdam via fork
+        configure_sketches(sketch_config_from_env())
+
     try:
-        # Executar o download
-        download_file(download_url, output_file)
+        if approximate and pipeline == 'async':
+            logging.warning("O modo aproximado usa o pipeline sequencial.")
+        elif metrics_only and pipeline == 'async':
+            logging.warning("O modo somente métricas usa o pipeline sequencial.")
+        elif pipeline == 'async' and incremental:
+            logging.warning("O modo incremental usa o pipeline sequencial.")
+        elif pipeline == 'async':
+            # Download, leitura, análises e exportações sobrepostos (ver src/services/pipeline.py)
+            report_formats = os.getenv('REPORT_FORMATS')
+            with instrumentation.stage('pipeline'):
+                results = asyncio.run(run_pipeline(
+                    download_url,
+                    output_file,
+                    date=timestamp_formatted,
+                    chart_dir=os.path.join('./data/processed/charts/', timestamp_formatted),
+                    workers=workers,
+                    queue_size=int(os.getenv('PIPELINE_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)),
+                    max_pending=int(os.getenv('PIPELINE_MAX_PENDING', DEFAULT_MAX_PENDING)),
+                    report_formats=report_formats.split(',') if report_formats else None,
+                    report_executor=os.getenv('REPORT_EXECUTOR', 'process'),
+                    chart_formats=os.getenv('DASHBOARD_FORMATS', 'png').split(','),
+                    instrumentation=instrumentation,
+                ))
+            if results is None:
+                logging.error("Download do dataset falhou, a análise não será executada.")
+                print("Download do dataset falhou, a análise não será executada.")
+            return
 
-        # Ler e processar o dataset
-        dataset = read_csv_to_dto(output_file)
+        # Executar o download (se o arquivo não mudou, o último download é reutilizado)
+        with instrumentation.stage('download') as stage:
+            # Bytes recebidos nesta execução (zero se o último download foi reutilizado)
+            stage['bytes'] = 0
 
-        # 1. Quais colunas estão presentes no dataset?
-        columns = list_columns(dataset)
+            def count_bytes(chunk: bytes, position: int) -> None:
+                stage['bytes'] += len(chunk)
 
-        # 2. Quantos filmes estão disponíveis na Netflix?
-        total_movies = count_movies(dataset)
+            output_file = download_file(download_url, output_file, on_chunk=count_bytes)
+        if output_file is None:
+            logging.error("Download do dataset falhou, a análise não será executada.")
+            print("Download do dataset falhou, a análise não será executada.")
+            return
 
-        # 3. Quem são os 5 diretores com mais filmes e séries na plataforma?
-        directors = top_directors(dataset)
+        # Ler o dataset em blocos, para que o consumo de memória não cresça com o arquivo
+        chunk_size = int(os.getenv('CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
 
-        # 4. Quais diretores também atuaram como atores em suas próprias produções?
-        directors_actors = directors_as_actors(dataset)
+        # Calcular todas as análises em uma única passada pelo dataset:
+        #  1. Quais colunas estão presentes no dataset?
+        #  2. Quantos filmes estão disponíveis na Netflix?
+        #  3. Quem são os 5 diretores com mais filmes e séries na plataforma?
+        #  4. Quais diretores também atuaram como atores em suas próprias produções?
+        #  5. Quantas séries estão disponíveis na Netflix?
+        #  6. Quantos títulos foram adicionados por ano?
+        #  7. Quantos títulos existem de cada classificação?
+        #  8. Maiores filmes em duração?
+        #  9. Maiores séries em temporada?
+        # 10. Títulos por país
+        changes = None
+        if incremental:
+            # Modo incremental: aplica às métricas só os títulos incluídos, removidos e alterados
+            with instrumentation.stage('analysis') as stage:
+                results, changes = run_incremental(
+                    output_file,
+                    state_path=os.getenv('INCREMENTAL_STATE', './data/state/incremental_state.pkl'),
+                )
+                stage['rows'] = titles_in_results(results)
+        elif os.getenv('DATASET_CACHE', '0') == '1' and workers <= 1 and not metrics_only and not approximate:
+            # Cache colunar (opcional): o dataset inteiro fica em memória, então só é usado quando
+            # nenhum outro modo foi pedido; a agregação paralela tem prioridade sobre ele.
+            # O caminho colunar depende do pandas e do numpy, importados só aqui
+            from src.services.dataset_cache import load_cached_dataset
+            from src.utils.index import CatalogIndex
+            from src.utils.vectorized import aggregate_columnar
 
-        # 5. Quantas séries estão disponíveis na Netflix?
-        total_series = count_series(dataset)
+            # Reaproveita o dataset já processado se o conteúdo baixado não mudou
+            with instrumentation.stage('parse') as stage:
+                dataset = load_cached_dataset(
+                    output_file,
+                    cache_dir=os.getenv('DATASET_CACHE_DIR', './data/cache/'),
+                    max_bytes=int(float(os.getenv('DATASET_CACHE_MAX_MB', 2048)) * 1024 ** 2),
+                    max_age_seconds=float(os.getenv('DATASET_CACHE_MAX_AGE_DAYS', 7)) * 24 * 60 * 60,
+                )
+                stage['rows'] = len(dataset)
+            # Índices invertidos construídos na carga: as contagens passam a ser consultas
+            with instrumentation.stage('index', rows=len(dataset)):
+                index = CatalogIndex(dataset).build()
+            with instrumentation.stage('analysis', rows=len(dataset)):
+                results = aggregate_columnar(
+                    dataset,
+                    index,
+                    stage=lambda name: instrumentation.stage(f'analysis.{name}', rows=len(dataset)),
+                )
+        elif workers > 1:
+            # Modo paralelo: o CSV é dividido em shards agregados em processos separados
+            # (leitura e análise acontecem juntas, então são medidas como uma única etapa)
+            with instrumentation.stage('analysis') as stage:
+                results = aggregate_parallel(
+                    output_file, workers, chunk_size=chunk_size,
+                    names=approximate_metric_names() if approximate else None,
+                )
+                stage['rows'] = titles_in_results(results)
+        else:
+            # Leitura e análise em uma única passada: a vazão da etapa inclui a leitura do CSV
+            with instrumentation.stage('analysis') as stage:
+                results = aggregate_chunks(
+                    read_csv_in_chunks(output_file, chunk_size),
+                    approximate_metric_names() if approximate else None,
+                )
+                stage['rows'] = titles_in_results(results)
+        if approximate:
+            # Diretores e países estimados por sketches, no formato das métricas exatas
+            results = apply_approximate_results(results)
 
-        # 6. Quantos títulos foram adicionados por ano?
-        total_by_years = count_items_by_year(dataset)
+        if metrics_only:
+            # Somente as métricas: nenhum relatório, gráfico ou biblioteca de exportação é carregado
+            metrics_path = write_metrics_json(results, timestamp_formatted)
+            logging.info("Métricas salvas em: %s", metrics_path)
+            return
 
-        # 7. Quantos títulos existem de cada classificação?
-        titles_by_rating = count_titles_by_rating(dataset)
+        # Gerar relatórios
+        report_formats = os.getenv('REPORT_FORMATS')
+        with instrumentation.stage('reports'):
+            reports = generate_reports(
+                **results,
+                date=timestamp_formatted,
+                changes=changes,
+                formats=report_formats.split(',') if report_formats else None,
+                executor=os.getenv('REPORT_EXECUTOR', 'process'),
+            )
+        # Cada formato é gerado em um processo separado: o tempo vem do próprio processo
+        for report_format, report in (reports or {}).items():
+            instrumentation.record(
+                f'report.{report_format}', report['seconds'], report['cpu_seconds'], error=report['error']
+            )
 
-        # 8. Maiores filmes em duração?
-        longest_movies = list_longest_movies(dataset)
+        # Renderizar os gráficos do dashboard em arquivos (sem interface gráfica)
+        chart_formats = os.getenv('DASHBOARD_FORMATS', 'png')
+        with instrumentation.stage('charts'):
+            chart_times = render_dashboard(
+                results,
+                os.path.join('./data/processed/charts/', timestamp_formatted),
+                formats=chart_formats.split(','),
+            )
+        for chart, seconds in chart_times.items():
+            instrumentation.record(f'chart.{chart}', seconds)
 
-        # 9. Maiores séries em temporada?
-        longest_series = list_longest_series(dataset)
+    except Exception as e:
+        logging.error("Ocorreu um erro: %s", e)
+        print(f"Ocorreu um erro: {str(e)}")
 
-        # 10. Títulos por país
-        titles_by_country = count_titles_by_country(dataset)
+    finally:
+        # Registro da execução: uma linha JSON por execução e, opcionalmente, o arquivo do Prometheus
+        try:
+            instrumentation.write_jsonl(os.getenv('METRICS_FILE', METRICS_FILE))
+            prometheus_file = os.getenv('PROMETHEUS_TEXTFILE')
+            if prometheus_file:
+                instrumentation.write_prometheus(prometheus_file)
+        except OSError as e:
+            logging.error("Falha ao gravar as métricas da execução: %s", e)
 
-        # Gerar relatórios
-        generate_reports(
-            columns=columns,
-            total_movies=total_movies,
-            directors=directors,
-            directors_actors=directors_actors,
-            total_series=total_series,
-            total_by_years=total_by_years,
-            titles_by_rating=titles_by_rating,
-            longest_movies=longest_movies,
-            longest_series=longest_series,
-            titles_by_country=titles_by_country,
-            date=timestamp_formatted
-        )
+def main_batch(manifest: str, workers: int = 0, aggregation: str = 'exact'):
+    # Todos os datasets do manifesto em uma única execução, com o mesmo timestamp
+    timestamp_formatted = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    approximate = aggregation == 'approximate'
+    if approximate:
+        configure_sketches(sketch_config_from_env())
+    try:
+        report_formats = os.getenv('REPORT_FORMATS')
+        summaries = asyncio.run(run_batch(
+            load_manifest(manifest),
+            date=timestamp_formatted,
+            workers=workers or None,
+            fetch_concurrency=int(os.getenv('BATCH_FETCH_CONCURRENCY', DEFAULT_FETCH_CONCURRENCY)),
+            chunk_size=int(os.getenv('CHUNK_SIZE', DEFAULT_CHUNK_SIZE)),
+            report_formats=report_formats.split(',') if report_formats else None,
+            chart_formats=os.getenv('DASHBOARD_FORMATS', 'png').split(','),
+            approximate=approximate,
+        ))
+        failed = [summary['name'] for summary in summaries if summary['error']]
+        if failed:
+            print(f"Datasets com erro: {', '.join(failed)}")
+
+    except Exception as e:
+        logging.error("Ocorreu um erro: %s", e)
+        print(f"Ocorreu um erro: {str(e)}")
 
-        # Visualizar os dados
-        plot_movies_and_series(total_movies, total_series)
-        plot_titles_by_year(total_by_years)
-        plot_titles_by_rating(titles_by_rating)
-        plot_top_directors(directors)
-        plot_titles_by_country(titles_by_country)
-        plot_directors_as_actors(directors_actors)
-        plot_longest_movies(longest_movies)
-        plot_longest_series(longest_series)
+def main_serve(port: int):
+    # Importado só aqui: o serviço carrega o dataset colunar (pandas/numpy) na inicialização
+    from src.services.catalog_service import serve
 
+    try:
+        serve(
+            host=os.getenv('SERVICE_HOST', '127.0.0.1'),
+            port=port,
+            raw_dir=os.getenv('SERVICE_RAW_DIR', './data/raw/'),
+            cache_size=int(os.getenv('SERVICE_CACHE_SIZE', 1024)),
+            poll_seconds=float(os.getenv('SERVICE_POLL_SECONDS', 5)),
+            cache_dir=os.getenv('DATASET_CACHE_DIR', './data/cache/'),
+        )
     except Exception as e:
-        logging.error(f"Ocorreu um erro: {str(e)}")
+        logging.error("Ocorreu um erro: %s", e)
         print(f"Ocorreu um erro: {str(e)}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Análise de dados do catálogo da Netflix")
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=int(os.getenv('PARALLEL_WORKERS', 0)),
+        help="Quantidade de processos da agregação paralela (0 ou 1 = serial)",
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        default=os.getenv('INCREMENTAL', '0') == '1',
+        help="Atualiza as métricas da execução anterior aplicando só as mudanças do novo snapshot",
+    )
+    parser.add_argument(
+        '--pipeline',
+        choices=('sequential', 'async'),
+        default=os.getenv('PIPELINE', 'sequential'),
+        help="'async' sobrepõe download, leitura, análises e exportações (menor latência de ponta a ponta)",
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='MANIFESTO',
+        default=os.getenv('BATCH_MANIFEST'),
+        help="Processa todos os datasets do manifesto (uma URL ou caminho por linha) em uma única execução",
+    )
+    parser.add_argument(
+        '--metrics-only',
+        action='store_true',
+        default=os.getenv('METRICS_ONLY', '0') == '1',
+        help="Calcula só as métricas e grava em JSON, sem relatórios nem gráficos (inicialização mais rápida)",
+    )
+    parser.add_argument(
+        '--aggregation',
+        choices=('exact', 'approximate'),
+        default=os.getenv('AGGREGATION_MODE', 'exact'),
+        help="'approximate' estima diretores, elenco e países com sketches de memória fixa (catálogos muito grandes)",
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help="Mantém o catálogo em memória e responde às análises em JSON por HTTP local (recarrega novos snapshots de data/raw/)",
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=int(os.getenv('SERVICE_PORT', 8080)),
+        help="Porta do modo serviço",
+    )
+    args = parser.parse_args()
+
+    # Configuração do logger: nível em LOG_LEVEL, arquivo rotacionado por tamanho e gravação em uma thread separada
+    configure_logging(
+        log_file=os.getenv('LOG_FILE', './logs/app.log'),
+        max_bytes=int(float(os.getenv('LOG_MAX_MB', 10)) * 1024 ** 2),
+        backup_count=int(os.getenv('LOG_BACKUP_COUNT', 5)),
+    )
+
+    if args.serve:
+        main_serve(args.port)
+    elif args.batch:
+        main_batch(args.batch, workers=args.workers, aggregation=args.aggregation)
+    else:
+        main(
+            workers=args.workers,
+            incremental=args.incremental,
+            pipeline=args.pipeline,
+            metrics_only=args.metrics_only,
+            aggregation=args.aggregation,
+        )
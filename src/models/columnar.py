@@ -0,0 +1,174 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas com poucos valores distintos, armazenadas como categorias (códigos inteiros)
+CATEGORICAL_COLUMNS = ("type", "rating", "country", "date_added", "duration")
+
+# Colunas de lista já separadas na carga: coluna -> (separador, remover espaços de cada item)
+LIST_COLUMNS = {
+    "cast": (", ", False),
+    "country": (",", True),
+    "director": (", ", False),
+}
+
+class ColumnarDataset:
+    """
+    Representação colunar do catálogo: um array tipado por coluna em vez de um objeto por linha.
+
+    As colunas de lista (`cast`, `country` e `director`) também ficam disponíveis já separadas,
+    no formato "explodido": um array com o índice da linha de origem e um array categórico
+    com cada item. As datas de inclusão normalizadas (ano, mês e dia da semana) ficam em `dates`.
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        lists: Optional[Dict[str, Tuple[np.ndarray, pd.Categorical]]] = None,
+        dates: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        """
+        Inicializa o dataset a partir de um DataFrame com índice sequencial (0..n-1).
+
+        Args:
+            frame (pd.DataFrame): O DataFrame com as colunas do CSV.
+            lists (Optional[Dict]): Colunas de lista já separadas (por exemplo, vindas do cache).
+                Se omitido, são calculadas a partir do DataFrame.
+            dates (Optional[Dict]): Colunas de ano, mês e dia da semana de date_added, já
+                normalizadas (ver `src.utils.dates.normalize_dates`).
+        """
+        self.frame = frame.reset_index(drop=True)
+        self.columns: List[str] = list(self.frame.columns)
+        if lists is None:
+            lists = {
+                column: _explode(self.frame[column], separator, strip)
+                for column, (separator, strip) in LIST_COLUMNS.items()
+                if column in self.frame.columns
+            }
+        self.lists: Dict[str, Tuple[np.ndarray, pd.Categorical]] = lists
+        self.dates: Optional[Dict[str, np.ndarray]] = dates
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def column(self, name: str) -> pd.Series:
+        """Retorna a coluna informada."""
+        return self.frame[name]
+
+    def exploded(self, name: str) -> Tuple[np.ndarray, pd.Categorical]:
+        """
+        Retorna a coluna de lista já separada.
+
+        Returns:
+            Tuple[np.ndarray, pd.Categorical]: O índice da linha de cada item e os itens.
+        """
+        return self.lists[name]
+
+    def save_npz(self, path: str) -> None:
+        """
+        Salva o dataset em um arquivo .npz (sem pickle), incluindo as colunas de lista já separadas.
+
+        Textos são gravados como um único bloco UTF-8 por coluna e categorias como códigos inteiros.
+        """
+        arrays = {"columns": _pack_strings(self.columns)}
+        for i, column in enumerate(self.columns):
+            values = self.frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                arrays[f"cat_codes_{i}"] = values.cat.codes.to_numpy()
+                arrays[f"cat_values_{i}"] = _pack_strings(values.cat.categories)
+            else:
+                arrays[f"str_{i}"] = _pack_strings(values.to_numpy(dtype=object))
+        for column, (rows, items) in self.lists.items():
+            arrays[f"list_rows_{column}"] = rows
+            arrays[f"list_codes_{column}"] = items.codes
+            arrays[f"list_values_{column}"] = _pack_strings(items.categories)
+        for part, values in (self.dates or {}).items():
+            arrays[f"date_{part}"] = values
+
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load_npz(cls, path: str) -> "ColumnarDataset":
+        """
+        Carrega um dataset salvo com `save_npz`.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            columns = _unpack_strings(arrays["columns"])
+            data = {}
+            for i, column in enumerate(columns):
+                if f"cat_codes_{i}" in arrays:
+                    data[column] = pd.Categorical.from_codes(arrays[f"cat_codes_{i}"], _unpack_strings(arrays[f"cat_values_{i}"]))
+                else:
+                    data[column] = np.array(_unpack_strings(arrays[f"str_{i}"]), dtype=object)
+            lists = {
+                column: (
+                    arrays[f"list_rows_{column}"],
+                    pd.Categorical.from_codes(arrays[f"list_codes_{column}"], _unpack_strings(arrays[f"list_values_{column}"])),
+                )
+                for column in LIST_COLUMNS
+                if f"list_rows_{column}" in arrays
+            }
+            dates = {
+                name[len("date_"):]: arrays[name]
+                for name in arrays.files
+                if name.startswith("date_")
+            } or None
+
+        return cls(pd.DataFrame(data, columns=columns), lists, dates)
+
+# Terminador usado para gravar uma coluna de texto como um único bloco (caractere de controle "unit separator")
+_STRING_TERMINATOR = "\x1f"
+
+def _pack_strings(values) -> np.ndarray:
+    text = "".join(f"{value}{_STRING_TERMINATOR}" for value in values)
+    if text.count(_STRING_TERMINATOR) != len(values):
+        raise ValueError("O texto contém o terminador reservado do formato .npz")
+    return np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+def _unpack_strings(packed: np.ndarray) -> List[str]:
+    # Cada valor termina com o terminador, então o último item do split é sempre vazio
+    return packed.tobytes().decode("utf-8").split(_STRING_TERMINATOR)[:-1]
+
+def _explode(series: pd.Series, separator: str, strip: bool) -> Tuple[np.ndarray, pd.Categorical]:
+    # Ignora as linhas vazias (ou só com espaços, no caso das colunas com strip)
+    values = series.astype(str)
+    mask = (values.str.strip() != "") if strip else (values != "")
+    parts = values[mask].str.split(separator, regex=False).explode()
+    if strip:
+        parts = parts.str.strip()
+
+    rows = parts.index.to_numpy(dtype=np.int32)
+    return rows, pd.Categorical(parts.to_numpy(dtype=object))
+
+def read_csv_to_columnar(file_path: str) -> ColumnarDataset:
+    """
+    Lê um arquivo CSV diretamente para o formato colunar.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+
+    Returns:
+        ColumnarDataset: O dataset colunar (vazio se o arquivo não puder ser lido).
+    """
+    try:
+        header = pd.read_csv(file_path, nrows=0, encoding='utf-8').columns
+        dtypes = {column: ("category" if column in CATEGORICAL_COLUMNS else str) for column in header}
+        frame = pd.read_csv(
+            file_path,
+            dtype=dtypes,
+            keep_default_na=False,  # Campos vazios continuam como "" (igual ao csv.DictReader)
+            na_filter=False,
+            encoding='utf-8',
+        )
+    except FileNotFoundError:
+        logging.error("O arquivo %s não foi encontrado.", file_path)
+        frame = pd.DataFrame()
+    except Exception as e:
+        logging.error("Ocorreu um erro ao ler o arquivo: %s", e)
+        frame = pd.DataFrame()
+
+    logging.info("Dataset colunar carregado com %d linhas", len(frame))
+    return ColumnarDataset(frame)
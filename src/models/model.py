@@ -1,52 +1,166 @@
 import csv
 import logging
-from typing import List, Any
+import sys
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Any, Tuple
 
-# Configuração do logging
-logging.basicConfig(level=logging.INFO)
+from src.utils.dates import year_added
+from src.utils.durations import MINUTES, SEASONS, parse_duration
+
+# Colunas do catálogo da Netflix, na ordem do CSV
+COLUMNS = (
+    "show_id", "type", "title", "director", "cast", "country",
+    "date_added", "release_year", "rating", "duration", "listed_in", "description",
+)
+
+# Campos convertidos na carga, a partir das colunas do CSV
+PARSED_FIELDS = ("directors", "countries", "year_added", "duration_minutes", "seasons")
+
+_columns_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def _shared_columns(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Retorna uma única tupla de nomes de colunas por cabeçalho, compartilhada por todas as linhas."""
+    return _columns_cache.setdefault(columns, columns)
+
+def split_names(value: str) -> Tuple[str, ...]:
+    """Separa uma lista de nomes ("A, B") em uma tupla de nomes internados (vazia se não houver)."""
+    return tuple(map(sys.intern, value.split(", "))) if value else ()
+
+# Diretores se repetem entre os títulos: a mesma tupla é reaproveitada (o elenco quase nunca se repete).
+# Os caches por valor ficam pequenos: combinações de diretores e de países raramente se repetem, e um
+# cache maior só cresceria com o catálogo na leitura em blocos
+_split_directors = lru_cache(maxsize=4096)(split_names)
+
+@lru_cache(maxsize=4096)
+def split_countries(value: str) -> Tuple[str, ...]:
+    """Separa a lista de países ("Brazil, France") em uma tupla internada (vazia se não houver)."""
+    if not value.strip():
+        return ()
+    return tuple(sys.intern(country.strip()) for country in value.split(','))
 
 # Define a classe DTO
 class CsvDto:
+    """
+    Uma linha do catálogo, com esquema fixo (`__slots__`, sem um dicionário por objeto).
+
+    As colunas do CSV são mantidas como texto (valores repetidos compartilham a mesma string) e
+    os campos usados pelas análises são convertidos uma única vez, na carga:
+        - `directors`, `cast` e `countries`: tuplas de nomes;
+        - `year_added`: o ano de date_added (None se vazio ou inválido);
+        - `duration_minutes` e `seasons`: a duração em minutos (filmes) ou temporadas (séries).
+    """
+
+    __slots__ = ("columns",) + COLUMNS + PARSED_FIELDS
+
     def __init__(self, **kwargs):
         """
         Inicializa um objeto CsvDto com os dados fornecidos.
 
         Args:
-            **kwargs: Parâmetros nomeados que representam os atributos do DTO.
+            **kwargs: Os valores da linha do CSV, por coluna. Colunas fora do esquema são ignoradas
+                (mas continuam listadas em `columns`) e colunas ausentes ficam vazias.
         """
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-        # Converte a string de elenco em uma lista, se houver
-        if hasattr(self, 'cast'):
-            self.cast = self.cast.split(", ") if self.cast else []
+        self.columns = _shared_columns(tuple(kwargs))
+        get = kwargs.get
+        intern = sys.intern
+        self.show_id = get("show_id") or ""
+        self.type = intern(get("type") or "")
+        self.title = get("title") or ""
+        self.director = intern(get("director") or "")
+        self.country = intern(get("country") or "")
+        self.date_added = intern(get("date_added") or "")
+        self.release_year = intern(get("release_year") or "")
+        self.rating = intern(get("rating") or "")
+        self.duration = intern(get("duration") or "")
+        self.listed_in = intern(get("listed_in") or "")
+        self.description = get("description") or ""
+
+        # Converte as listas de nomes e de países em tuplas
+        self.cast = split_names(get("cast") or "")
+        self.directors = _split_directors(self.director)
+        self.countries = split_countries(self.country)
+
+        self.year_added = year_added(self.date_added)
+        duration = parse_duration(self.duration)
+        self.duration_minutes = duration.value if duration is not None and duration.unit == MINUTES else None
+        self.seasons = duration.value if duration is not None and duration.unit == SEASONS else None
+
+    def values(self) -> List[Any]:
+        """Retorna os valores das colunas do CSV, na ordem do arquivo."""
+        return [getattr(self, column) for column in self.columns if column in COLUMNS]
 
     def __repr__(self):
         """Retorna uma representação da instância do DTO."""
-        return str(self.__dict__)
+        return str({column: getattr(self, column) for column in self.columns if column in COLUMNS})
 
-# Função para ler o arquivo CSV e retornar uma lista de objetos DTO
-def read_csv_to_dto(file_path: str) -> List[CsvDto]:
+# Quantidade padrão de linhas por bloco na leitura em streaming
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Função para ler o arquivo CSV linha a linha, sem carregar o dataset inteiro em memória
+def iter_csv_dto(file_path: str, strict: bool = False) -> Iterator[CsvDto]:
     """
-    Lê um arquivo CSV e converte cada linha em um objeto CsvDto.
+    Lê um arquivo CSV em streaming, gerando um objeto CsvDto por linha.
 
     Args:
         file_path (str): O caminho do arquivo CSV.
+        strict (bool): Se True, um erro de leitura (arquivo ausente, truncado ou com bytes
+            inválidos) é propagado depois de registrado, em vez de só encerrar a leitura; use
+            quando uma leitura parcial não puder ser confundida com o arquivo completo.
 
-    Returns:
-        List[CsvDto]: Uma lista de objetos CsvDto.
+    Yields:
+        CsvDto: Um objeto por linha do CSV.
     """
-    dtos = []
-    
     try:
         with open(file_path, mode='r', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)  # Lê o CSV como dicionário
             for row in reader:
-                dto = CsvDto(**row)  # Cria um objeto DTO com os dados da linha
-                dtos.append(dto)  # Adiciona o objeto à lista
+                yield CsvDto(**row)  # Cria um objeto DTO com os dados da linha
     except FileNotFoundError:
-        logging.error(f"O arquivo {file_path} não foi encontrado.")
+        logging.error("O arquivo %s não foi encontrado.", file_path)
+        if strict:
+            raise
     except Exception as e:
-        logging.error(f"Ocorreu um erro ao ler o arquivo: {e}")
-    
-    logging.info(f"Retorno DTO: {dtos}")
-    return dtos
\ No newline at end of file
+        logging.error("Ocorreu um erro ao ler o arquivo: %s", e)
+        if strict:
+            raise
+
+# Função para ler o arquivo CSV em blocos de tamanho fixo
+def read_csv_in_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[CsvDto]]:
+    """
+    Lê um arquivo CSV em blocos de até `chunk_size` objetos CsvDto.
+
+    Apenas um bloco fica em memória por vez, então o consumo não cresce com o tamanho do arquivo.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        chunk_size (int): A quantidade máxima de linhas por bloco.
+
+    Yields:
+        List[CsvDto]: Os blocos de objetos CsvDto, na ordem do arquivo.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size deve ser positivo, recebido: {chunk_size}")
+
+    rows = iter_csv_dto(file_path)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+# Função para ler o arquivo CSV e retornar uma lista de objetos DTO
+def read_csv_to_dto(file_path: str) -> List[CsvDto]:
+    """
+    Lê um arquivo CSV e converte cada linha em um objeto CsvDto.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+
+    Returns:
+        List[CsvDto]: Uma lista de objetos CsvDto.
+    """
+    dtos = list(iter_csv_dto(file_path))
+
+    logging.info("Linhas lidas do CSV: %d", len(dtos))
+    return dtos
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.models.model import DEFAULT_CHUNK_SIZE, read_csv_in_chunks
+from src.services.dashboard import import_chart_dependencies, render_dashboard
+from src.services.download_data import create_session, download_file
+from src.services.report_generator import REPORT_FORMATS, generate_reports, import_report_dependencies
+from src.utils.aggregator import Accumulator, accumulate_chunks, aggregate_chunks, finalize
+from src.utils.approximate import (
+    APPROXIMATE_METRICS,
+    apply_approximate_results,
+    approximate_metric_names,
+    merge_approximate,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Diretório dos resultados de cada lote (um subdiretório por execução e por dataset)
+BATCH_DIR = './data/processed/batch/'
+
+# Diretório dos arquivos baixados (um subdiretório por dataset)
+RAW_DIR = './data/raw/'
+
+# Downloads simultâneos (e conexões mantidas pela sessão compartilhada)
+DEFAULT_FETCH_CONCURRENCY = 8
+
+_NAME_PATTERN = re.compile(r'[\w.-]+')
+
+class DatasetSpec(NamedTuple):
+    """Um dataset do lote: o nome (usado nos diretórios e na comparação) e a URL ou o caminho local."""
+    name: str
+    source: str
+
+def _is_url(source: str) -> bool:
+    return urlparse(source).scheme in ('http', 'https')
+
+def _default_name(source: str) -> str:
+    path = urlparse(source).path if _is_url(source) else source
+    stem = os.path.splitext(os.path.basename(path.rstrip('/')))[0]
+    return re.sub(r'[^\w.-]+', '_', stem) or 'dataset'
+
+def load_manifest(manifest_path: str) -> List[DatasetSpec]:
+    """
+    Lê o manifesto do lote: uma linha por dataset, com `nome fonte` ou apenas `fonte` (URL ou
+    caminho local; o nome passa a ser o nome do arquivo). Linhas vazias e iniciadas por `#` são ignoradas.
+
+    Raises:
+        ValueError: Se uma linha for inválida ou se dois datasets tiverem o mesmo nome.
+    """
+    specs = []
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) > 2:
+                raise ValueError(f"Linha {line_number} do manifesto inválida: {line.strip()}")
+            name, source = fields if len(fields) == 2 else (_default_name(fields[0]), fields[0])
+            if not _NAME_PATTERN.fullmatch(name):
+                raise ValueError(f"Nome de dataset inválido na linha {line_number}: {name}")
+            specs.append(DatasetSpec(name, source))
+
+    names = [spec.name for spec in specs]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Nomes de dataset repetidos no manifesto: {duplicated}")
+    return specs
+
+def _analyse_file(
+    file_path: str, chunk_size: int, approximate: bool = False,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Accumulator]]]:
+    # Executado nos processos do lote: agrega o CSV em blocos, com memória limitada por dataset
+    if not approximate:
+        return aggregate_chunks(read_csv_in_chunks(file_path, chunk_size)), None
+
+    # No modo aproximado, os sketches voltam junto com o resultado para serem combinados entre os datasets
+    accumulators = accumulate_chunks(read_csv_in_chunks(file_path, chunk_size), approximate_metric_names())
+    results = apply_approximate_results(finalize(accumulators))
+    return results, {name: accumulators[name] for name in APPROXIMATE_METRICS}
+
+async def _process_dataset(
+    spec: DatasetSpec,
+    batch_dir: str,
+    date: str,
+    session: Any,
+    fetch_limit: asyncio.Semaphore,
+    io_pool: Executor,
+    pool: Executor,
+    chunk_size: int,
+    report_formats: Optional[List[str]],
+    chart_formats: List[str],
+    approximate: bool = False,
+) -> Dict[str, Any]:
+    """Baixa (se necessário), analisa e exporta um dataset. Erros ficam registrados no resumo."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    summary: Dict[str, Any] = {
+        'name': spec.name, 'source': spec.source, 'results': None, 'sketches': None, 'error': None,
+    }
+
+    try:
+        if _is_url(spec.source):
+            output_path = os.path.join(RAW_DIR, spec.name, f'DataSetNetflix_{date}.csv')
+            async with fetch_limit:
+                file_path = await loop.run_in_executor(
+                    io_pool, partial(download_file, spec.source, output_path, session=session)
+                )
+            if file_path is None:
+                raise RuntimeError("download falhou")
+        else:
+            file_path = spec.source
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"arquivo não encontrado: {file_path}")
+
+        results, sketches = await loop.run_in_executor(pool, _analyse_file, file_path, chunk_size, approximate)
+
+        # Relatórios e gráficos do dataset, executados no mesmo pool de processos do lote
+        out_dir = os.path.join(batch_dir, spec.name)
+        os.makedirs(out_dir, exist_ok=True)
+        reports, _ = await asyncio.gather(
+            loop.run_in_executor(io_pool, partial(
+                generate_reports, **results, date=date, formats=report_formats, output_dir=out_dir, pool=pool,
+            )),
+            loop.run_in_executor(io_pool, partial(
+                render_dashboard, results, os.path.join(out_dir, 'charts'), formats=chart_formats, pool=pool,
+            )),
+        )
+        errors = [f"{report_format}: {report['error']}" for report_format, report in reports.items() if report['error']]
+        summary['results'] = results
+        summary['sketches'] = sketches
+        summary['error'] = "; ".join(errors) or None
+    except Exception as e:
+        logging.error("Ocorreu um erro ao processar o dataset %s: %s", spec.name, e)
+        summary['error'] = str(e)
+
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    logging.info("Dataset %s processado em %s s", spec.name, summary['seconds'])
+    return summary
+
+def _pivot(summaries: List[Dict[str, Any]], metric: str, key: str, value: str) -> "pd.DataFrame":
+    """Tabela `key` x dataset com o valor `value` da métrica de cada dataset (0 se ausente)."""
+    import pandas as pd
+
+    columns = {
+        summary['name']: {item[key]: item[value] for item in summary['results'][metric]}
+        for summary in summaries if summary['results'] is not None
+    }
+    table = pd.DataFrame(columns).fillna(0).astype(int)
+    table.index.name = key.capitalize()
+    return table
+
+def _combined_sheets(combined: Dict[str, Any]) -> Dict[str, "pd.DataFrame"]:
+    """Planilhas das métricas aproximadas de todos os datasets juntos (sketches combinados)."""
+    import pandas as pd
+
+    summary = [
+        {'Metric': 'Unique Directors', 'Estimate': combined['unique_directors']['estimate'],
+         'Relative Error': combined['unique_directors']['relative_error']},
+        {'Metric': 'Unique Actors', 'Estimate': combined['unique_actors']['estimate'],
+         'Relative Error': combined['unique_actors']['relative_error']},
+    ]
+    return {
+        'All Datasets (approx.)': pd.DataFrame(summary),
+        'All - Top Directors': pd.DataFrame(combined['approximate_directors']),
+        'All - Top Cast': pd.DataFrame(combined['approximate_cast']),
+        'All - Titles by Country': pd.DataFrame(combined['approximate_countries']),
+    }
+
+def write_comparison_workbook(
+    summaries: List[Dict[str, Any]], path: str, combined: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Grava a planilha de comparação entre os datasets do lote: um resumo por dataset e as
+    contagens por ano, classificação e país lado a lado, além dos principais diretores de cada um.
+    No modo aproximado, `combined` (as métricas dos sketches combinados) ganha planilhas próprias.
+    """
+    import pandas as pd
+
+    rows = []
+    directors = []
+    for summary in summaries:
+        results = summary['results'] or {}
+        movies = results.get('total_movies') or {}
+        series = results.get('total_series') or {}
+        top_directors = results.get('directors') or []
+        rows.append({
+            'Dataset': summary['name'],
+            'Source': summary['source'],
+            'Movies': movies.get('count'),
+            'Movies %': movies.get('percentage'),
+            'Series': series.get('count'),
+            'Series %': series.get('percentage'),
+            'Countries': len(results['titles_by_country']) if results else None,
+            'Top Director': top_directors[0]['director'] if top_directors else None,
+            'Seconds': summary['seconds'],
+            'Error': summary['error'],
+        })
+        directors += [
+            {'Dataset': summary['name'], 'Rank': rank, 'Director': item['director'], 'Count': item['count']}
+            for rank, item in enumerate(top_directors, start=1)
+        ]
+
+    by_year = _pivot(summaries, 'total_by_years', 'year', 'count').sort_index()
+    by_rating = _pivot(summaries, 'titles_by_rating', 'rating', 'total')
+    by_country = _pivot(summaries, 'titles_by_country', 'country', 'total')
+    by_country = by_country.loc[by_country.sum(axis=1).sort_values(ascending=False, kind='stable').index]
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name='Summary', index=False)
+        by_year.to_excel(writer, sheet_name='Titles by Year')
+        by_rating.to_excel(writer, sheet_name='Titles by Rating')
+        by_country.to_excel(writer, sheet_name='Titles by Country')
+        pd.DataFrame(directors, columns=['Dataset', 'Rank', 'Director', 'Count']).to_excel(
+            writer, sheet_name='Top Directors', index=False
+        )
+        for sheet_name, df in (_combined_sheets(combined) if combined else {}).items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+async def run_batch(
+    specs: Iterable[DatasetSpec],
+    date: str,
+    workers: Optional[int] = None,
+    fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    report_formats: Optional[Iterable[str]] = None,
+    chart_formats: Iterable[str] = ('png',),
+    batch_dir: str = BATCH_DIR,
+    approximate: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Processa vários datasets em uma única execução (as importações e os processos são criados
+    uma única vez por lote):
+
+    - os downloads compartilham uma sessão HTTP (pool de conexões), até `fetch_concurrency` ao mesmo tempo;
+    - as análises, os relatórios e os gráficos de todos os datasets dividem um único pool com
+      `workers` processos (o orçamento global do lote);
+    - cada dataset tem os seus relatórios e gráficos em `<batch_dir>/<date>/<nome>/`, e a planilha
+      `comparison_<date>.xlsx` compara todos eles.
+
+    A falha de um dataset não interrompe os demais: o erro aparece no resumo e na planilha.
+
+    Com `approximate`, diretores, elenco e países são estimados com sketches (o modo aproximado
+    de `src.utils.approximate`), e os sketches de todos os datasets são combinados na planilha de
+    comparação, como se fossem um único catálogo.
+
+    Returns:
+        List[Dict[str, Any]]: Um resumo por dataset, na ordem do manifesto: `name`, `source`,
+        `results` (None se falhou), `sketches` (os acumuladores do modo aproximado), `seconds` e `error`.
+    """
+    specs = list(specs)
+    workers = workers or os.cpu_count() or 1
+    report_formats = list(report_formats) if report_formats is not None else None
+    chart_formats = list(chart_formats)
+    out_dir = os.path.join(batch_dir, date)
+    os.makedirs(out_dir, exist_ok=True)
+    logging.info("Lote com %d datasets, %d processos e %d downloads simultâneos", len(specs), workers, fetch_concurrency)
+
+    # Bibliotecas dos relatórios e gráficos carregadas antes dos processos, que as herdam (fork)
+    import_report_dependencies(report_formats if report_formats is not None else REPORT_FORMATS)
+    import_chart_dependencies()
+
+    session = create_session(pool_size=fetch_concurrency)
+    fetch_limit = asyncio.Semaphore(fetch_concurrency)
+    try:
+        # As threads só esperam (rede e resultados do pool), então não contam no orçamento de processos
+        with ProcessPoolExecutor(max_workers=workers) as pool, \
+                ThreadPoolExecutor(max_workers=fetch_concurrency + 2 * len(specs)) as io_pool:
+            summaries = await asyncio.gather(*(
+                _process_dataset(
+                    spec, out_dir, date, session, fetch_limit, io_pool, pool, chunk_size, report_formats, chart_formats,
+                    approximate,
+                )
+                for spec in specs
+            ))
+    finally:
+        session.close()
+
+    comparison_path = os.path.join(out_dir, f'comparison_{date}.xlsx')
+    combined = None
+    if approximate:
+        combined = merge_approximate(summary['sketches'] for summary in summaries if summary['sketches'] is not None)
+    write_comparison_workbook(summaries, comparison_path, combined)
+    failed = [summary['name'] for summary in summaries if summary['results'] is None]
+    logging.info("Lote concluído: %d datasets, %d com falha. Comparação salva em: %s", len(summaries), len(failed), comparison_path)
+    return summaries
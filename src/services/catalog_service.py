@@ -0,0 +1,389 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.models.model import split_names
+from src.services.dataset_cache import CACHE_DIR, load_cached_dataset
+from src.utils.index import DATE_FIELDS, INDEXED_FIELDS, CatalogIndex
+from src.utils.people import PersonIndex
+from src.utils.vectorized import aggregate_columnar, list_longest_movies, list_longest_series, top_directors
+
+# Diretório observado: o snapshot mais recente (CSV) é o catálogo servido
+RAW_DIR = './data/raw/'
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Respostas de consultas parametrizadas guardadas em memória (LRU)
+DEFAULT_CACHE_SIZE = 1024
+
+# Intervalo entre as verificações de um novo snapshot em `RAW_DIR`, em segundos
+DEFAULT_POLL_SECONDS = 5.0
+
+# Limites dos parâmetros das consultas
+MAX_TOP_N = 1000
+DEFAULT_TITLES_LIMIT = 100
+
+class QueryError(ValueError):
+    """Parâmetro inválido em uma consulta (respondido com 400)."""
+
+class SnapshotFile(NamedTuple):
+    """Identificação de um arquivo de snapshot: caminho, tamanho e data de modificação."""
+    path: str
+    size: int
+    mtime: float
+
+def latest_snapshot(raw_dir: str = RAW_DIR) -> Optional[SnapshotFile]:
+    """Retorna o CSV modificado mais recentemente em `raw_dir` (None se não houver nenhum)."""
+    latest = None
+    for path in glob.glob(os.path.join(raw_dir, '*.csv')):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if latest is None or stat.st_mtime > latest.mtime:
+            latest = SnapshotFile(path, stat.st_size, stat.st_mtime)
+    return latest
+
+class CatalogSnapshot:
+    """
+    Um snapshot do catálogo carregado em memória: o dataset colunar, os índices invertidos, as
+    métricas completas (calculadas uma única vez na carga) e o índice de pessoas.
+    """
+
+    def __init__(self, file: SnapshotFile, version: int, cache_dir: str = CACHE_DIR):
+        start = time.perf_counter()
+        self.file = file
+        self.version = version
+        self.dataset = load_cached_dataset(file.path, cache_dir=cache_dir)
+        self.index = CatalogIndex(self.dataset).build()
+        self.results = aggregate_columnar(self.dataset, self.index)
+
+        self.people = PersonIndex()
+        columns = (self.dataset.column(name).to_numpy(dtype=object) for name in ('title', 'director', 'cast'))
+        for title, director, cast in zip(*columns):
+            self.people.add_names(title, split_names(director), split_names(cast))
+
+        self.loaded_at = time.time()
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        logging.info(
+            "Snapshot %d carregado em %s s: %s (%d títulos, %d pessoas)",
+            version, self.load_seconds, file.path, len(self.dataset), len(self.people.registry),
+        )
+
+class QueryCache:
+    """Cache LRU (limitado a `max_size` entradas) das respostas já serializadas, seguro entre threads."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Any, compute: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Calculado fora do lock: duas requisições iguais simultâneas apenas repetem o cálculo
+        value = compute()
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, minimum: int = 0, maximum: int = MAX_TOP_N) -> int:
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        raise QueryError(f"{name} deve ser um número inteiro, recebido: {values[-1]}")
+    if not minimum <= value <= maximum:
+        raise QueryError(f"{name} deve estar entre {minimum} e {maximum}, recebido: {value}")
+    return value
+
+def _filters(params: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Critérios de `CatalogIndex.filter` a partir da query string (um parâmetro repetido aceita qualquer dos valores)."""
+    criteria = {}
+    for field, values in params.items():
+        if field not in INDEXED_FIELDS:
+            continue
+        if field in DATE_FIELDS:
+            try:
+                values = [int(value) for value in values]
+            except ValueError:
+                raise QueryError(f"{field} deve ser um número inteiro, recebido: {values}")
+        criteria[field] = values[0] if len(values) == 1 else values
+    return criteria
+
+class CatalogService:
+    """
+    As consultas do serviço sobre o snapshot atual. Cada rota recebe o snapshot e os parâmetros
+    da query string e retorna um valor serializável em JSON; as respostas ficam no `QueryCache`,
+    indexadas pela versão do snapshot, pela rota e pelos parâmetros.
+    """
+
+    def __init__(self, raw_dir: str = RAW_DIR, cache_size: int = DEFAULT_CACHE_SIZE, cache_dir: str = CACHE_DIR):
+        self.raw_dir = raw_dir
+        self.cache_dir = cache_dir
+        self.cache = QueryCache(cache_size)
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._versions = 0
+        self._reload_lock = threading.Lock()
+        self._routes: Dict[str, Callable[[CatalogSnapshot, Dict[str, List[str]]], Any]] = {
+            '/metrics': self._metrics,
+            '/titles': self._titles,
+            '/count': self._count,
+            '/directors': self._directors,
+            '/longest/movies': lambda snapshot, params: list_longest_movies(snapshot.dataset, _int_param(params, 'top_n', 5, 1)),
+            '/longest/series': lambda snapshot, params: list_longest_series(snapshot.dataset, _int_param(params, 'top_n', 5, 1)),
+            '/people/directors_as_actors': lambda snapshot, params: snapshot.people.directors_as_actors(),
+            '/people/prolific': lambda snapshot, params: snapshot.people.prolific_actors(_int_param(params, 'top_n', 10, 1)),
+            '/people/collaborations': lambda snapshot, params: snapshot.people.collaborations(_int_param(params, 'top_n', 10, 1)),
+            '/people/titles': self._person_titles,
+        }
+
+    def reload(self, file: SnapshotFile) -> bool:
+        """
+        Carrega o snapshot informado e passa a servi-lo. As requisições em andamento terminam com o
+        snapshot anterior; se a carga falhar, o anterior continua sendo servido.
+        """
+        with self._reload_lock:
+            try:
+                snapshot = CatalogSnapshot(file, self._versions + 1, cache_dir=self.cache_dir)
+            except Exception as e:
+                logging.error("Falha ao carregar o snapshot %s: %s", file.path, e)
+                return False
+            self._versions = snapshot.version
+            self.snapshot = snapshot
+            self.cache.clear()
+            return True
+
+    def health(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            'status': 'ok' if snapshot is not None else 'loading',
+            'snapshot': None if snapshot is None else {
+                'version': snapshot.version,
+                'path': snapshot.file.path,
+                'titles': len(snapshot.dataset),
+                'loaded_at': snapshot.loaded_at,
+                'load_seconds': snapshot.load_seconds,
+            },
+            'cache': {'entries': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+
+    def handle(self, target: str) -> Tuple[int, bytes]:
+        """Responde a uma requisição GET: retorna o status HTTP e o corpo em JSON."""
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        if path == '/health':
+            return 200, _encode(self.health())
+
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, _encode({'error': "Nenhum snapshot carregado (aguardando um CSV em data/raw/)"})
+
+        route = self._routes.get(path)
+        if route is None and path.startswith('/metrics/'):
+            route = partial(self._metric, path[len('/metrics/'):])
+        if route is None:
+            return 404, _encode({'error': f"Rota não encontrada: {path}", 'routes': sorted(self._routes) + ['/health', '/metrics/<nome>']})
+
+        params = parse_qs(url.query)
+        key = (snapshot.version, path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        try:
+            return 200, self.cache.get_or_compute(key, lambda: _encode(route(snapshot, params)))
+        except QueryError as e:
+            return 400, _encode({'error': str(e)})
+        except KeyError as e:
+            return 404, _encode({'error': f"Não encontrado: {e.args[0]}"})
+
+    def _metrics(self, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        names = [name for value in params.get('names', []) for name in value.split(',') if name]
+        return {name: snapshot.results[name] for name in names} if names else snapshot.results
+
+    def _metric(self, name: str, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> Any:
+        return snapshot.results[name]
+
+    def _titles(self, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        rows = snapshot.index.filter(**_filters(params))
+        offset = _int_param(params, 'offset', 0, maximum=len(rows))
+        limit = _int_param(params, 'limit', DEFAULT_TITLES_LIMIT, maximum=MAX_TOP_N)
+        return {'count': len(rows), 'titles': snapshot.index.titles(rows[offset:offset + limit])}
+
+    def _count(self, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        criteria = _filters(params)
+        rows = snapshot.index.filter(**criteria)
+        result = {'count': len(rows)}
+        group_by = params.get('group_by')
+        if group_by:
+            if group_by[-1] not in INDEXED_FIELDS:
+                raise QueryError(f"group_by deve ser um dos campos {list(INDEXED_FIELDS)}, recebido: {group_by[-1]}")
+            counts = snapshot.index.group_by(group_by[-1], rows if criteria else None)
+            result['groups'] = [{group_by[-1]: value, 'count': count} for value, count in counts.items()]
+        return result
+
+    def _directors(self, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        # Com filtros, os diretores mais frequentes só entre os títulos selecionados
+        criteria = _filters(params)
+        rows = snapshot.index.filter(**criteria) if criteria else None
+        return top_directors(snapshot.dataset, _int_param(params, 'top_n', 5, 1), rows)
+
+    def _person_titles(self, snapshot: CatalogSnapshot, params: Dict[str, List[str]]) -> Dict[str, Any]:
+        names = params.get('name')
+        if not names:
+            raise QueryError("Informe o parâmetro name")
+        titles = snapshot.people.titles_with(names[-1])
+        return {'name': names[-1], 'count': len(titles), 'titles': titles}
+
+class SnapshotWatcher(threading.Thread):
+    """
+    Verifica `raw_dir` a cada `poll_seconds` e recarrega o serviço quando aparece um snapshot mais
+    recente. O arquivo só é carregado depois de ficar igual (tamanho e data) em duas verificações
+    seguidas, para não ler um CSV ainda sendo copiado.
+    """
+
+    def __init__(self, service: CatalogService, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        super().__init__(name='snapshot-watcher', daemon=True)
+        self.service = service
+        self.poll_seconds = poll_seconds
+        self._stopped = threading.Event()
+        self._candidate: Optional[SnapshotFile] = None
+        # Snapshot cuja carga falhou: só é tentado de novo se o arquivo mudar
+        self._failed: Optional[SnapshotFile] = None
+
+    def check(self) -> bool:
+        """Uma verificação: recarrega se houver um snapshot novo e estável. Retorna se recarregou."""
+        latest = latest_snapshot(self.service.raw_dir)
+        current = self.service.snapshot
+        if latest is None or latest == self._failed or (current is not None and latest == current.file):
+            self._candidate = None
+            return False
+        if latest != self._candidate:
+            self._candidate = latest
+            return False
+        self._candidate = None
+        logging.info("Novo snapshot encontrado: %s", latest.path)
+        if not self.service.reload(latest):
+            self._failed = latest
+            return False
+        return True
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error("Falha ao verificar os snapshots em %s: %s", self.service.raw_dir, e)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: conexões mantidas entre requisições (todas as respostas têm Content-Length)
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo saem em escritas separadas: sem isso, o algoritmo de Nagle somado ao ACK
+    # atrasado do cliente segura cada resposta por ~40 ms nas conexões mantidas
+    disable_nagle_algorithm = True
+    service: CatalogService
+
+    def do_GET(self) -> None:
+        try:
+            status, body = self.service.handle(self.path)
+        except Exception as e:
+            logging.error("Erro ao responder %s: %s", self.path, e)
+            status, body = 500, _encode({'error': "Erro interno"})
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # Cliente desconectou antes de receber toda a resposta
+            logging.debug("Conexão encerrada pelo cliente durante %s", self.path)
+            self.close_connection = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+def create_server(service: CatalogService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type('Handler', (CatalogRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    raw_dir: str = RAW_DIR,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    cache_dir: str = CACHE_DIR,
+    ready: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Executa o serviço HTTP local: carrega o snapshot mais recente de `raw_dir` uma única vez,
+    mantém o dataset, os índices e as métricas em memória e responde às consultas em JSON até
+    ser interrompido (Ctrl+C). Um snapshot novo em `raw_dir` é carregado sem reiniciar o serviço.
+
+    Rotas (GET): `/health`, `/metrics` (`?names=a,b`), `/metrics/<nome>`, `/titles` e `/count`
+    (filtros por `director`, `cast`, `country`, `rating`, `type`, `year_added`, `month_added`,
+    `weekday_added`; `/count` também aceita `group_by`), `/directors?top_n=`, `/longest/movies`,
+    `/longest/series`, `/people/directors_as_actors`, `/people/prolific`, `/people/collaborations`
+    e `/people/titles?name=`.
+
+    Com `port=0`, o sistema escolhe uma porta livre; `ready`, se informada, é chamada com a porta
+    assim que ela é reservada (antes da carga do snapshot).
+    """
+    service = CatalogService(raw_dir=raw_dir, cache_size=cache_size, cache_dir=cache_dir)
+    # A porta é reservada antes da carga: um erro (porta em uso) aparece sem esperar o snapshot
+    server = create_server(service, host, port)
+    if ready is not None:
+        ready(server.server_address[1])
+    latest = latest_snapshot(raw_dir)
+    if latest is not None:
+        service.reload(latest)
+    else:
+        logging.warning("Nenhum CSV em %s: o serviço responde 503 até um snapshot ser baixado.", raw_dir)
+
+    watcher = SnapshotWatcher(service, poll_seconds)
+    watcher.start()
+    logging.info("Serviço disponível em http://%s:%d", host, server.server_address[1])
+    print(f"Serviço disponível em http://{host}:{server.server_address[1]} (Ctrl+C para encerrar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.server_close()
@@ -1,98 +1,241 @@
-import matplotlib.pyplot as plt
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
 
-def plot_movies_and_series(count_movies, count_series):
+# matplotlib só é importado quando um gráfico é desenhado (ver `import_chart_dependencies`)
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+def draw_movies_and_series(fig, count_movies, count_series):
     categories = ['Filmes', 'Séries']
     counts = [count_movies['count'], count_series['count']]
 
-    plt.figure(figsize=(8, 5))
-    plt.bar(categories, counts, color=['blue', 'orange'])
-    plt.title('Total de Filmes e Séries')
-    plt.ylabel('Contagem')
-    plt.ylim(0, max(counts) + 50)  # Ajusta o limite do eixo Y
-    plt.grid(axis='y')
-    plt.show()
+    ax = fig.add_subplot()
+    ax.bar(categories, counts, color=['blue', 'orange'])
+    ax.set_title('Total de Filmes e Séries')
+    ax.set_ylabel('Contagem')
+    ax.set_ylim(0, max(counts) + 50)  # Ajusta o limite do eixo Y
+    ax.grid(axis='y')
 
-def plot_titles_by_year(titles_by_year):
+def draw_titles_by_year(fig, titles_by_year):
     years = [item['year'] for item in titles_by_year]
     counts = [item['count'] for item in titles_by_year]
 
-    plt.figure(figsize=(10, 5))
-    plt.plot(years, counts, marker='o')
-    plt.title('Títulos Adicionados por Ano')
-    plt.xlabel('Ano')
-    plt.ylabel('Contagem')
-    plt.xticks(rotation=45)
-    plt.grid()
-    plt.show()
+    ax = fig.add_subplot()
+    ax.plot(years, counts, marker='o')
+    ax.set_title('Títulos Adicionados por Ano')
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Contagem')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid()
 
-def plot_titles_by_rating(titles_by_rating):
+def draw_titles_by_rating(fig, titles_by_rating):
     ratings = [item['rating'] for item in titles_by_rating]
     totals = [item['total'] for item in titles_by_rating]
 
-    plt.figure(figsize=(8, 8))
-    plt.pie(totals, labels=ratings, autopct='%1.1f%%', startangle=140)
-    plt.title('Distribuição de Títulos por Classificação')
-    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
-    plt.show()
+    ax = fig.add_subplot()
+    ax.pie(totals, labels=ratings, autopct='%1.1f%%', startangle=140)
+    ax.set_title('Distribuição de Títulos por Classificação')
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
 
-def plot_top_directors(top_directors):
+def draw_top_directors(fig, top_directors):
     directors = [item['director'] for item in top_directors]
     counts = [item['count'] for item in top_directors]
 
-    plt.figure(figsize=(10, 6))
-    plt.barh(directors, counts, color='green')
-    plt.title('Top Diretores')
-    plt.xlabel('Contagem de Títulos')
-    plt.grid(axis='x')
-    plt.show()
+    ax = fig.add_subplot()
+    ax.barh(directors, counts, color='green')
+    ax.set_title('Top Diretores')
+    ax.set_xlabel('Contagem de Títulos')
+    ax.grid(axis='x')
 
-def plot_titles_by_country(titles_by_country):
+def draw_titles_by_country(fig, titles_by_country):
     countries = [item['country'] for item in titles_by_country]
     totals = [item['total'] for item in titles_by_country]
 
-    plt.figure(figsize=(12, 6))
-    plt.bar(countries[:10], totals[:10], color='purple')  # Top 10 países
-    plt.title('Títulos por País (Top 10)')
-    plt.xlabel('País')
-    plt.ylabel('Contagem de Títulos')
-    plt.xticks(rotation=45)
-    plt.grid(axis='y')
-    plt.show()
+    ax = fig.add_subplot()
+    ax.bar(countries[:10], totals[:10], color='purple')  # Top 10 países
+    ax.set_title('Títulos por País (Top 10)')
+    ax.set_xlabel('País')
+    ax.set_ylabel('Contagem de Títulos')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(axis='y')
 
-def plot_directors_as_actors(directors_actors):
+def draw_directors_as_actors(fig, directors_actors):
     directors = [item['director'] for item in directors_actors]
     counts = [item['count'] for item in directors_actors]
 
-    plt.figure(figsize=(10, 6))
-    plt.barh(directors, counts, color='red')
-    plt.title('Diretores que Atuaram em Suas Próprias Produções')
-    plt.xlabel('Contagem de Títulos')
-    plt.grid(axis='x')
-    plt.show()
+    ax = fig.add_subplot()
+    ax.barh(directors, counts, color='red')
+    ax.set_title('Diretores que Atuaram em Suas Próprias Produções')
+    ax.set_xlabel('Contagem de Títulos')
+    ax.grid(axis='x')
 
-def plot_longest_movies(longest_movies):
+def draw_longest_movies(fig, longest_movies):
     # Corrige para usar 'title' em vez de 'movie'
     movies = [item['title'] for item in longest_movies]
     durations = [item['duration'] for item in longest_movies]
 
-    plt.figure(figsize=(10, 6))
-    plt.barh(movies, durations, color='blue')
-    plt.title('Top 5 Filmes Mais Longos')
-    plt.xlabel('Duração (minutos)')
-    plt.ylabel('Filmes')
-    plt.grid(axis='x')
-    plt.show()
+    ax = fig.add_subplot()
+    ax.barh(movies, durations, color='blue')
+    ax.set_title('Top 5 Filmes Mais Longos')
+    ax.set_xlabel('Duração (minutos)')
+    ax.set_ylabel('Filmes')
+    ax.grid(axis='x')
 
-def plot_longest_series(longest_series):
+def draw_longest_series(fig, longest_series):
     # Corrige para usar 'title' em vez de 'series'
     series = [item['title'] for item in longest_series]
     seasons = [item['seasons'] for item in longest_series]
 
-    plt.figure(figsize=(10, 6))
-    plt.barh(series, seasons, color='green')
-    plt.title('Top 5 Séries com Mais Temporadas')
-    plt.xlabel('Número de Temporadas')
-    plt.ylabel('Séries')
-    plt.grid(axis='x')
+    ax = fig.add_subplot()
+    ax.barh(series, seasons, color='green')
+    ax.set_title('Top 5 Séries com Mais Temporadas')
+    ax.set_xlabel('Número de Temporadas')
+    ax.set_ylabel('Séries')
+    ax.grid(axis='x')
+
+# Gráficos do dashboard: nome -> (função de desenho, tamanho da figura, chaves dos resultados usadas)
+CHARTS = {
+    'movies_and_series': (draw_movies_and_series, (8, 5), ('total_movies', 'total_series')),
+    'titles_by_year': (draw_titles_by_year, (10, 5), ('total_by_years',)),
+    'titles_by_rating': (draw_titles_by_rating, (8, 8), ('titles_by_rating',)),
+    'top_directors': (draw_top_directors, (10, 6), ('directors',)),
+    'titles_by_country': (draw_titles_by_country, (12, 6), ('titles_by_country',)),
+    'directors_as_actors': (draw_directors_as_actors, (10, 6), ('directors_actors',)),
+    'longest_movies': (draw_longest_movies, (10, 6), ('longest_movies',)),
+    'longest_series': (draw_longest_series, (10, 6), ('longest_series',)),
+}
+
+# Campos de cada resultado desenhados pelos gráficos e quantos itens entram (None = todos). Só isso
+# é enviado aos processos: as listas de títulos de cada classificação, país ou diretor ficam de fora
+CHART_FIELDS: Dict[str, Tuple[Tuple[str, ...], Optional[int]]] = {
+    'total_movies': (('count',), None),
+    'total_series': (('count',), None),
+    'total_by_years': (('year', 'count'), None),
+    'titles_by_rating': (('rating', 'total'), None),
+    'directors': (('director', 'count'), None),
+    'titles_by_country': (('country', 'total'), 10),
+    'directors_actors': (('director', 'count'), None),
+    'longest_movies': (('title', 'duration'), None),
+    'longest_series': (('title', 'seasons'), None),
+}
+
+def chart_data(results: Dict[str, Any], key: str) -> Any:
+    """Resultado `key` reduzido aos campos (e itens) que os gráficos desenham."""
+    value = results[key]
+    fields, limit = CHART_FIELDS[key]
+    if isinstance(value, dict):
+        return {field: value[field] for field in fields}
+    return [{field: item[field] for field in fields} for item in value[:limit]]
+
+def import_chart_dependencies() -> None:
+    """
+    Importa o matplotlib. Chamado antes de criar os processos dos gráficos, para que os processos
+    filhos (fork) herdem o módulo já carregado em vez de importá-lo cada um.
+    """
+    import matplotlib.figure
+
+def _show(chart: str, *data) -> None:
+    import matplotlib.pyplot as plt
+
+    draw, figsize, _ = CHARTS[chart]
+    fig = plt.figure(figsize=figsize)
+    draw(fig, *data)
     plt.show()
 
+def plot_movies_and_series(count_movies, count_series):
+    _show('movies_and_series', count_movies, count_series)
+
+def plot_titles_by_year(titles_by_year):
+    _show('titles_by_year', titles_by_year)
+
+def plot_titles_by_rating(titles_by_rating):
+    _show('titles_by_rating', titles_by_rating)
+
+def plot_top_directors(top_directors):
+    _show('top_directors', top_directors)
+
+def plot_titles_by_country(titles_by_country):
+    _show('titles_by_country', titles_by_country)
+
+def plot_directors_as_actors(directors_actors):
+    _show('directors_as_actors', directors_actors)
+
+def plot_longest_movies(longest_movies):
+    _show('longest_movies', longest_movies)
+
+def plot_longest_series(longest_series):
+    _show('longest_series', longest_series)
+
+# Figura off-screen reaproveitada por todos os gráficos renderizados no mesmo processo
+_figure: Optional["Figure"] = None
+
+def render_chart(chart: str, data: tuple, out_dir: str, formats: Iterable[str] = ('png',)) -> float:
+    """
+    Renderiza um gráfico em arquivo, sem interface gráfica (canvas Agg).
+
+    Returns:
+        float: O tempo de renderização, em segundos.
+    """
+    global _figure
+    start = time.perf_counter()
+    draw, figsize, _ = CHARTS[chart]
+
+    if _figure is None:
+        from matplotlib.figure import Figure
+        _figure = Figure()  # Figure sem pyplot usa o canvas Agg e não depende de display
+    _figure.clear()
+    _figure.set_size_inches(figsize)
+
+    draw(_figure, *data)
+    for image_format in formats:
+        _figure.savefig(os.path.join(out_dir, f"{chart}.{image_format}"), format=image_format, bbox_inches="tight")
+
+    return time.perf_counter() - start
+
+def render_dashboard(
+    results: Dict[str, Any],
+    out_dir: str,
+    formats: Iterable[str] = ('png',),
+    workers: Optional[int] = None,
+    pool: Optional[Executor] = None,
+) -> Dict[str, float]:
+    """
+    Renderiza todos os gráficos do dashboard em arquivos, em paralelo entre processos.
+
+    Args:
+        results (Dict[str, Any]): O resultado das análises (mesmas chaves de `aggregate`).
+        out_dir (str): O diretório onde os arquivos serão gravados.
+        formats (Iterable[str]): Os formatos de imagem (por exemplo, png e svg).
+        workers (Optional[int]): A quantidade de processos (padrão: um por gráfico, limitado pelos núcleos).
+        pool (Optional[Executor]): Pool de processos já existente (por exemplo, compartilhado entre
+            vários datasets); se omitido, um pool com `workers` processos é criado para esta chamada.
+
+    Returns:
+        Dict[str, float]: O tempo de renderização de cada gráfico, em segundos.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    formats = tuple(formats)
+    workers = workers or min(len(CHARTS), os.cpu_count() or 1)
+    import_chart_dependencies()
+
+    timings = {}
+    executor = pool or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            chart: executor.submit(render_chart, chart, tuple(chart_data(results, key) for key in keys), out_dir, formats)
+            for chart, (_, _, keys) in CHARTS.items()
+        }
+        for chart, future in futures.items():
+            try:
+                timings[chart] = round(future.result(), 3)
+                logging.info("Gráfico %s renderizado em %s s", chart, timings[chart])
+            except Exception as e:
+                logging.error("Ocorreu um erro ao renderizar o gráfico %s: %s", chart, e)
+    finally:
+        if pool is None:
+            executor.shutdown()
+
+    return timings
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import os
+import time
+from typing import Optional
+
+from src.models.columnar import ColumnarDataset, read_csv_to_columnar
+from src.utils.dates import normalize_dates
+
+# Diretório padrão do cache de datasets já processados
+CACHE_DIR = './data/cache/'
+
+# Versão do formato gravado: alterar invalida as entradas antigas
+CACHE_FORMAT_VERSION = 2
+
+# Limites padrão de eviction
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+def file_digest(file_path: str) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo, lendo-o em blocos.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_entry_path(digest: str, cache_dir: str = CACHE_DIR) -> str:
+    """Retorna o caminho da entrada de cache para o hash informado."""
+    return os.path.join(cache_dir, f"{digest}.v{CACHE_FORMAT_VERSION}.npz")
+
+def _remove_entry(path: str) -> bool:
+    """Remove um arquivo do cache; False se ele já tiver sido removido (por exemplo, por outra execução)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+def evict_cache(cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> None:
+    """
+    Remove as entradas do cache mais antigas que `max_age_seconds` e, em seguida, as usadas há mais
+    tempo até que o tamanho total fique dentro de `max_bytes`.
+
+    O "último uso" é a data de modificação do arquivo, atualizada a cada acerto do cache. Outras
+    execuções podem usar o mesmo diretório ao mesmo tempo: uma entrada que já sumiu é ignorada.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+
+    now = time.time()
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith('.npz'):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > max_age_seconds:
+            if _remove_entry(path):
+                logging.info("Entrada de cache expirada removida: %s", path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        if _remove_entry(path):
+            logging.info("Entrada de cache removida por limite de tamanho: %s", path)
+        total_bytes -= size
+
+def load_cached_dataset(
+    file_path: str,
+    cache_dir: str = CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+) -> ColumnarDataset:
+    """
+    Carrega o dataset de um CSV usando o cache indexado pelo hash do conteúdo.
+
+    Se o mesmo conteúdo já foi processado, o dataset é lido do arquivo binário em `cache_dir`
+    e o CSV não é analisado novamente. Caso contrário, o CSV é lido e o resultado é gravado no cache.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        cache_dir (str): O diretório do cache.
+        max_bytes (int): O tamanho máximo do cache, em bytes.
+        max_age_seconds (float): A idade máxima de uma entrada sem uso, em segundos.
+
+    Returns:
+        ColumnarDataset: O dataset colunar.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_path = cache_entry_path(file_digest(file_path), cache_dir)
+
+    dataset: Optional[ColumnarDataset] = None
+    if os.path.exists(entry_path):
+        try:
+            dataset = ColumnarDataset.load_npz(entry_path)
+            os.utime(entry_path)  # Marca a entrada como usada recentemente
+            logging.info("Dataset carregado do cache: %s", entry_path)
+        except Exception as e:
+            logging.error("Entrada de cache inválida, o CSV será lido novamente: %s", e)
+
+    if dataset is None:
+        dataset = read_csv_to_columnar(file_path)
+        if len(dataset):
+            normalize_dates(dataset)  # As colunas de data normalizadas também vão para o cache
+            # Grava em um arquivo temporário (um por processo) para nunca deixar uma entrada
+            # incompleta, e o remove se a gravação falhar
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            try:
+                dataset.save_npz(temp_path)
+                os.replace(temp_path, entry_path)
+                logging.info("Dataset gravado no cache: %s", entry_path)
+            except Exception as e:
+                logging.error("Não foi possível gravar o dataset no cache: %s", e)
+            finally:
+                _remove_entry(temp_path)
+
+    evict_cache(cache_dir, max_bytes, max_age_seconds)
+    return dataset
@@ -1,31 +1,213 @@
+import json
 import logging
-import requests
 import os
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Tamanho dos blocos gravados em disco durante o download
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Timeout de conexão e de leitura (entre blocos recebidos), em segundos
+DEFAULT_TIMEOUT = (10, 60)
+
+# Tentativas extras quando a transferência é interrompida no meio
+DEFAULT_RETRIES = 3
+
+# Arquivo, no diretório de saída, com o ETag/Last-Modified do último download de cada URL
+METADATA_FILE = '.downloads.json'
+
+_session: Optional[requests.Session] = None
+
+def create_session(retries: int = DEFAULT_RETRIES, backoff_factor: float = 1.0, pool_size: int = 10) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões e novas tentativas com backoff exponencial.
+
+    Args:
+        retries (int): Quantidade de novas tentativas para erros de conexão e respostas 429/5xx.
+        backoff_factor (float): Fator do backoff exponencial entre as tentativas.
+        pool_size (int): Quantidade máxima de conexões mantidas por host.
+
+    Returns:
+        requests.Session: A sessão configurada.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada pelo processo, criando-a na primeira chamada."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+def _load_metadata(output_dir: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(output_dir, METADATA_FILE), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_metadata(output_dir: str, metadata: Dict[str, Any]) -> None:
+    path = os.path.join(output_dir, METADATA_FILE)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def _request_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+    """Monta os cabeçalhos para retomar um download parcial ou fazer uma requisição condicional."""
+    partial = entry.get('partial')
+    if partial and os.path.exists(partial['path']):
+        validator = partial.get('etag') or partial.get('last_modified')
+        if validator:
+            return {'Range': f"bytes={os.path.getsize(partial['path'])}-", 'If-Range': validator}
+
+    headers = {}
+    if entry.get('path') and os.path.exists(entry['path']):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def _discard_partial(entry: Dict[str, Any]) -> None:
+    """Remove o download parcial (arquivo e registro) da URL."""
+    partial = entry.pop('partial', None) or {}
+    if partial.get('path') and os.path.exists(partial['path']):
+        os.remove(partial['path'])
+
+def _resume_offset(response: requests.Response, partial_path: str) -> Optional[int]:
+    """Retorna o deslocamento da resposta 206, se ela continuar exatamente do fim do arquivo parcial."""
+    content_range = response.headers.get('Content-Range', '')
+    if not content_range.startswith('bytes ') or not os.path.exists(partial_path):
+        return None
+    start = content_range[len('bytes '):].split('-', 1)[0]
+    if not start.isdigit() or int(start) != os.path.getsize(partial_path):
+        return None
+    return int(start)
 
 # Função para baixar o arquivo
-def download_file(url, output_path):
+def download_file(
+    url: str,
+    output_path: str,
+    session: Optional[requests.Session] = None,
+    timeout=DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    on_chunk: Optional[Callable[[bytes, int], None]] = None,
+) -> Optional[str]:
+    """
+    Baixa o arquivo em streaming, gravando-o em disco em blocos.
+
+    - Requisição condicional (If-None-Match / If-Modified-Since): se o servidor responder 304,
+      o arquivo do último download é reutilizado e nada é baixado.
+    - Retomada (Range / If-Range): um download interrompido fica em `<arquivo>.part` e continua
+      de onde parou, nesta execução (até `retries` vezes) ou na próxima.
+
+    Args:
+        url (str): A URL do arquivo.
+        output_path (str): O caminho onde o novo arquivo será gravado.
+        session (Optional[requests.Session]): A sessão HTTP (padrão: a sessão compartilhada).
+        timeout: O timeout de conexão e de leitura entre blocos.
+        retries (int): Quantas vezes retomar uma transferência interrompida.
+        on_chunk (Optional[Callable[[bytes, int], None]]): Chamada com cada bloco recebido e a sua
+            posição no arquivo, logo após a gravação (para processar os dados durante o download).
+
+    Returns:
+        Optional[str]: O caminho do arquivo com os dados (o novo arquivo ou o do último download,
+        se não houve mudança), ou None se o download falhou.
+    """
+    session = session or get_session()
     try:
-        logging.info(f"Iniciando download do arquivo de: {url}")
-        
+        logging.info("Iniciando download do arquivo de: %s", url)
+
         # Verifica se o diretório de saída existe
         output_dir = os.path.dirname(output_path)
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
-            logging.info(f"Diretório {output_dir} criado.")
-        
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()  # Levanta uma exceção se a resposta tiver um erro HTTP
+            logging.info("Diretório %s criado.", output_dir)
+
+        metadata = _load_metadata(output_dir)
+        entry = metadata.setdefault(url, {})
 
-        # Escreve o conteúdo do arquivo
-        with open(output_path, 'wb') as file:
-            file.write(response.content)
-        logging.info(f"Arquivo baixado com sucesso em: {output_path}")
+        attempt = 0
+        while True:
+            headers = _request_headers(entry)
+            streaming = False
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                    if response.status_code == 304:
+                        logging.info("Arquivo não mudou desde o último download, reutilizando: %s", entry.get('path'))
+                        return entry.get('path')
+
+                    if response.status_code == 416 and 'Range' in headers:
+                        # O arquivo parcial não pode ser retomado (por exemplo, já estava completo quando
+                        # a execução anterior parou antes de renomeá-lo): descarta e baixa do zero
+                        logging.warning("Download parcial não pode ser retomado (416), baixando o arquivo inteiro.")
+                        _discard_partial(entry)
+                        _save_metadata(output_dir, metadata)
+                        continue
+
+                    response.raise_for_status()  # Levanta uma exceção se a resposta tiver um erro HTTP
+
+                    partial = entry.get('partial') or {}
+                    offset = _resume_offset(response, partial.get('path', '')) if response.status_code == 206 else None
+                    if offset is None:
+                        # Servidor enviou o arquivo inteiro (ou a parte não confere): recomeça do zero
+                        _discard_partial(entry)
+                        partial = {'path': f"{output_path}.part"}
+                    partial['etag'] = response.headers.get('ETag')
+                    partial['last_modified'] = response.headers.get('Last-Modified')
+                    entry['partial'] = partial
+                    _save_metadata(output_dir, metadata)
+
+                    if offset:
+                        logging.info("Retomando download a partir do byte %d", offset)
+
+                    # Escreve o conteúdo do arquivo em blocos
+                    streaming = True
+                    position = offset or 0
+                    with open(partial['path'], 'ab' if offset else 'wb') as file:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            file.write(chunk)
+                            if on_chunk is not None:
+                                on_chunk(chunk, position)
+                            position += len(chunk)
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                # Falhas antes da transferência já passaram pelas novas tentativas da sessão
+                if not streaming or attempt == retries:
+                    raise
+                attempt += 1
+                logging.warning("Download interrompido (%s), tentativa %d de %d", err, attempt, retries)
+                continue
+
+            os.replace(partial['path'], output_path)
+            metadata[url] = {
+                'path': output_path,
+                'etag': partial.get('etag'),
+                'last_modified': partial.get('last_modified'),
+            }
+            _save_metadata(output_dir, metadata)
+            logging.info("Arquivo baixado com sucesso em: %s", output_path)
+            return output_path
 
     except requests.exceptions.HTTPError as http_err:
-        logging.error(f"Erro HTTP: {http_err}")
+        logging.error("Erro HTTP: %s", http_err)
     except requests.exceptions.ConnectionError as conn_err:
-        logging.error(f"Erro de conexão: {conn_err}")
+        logging.error("Erro de conexão: %s", conn_err)
     except requests.exceptions.Timeout as timeout_err:
-        logging.error(f"Erro de timeout: {timeout_err}")
+        logging.error("Erro de timeout: %s", timeout_err)
     except Exception as err:
-        logging.error(f"Ocorreu um erro: {err}")
+        logging.error("Ocorreu um erro: %s", err)
+
+    return None
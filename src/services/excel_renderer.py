@@ -0,0 +1,118 @@
+import logging
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+# Colunas com listas de títulos: em vez de um dicionário inteiro em uma célula, cada título vira
+# uma linha de uma planilha própria, em formato longo (chave da linha, título)
+EXCEL_LIST_COLUMNS = ('titles',)
+
+# Limites do formato xlsx: linhas por planilha, caracteres por célula e caracteres no nome da planilha
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_CELL_CHARS = 32_767
+EXCEL_MAX_SHEET_NAME = 31
+
+_HEADER_FONT = Font(bold=True)
+
+def _cell_value(value: Any) -> Any:
+    # O openpyxl só aceita escalares: o restante é gravado como texto, dentro do limite da célula
+    if value is None or isinstance(value, (bool, int, str)):
+        pass
+    elif isinstance(value, float):
+        return None if math.isnan(value) else value
+    elif hasattr(value, 'item') and not isinstance(value, (Mapping, list, tuple)):
+        return _cell_value(value.item())  # Escalares do numpy
+    else:
+        value = str(value)
+    if isinstance(value, str) and len(value) > EXCEL_MAX_CELL_CHARS:
+        return value[:EXCEL_MAX_CELL_CHARS - 3] + '...'
+    return value
+
+def _sheet_name(name: str, part: int) -> str:
+    if part == 1:
+        return name[:EXCEL_MAX_SHEET_NAME]
+    suffix = f" ({part})"
+    return name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+
+def _header_cells(sheet, header: List[str]) -> List[WriteOnlyCell]:
+    cells = []
+    for column in header:
+        cell = WriteOnlyCell(sheet, value=_cell_value(column))
+        cell.font = _HEADER_FONT
+        cells.append(cell)
+    return cells
+
+def _write_sheet(workbook: Workbook, name: str, header: List[str], rows: Iterable[Iterable[Any]]) -> None:
+    """
+    Grava as linhas em uma planilha do workbook em modo write-only (cada linha vai direto para o
+    arquivo temporário da planilha). Acima do limite de linhas do xlsx, continua em "nome (2)", "nome (3)"...
+    """
+    part = 0
+    sheet_rows = EXCEL_MAX_ROWS
+    for row in rows:
+        if sheet_rows == EXCEL_MAX_ROWS:
+            part += 1
+            sheet = workbook.create_sheet(_sheet_name(name, part))
+            sheet.append(_header_cells(sheet, header))
+            sheet_rows = 1
+        sheet.append([_cell_value(value) for value in row])
+        sheet_rows += 1
+
+    if part == 0:
+        # Seção sem linhas: a planilha existe, só com o cabeçalho
+        sheet = workbook.create_sheet(_sheet_name(name, 1))
+        if header:
+            sheet.append(_header_cells(sheet, header))
+
+def _list_items(value: Any) -> Iterable[Any]:
+    # As listas de títulos chegam como dicionários {posição: título} ou como listas
+    if isinstance(value, Mapping):
+        return value.values()
+    if isinstance(value, (list, tuple)):
+        return value
+    return () if value is None or (isinstance(value, float) and math.isnan(value)) else (value,)
+
+def _long_rows(df: pd.DataFrame, key_column: str, list_column: str) -> Iterator[tuple]:
+    for key, items in zip(df[key_column], df[list_column]):
+        for item in _list_items(items):
+            yield key, item
+
+def create_excel_report(sections: Dict[str, pd.DataFrame], excel_path: str) -> None:
+    """
+    Gera o relatório em Excel em modo streaming (workbook write-only do openpyxl): as linhas são
+    gravadas à medida que são produzidas, sem manter a árvore da planilha em memória.
+
+    Cada seção vira uma planilha. As colunas de `EXCEL_LIST_COLUMNS` (as listas de títulos por
+    classificação e por país) saem da planilha da seção e vão para uma planilha em formato longo,
+    "<seção> - <Coluna>", com uma linha por título e a primeira coluna da seção como chave.
+
+    Args:
+        sections (Dict[str, pd.DataFrame]): As seções do relatório (título -> DataFrame).
+        excel_path (str): O caminho do arquivo xlsx gerado.
+    """
+    workbook = Workbook(write_only=True)
+    long_sheets = 0
+
+    for title, df in sections.items():
+        list_columns = [column for column in df.columns if column in EXCEL_LIST_COLUMNS]
+        columns = [column for column in df.columns if column not in list_columns]
+        rows = df[columns].itertuples(index=False, name=None) if columns else ()
+        _write_sheet(workbook, title, columns, rows)
+
+        # Sem uma coluna para servir de chave, o formato longo não se aplica
+        for list_column in list_columns if columns else ():
+            _write_sheet(
+                workbook,
+                f"{title} - {list_column.capitalize()}",
+                [columns[0], 'title'],
+                _long_rows(df, columns[0], list_column),
+            )
+            long_sheets += 1
+
+    workbook.save(excel_path)
+    logging.debug("Relatório Excel gravado com %d planilhas em formato longo: %s", long_sheets, excel_path)
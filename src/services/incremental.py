@@ -0,0 +1,306 @@
+import hashlib
+import logging
+import os
+import pickle
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.models.model import CsvDto, iter_csv_dto
+from src.utils.dates import year_added
+from src.utils.durations import MINUTES, SEASONS, duration_value
+from src.utils.people import directors_in_cast, person_keys
+from src.utils.topk import TopK, top_counts
+
+# Arquivo padrão com o estado da análise incremental
+STATE_PATH = './data/state/incremental_state.pkl'
+
+# Versão do formato do estado: alterar força uma reconstrução completa
+STATE_VERSION = 6
+
+class TitleFields(NamedTuple):
+    """Campos de um título usados pelas métricas (o suficiente para desfazer a sua contribuição)."""
+    title: str
+    type: str
+    director: str
+    cast: Tuple[str, ...]
+    country: str
+    date_added: str
+    rating: str
+    duration: str
+
+def _fields(dto: CsvDto) -> TitleFields:
+    return TitleFields(dto.title, dto.type, dto.director, dto.cast, dto.country, dto.date_added, dto.rating, dto.duration)
+
+def _digest(dto: CsvDto) -> bytes:
+    """Hash de todos os campos da linha, usado para detectar títulos alterados."""
+    values = [", ".join(value) if isinstance(value, tuple) else str(value) for value in dto.values()]
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).digest()
+
+def _percentage(count: int, total: int) -> float:
+    return round((count / total * 100), 2)
+
+class IncrementalAggregates:
+    """
+    Métricas do catálogo que aceitam inclusão e remoção de títulos.
+
+    Cada título é identificado pelo `show_id`; remover um título desfaz exatamente a contribuição
+    que ele teve ao ser incluído. Os resultados têm o mesmo formato e a mesma ordem das funções de
+    `src/utils`: os títulos e os grupos seguem a posição no snapshot atual (`positions`), e não a
+    ordem em que foram incluídos no estado.
+    """
+
+    def __init__(self):
+        self.columns: List[str] = []
+        self.total_items = 0
+        # show_id -> linha do título no snapshot atual (atualizada por `apply_snapshot`)
+        self.positions: Dict[str, int] = {}
+        self.type_counts = Counter()
+        self.year_titles: Dict[int, Dict[str, None]] = {}
+        self.rating_titles: Dict[str, Dict[str, str]] = {}
+        # Diretor (nome normalizado) -> {show_id: (grafia no campo de diretores, ordem no campo)}
+        self.director_titles: Dict[str, Dict[str, Tuple[str, int]]] = {}
+        self.country_counts = Counter()
+        # País -> {show_id: [título, vezes no campo de países, ordem no campo]}
+        self.country_titles: Dict[str, Dict[str, List]] = {}
+        # Diretor (nome normalizado) -> {show_id: (grafia no campo de diretores, título, ordem no campo)}
+        self.directors_actors: Dict[str, Dict[str, Tuple[str, str, int]]] = {}
+        self.movie_durations: Dict[str, Tuple[int, str]] = {}
+        self.series_seasons: Dict[str, Tuple[int, str]] = {}
+
+    def add(self, show_id: str, row: TitleFields) -> None:
+        self._apply(show_id, row, 1)
+
+    def remove(self, show_id: str, row: TitleFields) -> None:
+        self._apply(show_id, row, -1)
+
+    def _apply(self, show_id: str, row: TitleFields, sign: int) -> None:
+        self.total_items += sign
+        self.type_counts[row.type] += sign
+
+        year = year_added(row.date_added)
+        if year is not None:
+            _update_titles(self.year_titles, year, show_id, None, sign)
+
+        if row.rating:
+            _update_titles(self.rating_titles, row.rating, show_id, row.title, sign)
+
+        if row.director:
+            directors = row.director.split(", ")
+            for order, (key, director) in enumerate(person_keys(tuple(directors))):
+                _update_titles(self.director_titles, key, show_id, (director, order), sign)
+            for order, (key, director) in enumerate(directors_in_cast(directors, row.cast)):
+                _update_titles(self.directors_actors, key, show_id, (director, row.title, order), sign)
+
+        if row.country.strip():
+            for order, country in enumerate(country.strip() for country in row.country.split(',')):
+                self.country_counts[country] += sign
+                titles = self.country_titles.setdefault(country, {})
+                entry = titles.setdefault(show_id, [row.title, 0, order])
+                entry[1] += sign
+                if entry[1] <= 0:
+                    del titles[show_id]
+                if not titles:
+                    del self.country_titles[country]
+
+        minutes = duration_value(row.duration, MINUTES) if row.type == "Movie" else None
+        if minutes is not None:
+            _update_titles(self.movie_durations, None, show_id, (minutes, row.title), sign)
+
+        seasons = duration_value(row.duration, SEASONS) if row.type == "TV Show" else None
+        if seasons is not None:
+            _update_titles(self.series_seasons, None, show_id, (seasons, row.title), sign)
+
+    def results(self, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Monta o resultado de todas as métricas, com as mesmas chaves de `src.utils.aggregator.aggregate`.
+        """
+        _drop_empty(self.type_counts, self.country_counts)
+        position = self.positions.__getitem__
+
+        def in_file_order(groups: Dict[Any, Dict[str, Any]], order: int = -1) -> List[Tuple[Any, List[Any]]]:
+            # Como na passada única: grupos pela primeira linha em que aparecem (e, na mesma linha, pela
+            # ordem no campo, guardada na posição `order` do valor), títulos na ordem das linhas
+            ordered = []
+            for key, titles in groups.items():
+                show_ids = sorted(titles, key=position)
+                first = titles[show_ids[0]]
+                ordered.append(((position(show_ids[0]), first[order] if order >= 0 else 0), key, show_ids))
+            ordered.sort(key=lambda item: item[0])
+            return [(key, [groups[key][show_id] for show_id in show_ids]) for _, key, show_ids in ordered]
+
+        def type_share(title_type: str) -> Dict[str, Any]:
+            count = self.type_counts[title_type]
+            percentage = (count / self.total_items * 100) if self.total_items > 0 else 0
+            return {"count": count, "percentage": round(percentage, 2)}
+
+        total_years = sum(len(titles) for titles in self.year_titles.values())
+        total_countries = sum(self.country_counts.values())
+
+        titles_by_country = [
+            {
+                "country": country,
+                "total": self.country_counts[country],
+                "percentage": _percentage(self.country_counts[country], total_countries),
+                "titles": dict(enumerate(
+                    title
+                    for title, multiplicity, _ in titles
+                    for _ in range(multiplicity)
+                )),
+            }
+            for country, titles in in_file_order(self.country_titles, order=2)
+        ]
+        # Ordenação estável: países com o mesmo total ficam na ordem em que aparecem no snapshot
+        titles_by_country.sort(key=lambda x: x['total'], reverse=True)
+
+        # Empates de contagem ou de duração: prevalece quem aparece primeiro no snapshot
+        directors = dict(in_file_order(self.director_titles, order=1))
+        top_directors = top_counts({key: len(titles) for key, titles in directors.items()}, top_n)
+        longest_movies = TopK(top_n)
+        longest_movies.extend(self.movie_durations[show_id] for show_id in sorted(self.movie_durations, key=position))
+        longest_series = TopK(top_n)
+        longest_series.extend(self.series_seasons[show_id] for show_id in sorted(self.series_seasons, key=position))
+
+        return {
+            "columns": list(self.columns) if self.total_items else [],
+            "total_movies": type_share("Movie"),
+            "directors": [
+                {"director": directors[key][0][0], "count": count} for key, count in top_directors
+            ],
+            "directors_actors": [
+                {
+                    "director": titles[0][0],
+                    "count": len(titles),
+                    "titles": [title for _, title, _ in titles],
+                }
+                for _, titles in in_file_order(self.directors_actors, order=2)
+            ],
+            "total_series": type_share("TV Show"),
+            "total_by_years": [
+                {"year": year, "count": len(titles), "percentage": _percentage(len(titles), total_years)}
+                for year, titles in in_file_order(self.year_titles)
+            ],
+            "titles_by_rating": [
+                {"rating": rating, "total": len(titles), "titles": dict(enumerate(titles))}
+                for rating, titles in in_file_order(self.rating_titles)
+            ],
+            "longest_movies": [{'title': title, 'duration': minutes} for minutes, title in longest_movies.items()],
+            "longest_series": [{'title': title, 'seasons': seasons} for seasons, title in longest_series.items()],
+            "titles_by_country": titles_by_country,
+        }
+
+def _update_titles(groups: Dict, key: Optional[str], show_id: str, value: Any, sign: int) -> None:
+    # Inclui ou remove `show_id` de um grupo (ou diretamente do dicionário, se `key` for None)
+    titles = groups if key is None else groups.setdefault(key, {})
+    if sign > 0:
+        titles[show_id] = value
+    else:
+        titles.pop(show_id, None)
+        if key is not None and not titles:
+            del groups[key]
+
+def _drop_empty(*counters: Counter) -> None:
+    for counter in counters:
+        for key in [key for key, count in counter.items() if count <= 0]:
+            del counter[key]
+
+class SnapshotState:
+    """Estado persistido entre execuções: o hash e os campos de cada título e as métricas agregadas."""
+
+    def __init__(self):
+        self.version = STATE_VERSION
+        self.rows: Dict[str, Tuple[bytes, TitleFields]] = {}
+        self.aggregates = IncrementalAggregates()
+
+def load_state(state_path: str = STATE_PATH) -> SnapshotState:
+    """
+    Carrega o estado da última execução (ou um estado vazio, se não houver um estado válido).
+    """
+    try:
+        with open(state_path, 'rb') as file:
+            state = pickle.load(file)
+        if getattr(state, 'version', None) == STATE_VERSION:
+            return state
+        logging.warning("Versão do estado incremental incompatível, reconstruindo do zero.")
+    except FileNotFoundError:
+        logging.info("Nenhum estado incremental encontrado, processando o snapshot completo.")
+    except Exception as e:
+        logging.error("Estado incremental inválido, reconstruindo do zero: %s", e)
+    return SnapshotState()
+
+def save_state(state: SnapshotState, state_path: str = STATE_PATH) -> None:
+    """Grava o estado de forma atômica."""
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    with open(f"{state_path}.tmp", 'wb') as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{state_path}.tmp", state_path)
+
+def apply_snapshot(state: SnapshotState, file_path: str) -> Dict[str, Any]:
+    """
+    Compara um novo snapshot do catálogo com o estado e aplica às métricas apenas os títulos
+    incluídos, removidos e alterados.
+
+    Args:
+        state (SnapshotState): O estado da última execução (atualizado no lugar).
+        file_path (str): O caminho do novo snapshot (CSV).
+
+    Returns:
+        Dict[str, Any]: O resumo das mudanças: listas `added`, `removed` e `changed` com
+        `show_id` e `title` de cada título.
+
+    Raises:
+        Exception: Se o snapshot não puder ser lido por completo. Uma leitura parcial faria os
+            títulos não lidos parecerem removidos, então o estado fica inconsistente e não deve
+            ser gravado.
+    """
+    aggregates = state.aggregates
+    previous_ids = set(state.rows)
+    changes = {"added": [], "removed": [], "changed": []}
+
+    for position, dto in enumerate(iter_csv_dto(file_path, strict=True)):
+        if not aggregates.columns:
+            aggregates.columns = list(dto.columns)
+
+        show_id = dto.show_id
+        aggregates.positions[show_id] = position
+        digest = _digest(dto)
+        previous = state.rows.get(show_id)
+        if show_id in previous_ids:
+            previous_ids.discard(show_id)
+            if previous[0] == digest:
+                continue
+            aggregates.remove(show_id, previous[1])
+            changes["changed"].append({"show_id": show_id, "title": dto.title})
+        elif previous is not None:
+            # show_id repetido no mesmo snapshot: a última linha prevalece
+            aggregates.remove(show_id, previous[1])
+        else:
+            changes["added"].append({"show_id": show_id, "title": dto.title})
+
+        fields = _fields(dto)
+        state.rows[show_id] = (digest, fields)
+        aggregates.add(show_id, fields)
+
+    for show_id in previous_ids:
+        _, fields = state.rows.pop(show_id)
+        aggregates.remove(show_id, fields)
+        del aggregates.positions[show_id]
+        changes["removed"].append({"show_id": show_id, "title": fields.title})
+
+    logging.info(
+        "Snapshot aplicado: %d incluídos, %d removidos, %d alterados",
+        len(changes['added']), len(changes['removed']), len(changes['changed']),
+    )
+    return changes
+
+def run_incremental(file_path: str, state_path: str = STATE_PATH) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Executa a análise incremental de um snapshot e persiste o novo estado.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: As métricas atualizadas e o resumo das mudanças.
+    """
+    state = load_state(state_path)
+    # Se a leitura falhar, a exceção interrompe a execução antes de gravar: o estado anterior é mantido
+    changes = apply_snapshot(state, file_path)
+    save_state(state, state_path)
+    return state.aggregates.results(), changes
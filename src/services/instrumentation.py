@@ -0,0 +1,187 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Arquivo padrão com um registro (linha JSON) por execução
+METRICS_FILE = './logs/metrics.jsonl'
+
+# Diretório padrão dos perfis gerados com PROFILE_STAGE
+PROFILE_DIR = './logs/profiles/'
+
+# Prefixo das métricas no formato texto do Prometheus
+PROMETHEUS_PREFIX = 'netflix_analysis'
+
+class Instrumentation:
+    """
+    Mede as etapas de uma execução: tempo de relógio, tempo de CPU, pico de memória
+    (tracemalloc, opcional) e vazão em linhas por segundo (e em bytes por segundo, nas etapas
+    que informam `bytes`, como o download).
+
+    Exemplo:
+        instrumentation = Instrumentation()
+        with instrumentation.stage("parse") as stage:
+            dataset = read_csv_to_columnar(path)
+            stage["rows"] = len(dataset)
+        instrumentation.write_jsonl(METRICS_FILE)
+    """
+
+    def __init__(self, memory: bool = False, profile_stage: Optional[str] = None, profile_dir: str = PROFILE_DIR):
+        """
+        Args:
+            memory (bool): Mede o pico de memória de cada etapa com o tracemalloc (deixa a execução mais lenta).
+            profile_stage (Optional[str]): Nome da etapa a perfilar (cProfile, ou pyinstrument se instalado).
+            profile_dir (str): Diretório onde o perfil é gravado.
+        """
+        self.memory = memory
+        self.profile_stage = profile_stage
+        self.profile_dir = profile_dir
+        self.started_at = datetime.now()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._peaks: List[int] = []  # Pico de memória de cada etapa em andamento (etapas aninhadas)
+        self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Mede o bloco como uma etapa. O dicionário retornado aceita `rows` (linhas processadas) e
+        `bytes` (bytes transferidos), para quando a quantidade só é conhecida no fim da etapa.
+        """
+        record: Dict[str, Any] = {"rows": rows, "bytes": None}
+        profiler = self._start_profiler(name)
+
+        tracing = self.memory
+        if tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            start_memory = current
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            if tracing:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                elif self._owns_tracing:
+                    tracemalloc.stop()
+                    self._owns_tracing = False
+                record["peak_bytes"] = peak - start_memory
+            self._stop_profiler(name, profiler)
+            self.record(name, wall, cpu, **record)
+
+    def record(self, name: str, seconds: Optional[float], cpu_seconds: Optional[float] = None, **extra: Any) -> None:
+        """
+        Registra uma etapa medida em outro lugar (por exemplo, em um processo filho).
+        """
+        rows = extra.get("rows")
+        transferred = extra.get("bytes")
+        self.stages[name] = {
+            "seconds": round(seconds, 4) if seconds is not None else None,
+            "cpu_seconds": round(cpu_seconds, 4) if cpu_seconds is not None else None,
+            "peak_bytes": extra.get("peak_bytes"),
+            "rows": rows,
+            "rows_per_second": round(rows / seconds) if rows and seconds else None,
+            "bytes": transferred,
+            "bytes_per_second": round(transferred / seconds) if transferred and seconds else None,
+            "error": extra.get("error"),
+        }
+        logging.info("Etapa %s: %.3f s", name, seconds or 0)
+
+    def _start_profiler(self, name: str) -> Any:
+        if name != self.profile_stage:
+            return None
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler()
+        except ImportError:
+            profiler = cProfile.Profile()
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+        return profiler
+
+    def _stop_profiler(self, name: str, profiler: Any) -> None:
+        if profiler is None:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base_path = os.path.join(self.profile_dir, f"{name}_{self.started_at:%Y-%m-%d_%H-%M-%S}")
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.dump_stats(f"{base_path}.prof")
+            # Resumo legível com as funções de maior tempo acumulado
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+            with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+                file.write(summary.getvalue())
+            logging.info("Perfil da etapa %s gravado em %s.prof", name, base_path)
+        else:
+            profiler.stop()
+            with open(f"{base_path}.html", "w", encoding="utf-8") as file:
+                file.write(profiler.output_html())
+            logging.info("Perfil da etapa %s gravado em %s.html", name, base_path)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Retorna o registro da execução: início, duração total e as etapas medidas."""
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "seconds": round((datetime.now() - self.started_at).total_seconds(), 3),
+            "stages": self.stages,
+        }
+
+    def write_jsonl(self, path: str = METRICS_FILE) -> None:
+        """Acrescenta o registro da execução como uma linha JSON."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.to_record(), ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Grava as métricas da execução no formato texto do Prometheus (para o textfile collector
+        do node exporter). A gravação é atômica, para o coletor nunca ler um arquivo incompleto.
+        """
+        gauges = {
+            "stage_seconds": ("Tempo de relógio da etapa, em segundos.", "seconds"),
+            "stage_cpu_seconds": ("Tempo de CPU da etapa, em segundos.", "cpu_seconds"),
+            "stage_peak_bytes": ("Pico de memória alocada na etapa (tracemalloc), em bytes.", "peak_bytes"),
+            "stage_rows_per_second": ("Vazão da etapa, em linhas por segundo.", "rows_per_second"),
+            "stage_bytes_per_second": ("Vazão da etapa, em bytes por segundo.", "bytes_per_second"),
+        }
+        lines = []
+        for metric, (help_text, key) in gauges.items():
+            samples = [
+                f'{PROMETHEUS_PREFIX}_{metric}{{stage="{name}"}} {values[key]}'
+                for name, values in self.stages.items()
+                if values.get(key) is not None
+            ]
+            if samples:
+                lines += [f"# HELP {PROMETHEUS_PREFIX}_{metric} {help_text}", f"# TYPE {PROMETHEUS_PREFIX}_{metric} gauge", *samples]
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_last_run_timestamp_seconds Início da última execução (Unix).",
+            f"# TYPE {PROMETHEUS_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_last_run_timestamp_seconds {self.started_at.timestamp():.0f}",
+        ]
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,74 @@
+import atexit
+import logging
+import multiprocessing
+import os
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Union
+
+# Arquivo de log padrão da aplicação
+LOG_FILE = './logs/app.log'
+
+# Formato das mensagens: data, nível, processo e módulo de origem, mensagem
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(processName)s - %(module)s - %(message)s'
+
+# Tamanho máximo do arquivo de log antes da rotação e quantidade de arquivos antigos mantidos
+DEFAULT_MAX_BYTES = 10 * 1024 ** 2
+DEFAULT_BACKUP_COUNT = 5
+
+_listener: Optional[QueueListener] = None
+
+def configure_logging(
+    log_file: str = LOG_FILE,
+    level: Union[int, str, None] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+) -> QueueListener:
+    """
+    Configura o logging da aplicação.
+
+    As mensagens vão para uma fila (`QueueHandler`) e são gravadas no arquivo por uma thread
+    separada (`QueueListener`), então o custo de E/S fica fora do caminho crítico. O arquivo é
+    rotacionado ao atingir `max_bytes`. A fila é compartilhada com os processos filhos criados
+    por fork (agregação paralela, relatórios e gráficos), que gravam no mesmo arquivo.
+
+    Args:
+        log_file (str): O caminho do arquivo de log.
+        level (Union[int, str, None]): O nível mínimo (padrão: variável LOG_LEVEL ou INFO).
+        max_bytes (int): O tamanho máximo do arquivo antes da rotação.
+        backup_count (int): A quantidade de arquivos rotacionados mantidos.
+
+    Returns:
+        QueueListener: O listener em execução (encerrado automaticamente na saída do programa).
+    """
+    global _listener
+    _stop_listener()
+
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    if isinstance(level, str):
+        name, level = level, logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Nível de log inválido: {name}")
+
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    queue = multiprocessing.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    return _listener
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,96 @@
+import logging
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from fpdf.fonts import FontFace
+
+# Fonte TTF com suporte a Unicode usada nos relatórios
+PDF_FONT_PATH = './arial-font/arial.ttf'
+PDF_FONT_FAMILY = 'ArialUnicode'
+
+# Cabeçalho das tabelas destacado pela cor de fundo (a fonte só tem o estilo regular)
+_HEADINGS_STYLE = FontFace(emphasis="", fill_color=(220, 220, 220))
+
+# Máximo de linhas por seção; o restante fica só no relatório CSV
+PDF_MAX_ROWS = 500
+
+# Máximo de caracteres por célula (as colunas de títulos trazem dicionários inteiros)
+PDF_MAX_CELL_CHARS = 300
+
+def clean_text(text: str) -> str:
+    # Limpa e substitui caracteres problemáticos
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+def _add_unicode_font(pdf: FPDF, font_path: str) -> bool:
+    """
+    Registra a fonte Unicode no documento pela API pública do fpdf2. Retorna False se a fonte não
+    estiver disponível.
+    """
+    if not os.path.exists(font_path):
+        logging.warning("Fonte %s não encontrada, usando a fonte padrão (Latin-1).", font_path)
+        return False
+    pdf.add_font(PDF_FONT_FAMILY, "", font_path)
+    return True
+
+def _cell_text(value, unicode: bool) -> str:
+    text = str(value)
+    if len(text) > PDF_MAX_CELL_CHARS:
+        text = text[:PDF_MAX_CELL_CHARS - 3] + '...'
+    return text if unicode else clean_text(text)
+
+def _render_section(pdf: FPDF, title: str, df: pd.DataFrame, unicode: bool, max_rows: Optional[int]) -> None:
+    pdf.set_font_size(12)
+    pdf.cell(0, 10, _cell_text(title, unicode), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')  # Adiciona o título centralizado
+    pdf.ln(5)  # Espaçamento entre título e conteúdo
+
+    if len(df.columns) == 0:
+        pdf.set_font_size(9)
+        pdf.cell(0, 6, "(sem dados)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.ln(10)
+        return
+
+    shown = df if max_rows is None else df.head(max_rows)
+
+    # Linhas já convertidas em texto antes da renderização da tabela
+    rows = [
+        [_cell_text(value, unicode) for value in row]
+        for row in shown.itertuples(index=False, name=None)
+    ]
+
+    pdf.set_font_size(8)
+    with pdf.table(first_row_as_headings=True, headings_style=_HEADINGS_STYLE, text_align="LEFT", line_height=5) as table:
+        table.row([_cell_text(column, unicode) for column in df.columns])
+        for row in rows:
+            table.row(row)
+
+    omitted = len(df) - len(shown)
+    if omitted > 0:
+        pdf.set_font_size(9)
+        pdf.multi_cell(0, 6, f"... {omitted} linhas omitidas. Consulte o relatório CSV para a lista completa.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.ln(10)  # Espaçamento entre seções
+
+def create_pdf_report(data_dict: Dict[str, pd.DataFrame], pdf_path: str, max_rows: Optional[int] = PDF_MAX_ROWS) -> None:
+    """
+    Gera o relatório em PDF com uma tabela por seção.
+
+    Args:
+        data_dict (Dict[str, pd.DataFrame]): As seções do relatório (título -> DataFrame).
+        pdf_path (str): O caminho do PDF gerado.
+        max_rows (Optional[int]): Máximo de linhas por seção (None para não limitar).
+    """
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    # Fonte Unicode; sem ela, usa a fonte padrão e substitui os caracteres fora do Latin-1
+    unicode = _add_unicode_font(pdf, PDF_FONT_PATH)
+    pdf.set_font(PDF_FONT_FAMILY if unicode else "helvetica", "", 12)
+
+    for title, df in data_dict.items():
+        _render_section(pdf, title, df, unicode, max_rows)
+
+    pdf.output(pdf_path)
@@ -0,0 +1,275 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from src.services.dashboard import render_dashboard
+from src.services.download_data import DOWNLOAD_CHUNK_SIZE, download_file
+from src.services.instrumentation import Instrumentation
+from src.services.report_generator import generate_reports
+from src.utils.aggregator import Accumulator, create_accumulators, finalize, merge_accumulators
+from src.utils.count import titles_in_results
+from src.utils.parallel import aggregate_block
+
+# Blocos baixados que podem aguardar a leitura (backpressure entre o download e a leitura)
+DEFAULT_QUEUE_SIZE = 8
+
+# Blocos em leitura e agregação ao mesmo tempo (backpressure entre a leitura e a análise)
+DEFAULT_MAX_PENDING = 4
+
+# Marcador de fim dos dados na fila de blocos
+_END = None
+
+def _first_record_end(data: bytes) -> int:
+    """Retorna a posição logo após o primeiro registro (uma quebra de linha fora de aspas)."""
+    quotes = 0
+    cursor = 0
+    while True:
+        newline = data.find(b'\n', cursor)
+        if newline < 0:
+            return len(data)
+        quotes += data.count(b'"', cursor, newline)
+        cursor = newline + 1
+        if quotes % 2 == 0:
+            return cursor
+
+class RecordSplitter:
+    """
+    Divide os bytes do CSV, recebidos em blocos de tamanho qualquer, em blocos de registros
+    completos: campos entre aspas com quebras de linha nunca são cortados (mesma regra de
+    paridade de aspas de `src.utils.parallel.split_csv_shards`).
+
+    O primeiro registro é o cabeçalho, disponível em `header` e removido dos blocos.
+    """
+
+    def __init__(self):
+        self.header: Optional[List[str]] = None
+        self._buffer = bytearray()
+        self._scanned = 0  # Bytes do buffer já verificados, sem nenhum fim de registro
+        self._quotes = 0  # Paridade das aspas nos bytes verificados
+
+    def feed(self, data: bytes) -> bytes:
+        """Acrescenta os bytes recebidos e retorna os registros completos (b"" se ainda não houver)."""
+        buffer = self._buffer
+        buffer += data
+        start = self._scanned
+        quotes = self._quotes + buffer.count(b'"', start)
+
+        # Procura, do fim para o começo, a última quebra de linha com quantidade par de aspas antes dela
+        cut = 0
+        quotes_after = 0
+        end = len(buffer)
+        newline = buffer.rfind(b'\n', start)
+        while newline >= 0:
+            quotes_after += buffer.count(b'"', newline + 1, end)
+            end = newline + 1
+            if (quotes - quotes_after) % 2 == 0:
+                cut = newline + 1
+                break
+            newline = buffer.rfind(b'\n', start, newline)
+
+        # A parte antes do corte tem quantidade par de aspas: a paridade do restante não muda
+        self._quotes = quotes % 2
+        block = bytes(buffer[:cut])
+        del buffer[:cut]
+        self._scanned = len(buffer)
+        return self._records(block)
+
+    def close(self) -> bytes:
+        """Retorna o que restou no buffer (o último registro, se o arquivo não terminar em quebra de linha)."""
+        block = bytes(self._buffer)
+        self._buffer.clear()
+        self._scanned = 0
+        return self._records(block)
+
+    def _records(self, block: bytes) -> bytes:
+        if self.header is None and block:
+            end = _first_record_end(block)
+            self.header = next(csv.reader(io.StringIO(block[:end].decode('utf-8'))), [])
+            block = block[end:]
+        return block
+
+async def _aggregate_queue(
+    queue: "asyncio.Queue[Optional[bytes]]",
+    executor: Executor,
+    max_pending: int,
+    names: Optional[List[str]] = None,
+) -> Dict[str, Accumulator]:
+    """
+    Consome os blocos da fila à medida que chegam: cada bloco de registros completos é lido e
+    agregado no executor e os acumuladores parciais são combinados na ordem do arquivo.
+
+    No máximo `max_pending` blocos ficam em processamento; acima disso, a leitura da fila espera
+    (e a fila cheia, por sua vez, segura o download).
+    """
+    loop = asyncio.get_running_loop()
+    splitter = RecordSplitter()
+    total = create_accumulators(names)
+    pending: Deque["asyncio.Future[Dict[str, Accumulator]]"] = deque()
+
+    while True:
+        chunk = await queue.get()
+        block = splitter.close() if chunk is _END else splitter.feed(chunk)
+        if block:
+            if len(pending) >= max_pending:
+                merge_accumulators(total, await pending.popleft())
+            pending.append(loop.run_in_executor(executor, aggregate_block, splitter.header, block, names))
+        if chunk is _END:
+            break
+
+    while pending:
+        merge_accumulators(total, await pending.popleft())
+    return total
+
+async def _drain(queue: "asyncio.Queue[Optional[bytes]]") -> None:
+    while True:
+        await queue.get()
+
+async def _read_file(file_path: str, queue: "asyncio.Queue[Optional[bytes]]") -> None:
+    """Coloca o conteúdo de um arquivo já baixado na fila de blocos."""
+    with open(file_path, 'rb') as file:
+        while True:
+            chunk = await asyncio.to_thread(file.read, DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await queue.put(chunk)
+    await queue.put(_END)
+
+async def _aggregate_file(file_path: str, executor: Executor, queue_size: int, max_pending: int) -> Dict[str, Accumulator]:
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+    reader = asyncio.create_task(_read_file(file_path, queue))
+    total = await _aggregate_queue(queue, executor, max_pending)
+    await reader
+    return total
+
+async def _download_and_aggregate(
+    url: str,
+    output_path: str,
+    executor: Executor,
+    queue_size: int,
+    max_pending: int,
+    instrumentation: Instrumentation,
+) -> Optional[Dict[str, Any]]:
+    """
+    Baixa o dataset e agrega os registros durante o download.
+
+    Se os bytes recebidos não formarem o arquivo completo (arquivo não modificado desde o último
+    download, retomada de um download parcial ou transferência reiniciada), o arquivo final é
+    lido novamente do disco.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+    stream = {'offset': 0, 'complete': True, 'bytes': 0}
+    start = time.perf_counter()
+
+    def on_chunk(chunk: bytes, position: int) -> None:
+        # Executado na thread do download: espera enquanto a fila estiver cheia
+        stream['bytes'] += len(chunk)
+        if not stream['complete']:
+            return
+        if position != stream['offset']:
+            stream['complete'] = False
+            return
+        stream['offset'] += len(chunk)
+        asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+
+    async def download() -> Optional[str]:
+        try:
+            return await asyncio.to_thread(download_file, url, output_path, on_chunk=on_chunk)
+        finally:
+            instrumentation.record('download', time.perf_counter() - start, bytes=stream['bytes'])
+            await queue.put(_END)
+
+    downloader = asyncio.create_task(download())
+    try:
+        total = await _aggregate_queue(queue, executor, max_pending)
+    except BaseException:
+        # Libera a thread do download, que pode estar esperando espaço na fila
+        stream['complete'] = False
+        drain = asyncio.create_task(_drain(queue))
+        await asyncio.gather(downloader, return_exceptions=True)
+        drain.cancel()
+        raise
+
+    file_path = await downloader
+    if file_path is None:
+        return None
+
+    if not stream['complete'] or stream['offset'] != os.path.getsize(file_path):
+        logging.info("Dados recebidos não formam o arquivo completo, agregando a partir de: %s", file_path)
+        total = await _aggregate_file(file_path, executor, queue_size, max_pending)
+
+    results = finalize(total)
+    instrumentation.record('analysis', time.perf_counter() - start, rows=titles_in_results(results))
+    return results
+
+async def run_pipeline(
+    url: str,
+    output_path: str,
+    date: str,
+    chart_dir: str,
+    workers: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    report_formats: Optional[Iterable[str]] = None,
+    report_executor: str = 'process',
+    chart_formats: Iterable[str] = ('png',),
+    instrumentation: Optional[Instrumentation] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Executa o pipeline completo com as etapas sobrepostas:
+
+    1. o download grava o arquivo em disco e entrega cada bloco recebido a uma fila limitada;
+    2. os blocos são divididos em registros completos, lidos e agregados em um executor enquanto
+       o download continua (processos se `workers` > 1, senão uma thread);
+    3. quando as análises terminam, os relatórios e os gráficos são gerados ao mesmo tempo.
+
+    O resultado das análises é igual ao da leitura serial (`aggregate_chunks`).
+
+    Args:
+        url (str): A URL do dataset.
+        output_path (str): O caminho onde o arquivo baixado será gravado.
+        date (str): O timestamp usado no nome dos relatórios.
+        chart_dir (str): O diretório dos gráficos.
+        workers (int): A quantidade de processos da leitura e agregação.
+        queue_size (int): Blocos baixados que podem aguardar a leitura.
+        max_pending (int): Blocos em leitura e agregação ao mesmo tempo.
+        report_formats (Optional[Iterable[str]]): Formatos dos relatórios (padrão: todos).
+        report_executor (str): 'process' ou 'thread', como em `generate_reports`.
+        chart_formats (Iterable[str]): Formatos das imagens do dashboard.
+        instrumentation (Optional[Instrumentation]): Onde registrar o tempo de cada etapa.
+
+    Returns:
+        Optional[Dict[str, Any]]: O resultado das análises, ou None se o download falhou.
+    """
+    if queue_size < 1 or max_pending < 1:
+        raise ValueError(f"queue_size e max_pending devem ser positivos, recebidos: {queue_size}, {max_pending}")
+
+    instrumentation = instrumentation or Instrumentation()
+    start = time.perf_counter()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else ThreadPoolExecutor(max_workers=1)
+    with executor:
+        results = await _download_and_aggregate(url, output_path, executor, queue_size, max_pending, instrumentation)
+    if results is None:
+        return None
+
+    reports, chart_times = await asyncio.gather(
+        asyncio.to_thread(
+            partial(generate_reports, **results, date=date, formats=report_formats, executor=report_executor)
+        ),
+        asyncio.to_thread(render_dashboard, results, chart_dir, formats=chart_formats),
+    )
+    for report_format, report in reports.items():
+        instrumentation.record(f'report.{report_format}', report['seconds'], report['cpu_seconds'], error=report['error'])
+    for chart, seconds in chart_times.items():
+        instrumentation.record(f'chart.{chart}', seconds)
+
+    logging.info("Pipeline concluído em %.3f s", time.perf_counter() - start)
+    return results
@@ -1,40 +1,125 @@
+import importlib
 import logging
-import pandas as pd
-from typing import List
+import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
 import os
-from fpdf import FPDF 
-from fpdf.enums import XPos, YPos
 
 from src.models.model import CsvDto
 
-def clean_text(text: str) -> str:
-    # Limpa e substitui caracteres problemáticos
-    return text.encode('latin-1', 'replace').decode('latin-1')
+# pandas, openpyxl e fpdf só são importados quando um relatório é gerado (ver `import_report_dependencies`)
+if TYPE_CHECKING:
+    import pandas as pd
 
-def create_pdf_report(data_dict: dict, pdf_path: str) -> None:
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
+def changes_to_dataframe(changes: dict) -> "pd.DataFrame":
+    """
+    Converte o resumo de mudanças da análise incremental em uma tabela (Change, Show ID, Title).
+    """
+    import pandas as pd
 
-    # Definir a fonte personalizada para suporte a Unicode
-    pdf.add_font("ArialUnicode", "", "./arial-font/Arial-Unicode-Regular.ttf", uni=True)  # Certifique-se de que o caminho da fonte esteja correto
-    pdf.set_font("ArialUnicode", "", 12)
+    rows = [
+        {'Change': change, 'Show ID': item['show_id'], 'Title': item['title']}
+        for change in ('added', 'removed', 'changed')
+        for item in changes.get(change, [])
+    ]
+    return pd.DataFrame(rows, columns=['Change', 'Show ID', 'Title'])
 
-    # Iterar pelos DataFrames e adicionar ao PDF
-    for title, df in data_dict.items():
-        pdf.cell(0, 10, title, ln=True, align='C')  # Adiciona o título centralizado
-        pdf.ln(5)  # Espaçamento entre título e conteúdo
+def approximate_to_dataframes(approximate: dict) -> Dict[str, "pd.DataFrame"]:
+    """
+    Seções do modo aproximado: os parâmetros dos sketches com as contagens de distintos e o
+    elenco mais frequente (com o erro máximo de cada contagem).
+    """
+    import pandas as pd
 
-        # Adiciona os dados do DataFrame
-        for index, row in df.iterrows():
-            row_str = ' | '.join(str(item) for item in row)
-            pdf.cell(0, 10, clean_text(row_str), ln=True)  # Usa clean_text para caracteres não suportados
+    rows = [('Mode', approximate['mode'])]
+    rows += [(f'Sketch {name}', value) for name, value in approximate['parameters'].items()]
+    for name, label in (('unique_directors', 'Unique Directors'), ('unique_actors', 'Unique Actors')):
+        distinct = approximate[name]
+        rows.append((f'{label} (approx.)', f"{distinct['estimate']} (±{distinct['relative_error'] * 100:.2f}%)"))
 
-        pdf.ln(10)  # Espaçamento entre seções
+    return {
+        'Aggregation Mode': pd.DataFrame(rows, columns=['Parameter', 'Value']),
+        'Top Cast (approx.)': pd.DataFrame(approximate['top_cast'], columns=['actor', 'count', 'error']),
+    }
 
-    pdf.output(pdf_path)
+# Formatos de relatório disponíveis: formato -> (diretório, extensão)
+REPORT_FORMATS = {
+    'excel': ('./data/processed/excel/', 'xlsx'),
+    'csv': ('./data/processed/csv/', 'csv'),
+    'pdf': ('./data/processed/pdf/', 'pdf'),
+    'txt': ('./data/processed/txt/', 'txt'),
+}
 
-def generate_reports(
+def write_excel_report(sections: Dict[str, "pd.DataFrame"], excel_path: str) -> None:
+    from src.services.excel_renderer import create_excel_report
+
+    create_excel_report(sections, excel_path)
+
+def write_csv_report(sections: Dict[str, "pd.DataFrame"], csv_path: str) -> None:
+    import pandas as pd
+
+    df_combined = pd.concat(list(sections.values()), axis=1)
+    df_combined.to_csv(csv_path, index=False)
+
+def write_txt_report(sections: Dict[str, "pd.DataFrame"], txt_path: str) -> None:
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        for title, df in sections.items():
+            f.write(f"{title}\n")
+            f.write(df.to_string(index=False))
+            f.write("\n\n")  # Duas linhas em branco entre seções
+
+def write_pdf_report(sections: Dict[str, "pd.DataFrame"], pdf_path: str) -> None:
+    from src.services.pdf_renderer import create_pdf_report
+
+    create_pdf_report(sections, pdf_path)
+
+# Módulos importados por cada formato, além do pandas
+_FORMAT_DEPENDENCIES = {
+    'excel': ('src.services.excel_renderer',),
+    'pdf': ('src.services.pdf_renderer',),
+}
+
+def import_report_dependencies(formats: Iterable[str]) -> None:
+    """
+    Importa as bibliotecas dos formatos informados. Chamado antes de criar os processos dos
+    escritores, para que os processos filhos (fork) herdem os módulos já carregados.
+    """
+    importlib.import_module('pandas')
+    for report_format in formats:
+        for module in _FORMAT_DEPENDENCIES.get(report_format, ()):
+            importlib.import_module(module)
+
+_WRITERS: Dict[str, Callable[[Dict[str, "pd.DataFrame"], str], None]] = {
+    'excel': write_excel_report,
+    'csv': write_csv_report,
+    'pdf': write_pdf_report,
+    'txt': write_txt_report,
+}
+
+def _run_writer(report_format: str, sections: Dict[str, "pd.DataFrame"], path: str) -> Dict[str, Any]:
+    """
+    Executa um escritor de relatório isoladamente, medindo o tempo e capturando o erro (se houver).
+
+    O traceback volta no resultado e é registrado pelo processo principal: em um processo filho,
+    o log do próprio escritor não chegaria ao arquivo de log da execução.
+    """
+    start, cpu_start = time.perf_counter(), time.process_time()
+    error = details = None
+    try:
+        _WRITERS[report_format](sections, path)
+    except Exception as e:
+        error = str(e)
+        details = traceback.format_exc()
+    return {
+        'path': path,
+        'seconds': round(time.perf_counter() - start, 3),
+        'cpu_seconds': round(time.process_time() - cpu_start, 3),
+        'error': error,
+        'traceback': details,
+    }
+
+def build_sections(
     columns: List[str],
     total_movies: int,
     directors: List[str],
@@ -45,8 +130,17 @@ def generate_reports(
     longest_movies: List[str],
     longest_series: List[str],
     titles_by_country: dict,
-    date: str
-) -> None:
+    changes: Optional[dict] = None,
+    approximate: Optional[dict] = None,
+) -> Optional[Dict[str, "pd.DataFrame"]]:
+    """
+    Monta as seções do relatório (título -> DataFrame), na ordem em que aparecem em todos os formatos.
+
+    Returns:
+        Optional[Dict[str, pd.DataFrame]]: As seções, ou None se os dados não puderem ser convertidos.
+    """
+    import pandas as pd
+
     try:
         # Criação de DataFrames para cada relatório
         df_columns = pd.DataFrame({'Columns': columns})
@@ -59,68 +153,120 @@ def generate_reports(
         df_longest_movies = pd.DataFrame({'Longest Movies': longest_movies})
         df_longest_series = pd.DataFrame({'Longest Series': longest_series})
         df_titles_by_country = pd.DataFrame(titles_by_country)
+    except Exception as e:
+        logging.error("Ocorreu um erro ao gerar os relatórios: %s", e)
+        return None
 
-        # Salvar em Excel
-        excel_path = f'./data/processed/excel/dataAnalysis_{date}.xlsx'
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            df_columns.to_excel(writer, sheet_name='Colunas', index=False)
-            df_total_movies.to_excel(writer, sheet_name='Total Movies', index=False)
-            df_directors.to_excel(writer, sheet_name='Top Directors', index=False)
-            df_directors_actors.to_excel(writer, sheet_name='Directors as Actors', index=False)
-            df_total_series.to_excel(writer, sheet_name='Total Series', index=False)
-            df_total_by_years.to_excel(writer, sheet_name='Titles by Year', index=False)
-            df_titles_by_rating.to_excel(writer, sheet_name='Titles by Rating', index=False)
-            df_longest_movies.to_excel(writer, sheet_name='Longest Movies', index=False)
-            df_longest_series.to_excel(writer, sheet_name='Longest Series', index=False)
-            df_titles_by_country.to_excel(writer, sheet_name='Titles by Country', index=False)
-
-        logging.info(f"Análise de dados salva em: {excel_path}")
-
-        # Salvar em CSV
-        csv_path = f'./data/processed/csv/dataAnalysis_{date}.csv'
-        df_combined = pd.concat([
-            df_columns, df_total_movies, df_directors, df_directors_actors, df_total_series,
-            df_total_by_years, df_titles_by_rating, df_longest_movies, df_longest_series, df_titles_by_country
-        ], axis=1)
-        df_combined.to_csv(csv_path, index=False)
-        logging.info(f"Análise de dados salva em: {csv_path}")
-
-        # Salvar em PDF
-        pdf_path = f'./data/processed/pdf/dataAnalysis_{date}.pdf'
-        create_pdf_report({
-            'Colunas': df_columns,
-            'Total Movies': df_total_movies,
-            'Top Directors': df_directors,
-            'Directors as Actors': df_directors_actors,
-            'Total Series': df_total_series,
-            'Titles by Year': df_total_by_years,
-            'Titles by Rating': df_titles_by_rating,
-            'Longest Movies': df_longest_movies,
-            'Longest Series': df_longest_series,
-            'Titles by Country': df_titles_by_country
-        }, pdf_path)
-        logging.info(f"Análise de dados salva em: {pdf_path}")
-
-        # Salvar em TXT
-        txt_path = f'./data/processed/txt/dataAnalysis_{date}.txt'
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            for title, df in {
-                'Colunas': df_columns,
-                'Total Movies': df_total_movies,
-                'Top Directors': df_directors,
-                'Directors as Actors': df_directors_actors,
-                'Total Series': df_total_series,
-                'Titles by Year': df_total_by_years,
-                'Titles by Rating': df_titles_by_rating,
-                'Longest Movies': df_longest_movies,
-                'Longest Series': df_longest_series,
-                'Titles by Country': df_titles_by_country
-            }.items():
-                f.write(f"{title}\n")
-                f.write(df.to_string(index=False))
-                f.write("\n\n")  # Duas linhas em branco entre seções
-
-        logging.info(f"Análise de dados salva em: {txt_path}")
+    # Seções do relatório, na ordem em que aparecem em todos os formatos
+    sections = {
+        'Colunas': df_columns,
+        'Total Movies': df_total_movies,
+        'Top Directors': df_directors,
+        'Directors as Actors': df_directors_actors,
+        'Total Series': df_total_series,
+        'Titles by Year': df_total_by_years,
+        'Titles by Rating': df_titles_by_rating,
+        'Longest Movies': df_longest_movies,
+        'Longest Series': df_longest_series,
+        'Titles by Country': df_titles_by_country
+    }
 
-    except Exception as e:
-        logging.error(f"Ocorreu um erro ao gerar os relatórios: {e}")
+    # Seção "o que mudou" da análise incremental
+    if changes is not None:
+        sections['What Changed'] = changes_to_dataframe(changes)
+
+    # Modo aproximado: parâmetros dos sketches e métricas extras
+    if approximate is not None:
+        sections.update(approximate_to_dataframes(approximate))
+
+    return sections
+
+def generate_reports(
+    columns: List[str],
+    total_movies: int,
+    directors: List[str],
+    directors_actors: List[str],
+    total_series: int,
+    total_by_years: dict,
+    titles_by_rating: dict,
+    longest_movies: List[str],
+    longest_series: List[str],
+    titles_by_country: dict,
+    date: str,
+    changes: Optional[dict] = None,
+    formats: Optional[Iterable[str]] = None,
+    executor: str = 'process',
+    output_dir: Optional[str] = None,
+    pool: Optional[Executor] = None,
+    approximate: Optional[dict] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Gera os relatórios nos formatos solicitados. Cada formato é uma tarefa independente, executada
+    em paralelo com as demais: a falha de um formato não impede a geração dos outros.
+
+    Args:
+        formats (Optional[Iterable[str]]): Formatos a gerar (excel, csv, pdf, txt). Se omitido, gera todos.
+        executor (str): 'process' para executar os escritores em processos separados ou 'thread' para threads.
+        output_dir (Optional[str]): Diretório de todos os formatos (padrão: um diretório por formato,
+            em `REPORT_FORMATS`).
+        pool (Optional[Executor]): Pool já existente onde os escritores serão executados (por exemplo,
+            compartilhado entre vários datasets); se omitido, um pool é criado para esta chamada.
+        approximate (Optional[dict]): Resumo do modo aproximado (`apply_approximate_results`); se
+            informado, os relatórios ganham as seções "Aggregation Mode" e "Top Cast (approx.)".
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Para cada formato, o caminho do arquivo, o tempo de geração
+        (relógio e CPU) em segundos e a mensagem de erro (None se o relatório foi gerado).
+    """
+    formats = list(formats) if formats is not None else list(REPORT_FORMATS)
+    unknown = [report_format for report_format in formats if report_format not in REPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Formatos de relatório desconhecidos: {unknown}")
+
+    sections = build_sections(
+        columns, total_movies, directors, directors_actors, total_series, total_by_years,
+        titles_by_rating, longest_movies, longest_series, titles_by_country, changes, approximate,
+    )
+    if sections is None:
+        return {}
+
+    paths = {
+        report_format: os.path.join(
+            output_dir or REPORT_FORMATS[report_format][0], f'dataAnalysis_{date}.{REPORT_FORMATS[report_format][1]}'
+        )
+        for report_format in formats
+    }
+
+    import_report_dependencies(formats)
+    own_pool = pool is None
+    if own_pool:
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        pool = pool_class(max_workers=max(1, len(formats)))
+    try:
+        futures = {
+            report_format: pool.submit(_run_writer, report_format, sections, path)
+            for report_format, path in paths.items()
+        }
+        reports = {}
+        for report_format, future in futures.items():
+            try:
+                reports[report_format] = future.result()
+            except Exception as e:
+                # Falha do próprio executor (por exemplo, um processo filho encerrado)
+                reports[report_format] = {
+                    'path': paths[report_format], 'seconds': None, 'cpu_seconds': None,
+                    'error': str(e), 'traceback': traceback.format_exc(),
+                }
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    for report_format, report in reports.items():
+        if report['error'] is None:
+            logging.info("Análise de dados salva em: %s (%s s)", report['path'], report['seconds'])
+        else:
+            logging.error(
+                "Ocorreu um erro ao gerar o relatório %s: %s\n%s", report_format, report['error'], report['traceback']
+            )
+
+    return reports
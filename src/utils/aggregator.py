@@ -0,0 +1,139 @@
+import importlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from src.models.model import CsvDto
+
+# Módulos que registram as métricas padrão do catálogo
+BUILTIN_METRIC_MODULES = ("src.utils.count", "src.utils.list_columns", "src.utils.people", "src.utils.approximate")
+
+class Accumulator:
+    """
+    Base das métricas calculadas em uma única passada sobre o dataset.
+
+    Cada métrica recebe as linhas uma a uma em `add` e monta o seu resultado final em `result`.
+    Acumuladores parciais (de blocos consecutivos do dataset) são combinados com `merge`,
+    sempre na ordem do arquivo, para que o resultado seja igual ao de uma passada única.
+    """
+
+    def add(self, dto: CsvDto) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "Accumulator") -> None:
+        """Incorpora o estado de `other`, calculado sobre as linhas seguintes do dataset."""
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+# Registro das métricas disponíveis: nome -> fábrica do acumulador
+_registry: Dict[str, Callable[[], Accumulator]] = {}
+
+# Métricas calculadas só quando pedidas pelo nome (fora do padrão de `aggregate`)
+_optional: Set[str] = set()
+
+def register_accumulator(name: str, default: bool = True) -> Callable:
+    """
+    Decorador que registra uma fábrica de acumulador sob o nome informado.
+
+    O nome é a chave usada no dicionário retornado por `aggregate`. Com `default=False`, a métrica
+    não entra no cálculo padrão (sem `names`) e precisa ser pedida explicitamente.
+    """
+    def decorator(factory: Callable[[], Accumulator]) -> Callable[[], Accumulator]:
+        _registry[name] = factory
+        if not default:
+            _optional.add(name)
+        return factory
+    return decorator
+
+def _load_builtin_metrics() -> None:
+    for module in BUILTIN_METRIC_MODULES:
+        importlib.import_module(module)
+
+def registered_accumulators(include_optional: bool = False) -> List[str]:
+    """Retorna os nomes das métricas registradas (por padrão, só as do cálculo padrão), na ordem de registro."""
+    _load_builtin_metrics()
+    return [name for name in _registry if include_optional or name not in _optional]
+
+def run_accumulator(accumulator: Accumulator, dtos: Iterable[CsvDto]) -> Any:
+    """
+    Alimenta um único acumulador com todas as linhas e retorna o seu resultado.
+    """
+    add = accumulator.add
+    for dto in dtos:
+        add(dto)
+    return accumulator.result()
+
+def create_accumulators(names: Optional[Iterable[str]] = None) -> Dict[str, Accumulator]:
+    """
+    Cria um acumulador novo para cada métrica solicitada (ou para todas as do cálculo padrão).
+    """
+    _load_builtin_metrics()
+    return {name: _registry[name]() for name in (names if names is not None else registered_accumulators())}
+
+def feed(accumulators: Dict[str, Accumulator], dtos: Iterable[CsvDto]) -> Dict[str, Accumulator]:
+    """
+    Alimenta todos os acumuladores com as linhas informadas, em uma única passada.
+    """
+    adders = [accumulator.add for accumulator in accumulators.values()]
+
+    for dto in dtos:
+        for add in adders:
+            add(dto)
+
+    return accumulators
+
+def merge_accumulators(target: Dict[str, Accumulator], other: Dict[str, Accumulator]) -> Dict[str, Accumulator]:
+    """
+    Combina os acumuladores parciais de `other` (linhas posteriores) em `target`.
+    """
+    for name, accumulator in target.items():
+        accumulator.merge(other[name])
+    return target
+
+def finalize(accumulators: Dict[str, Accumulator]) -> Dict[str, Any]:
+    """
+    Monta o resultado final de cada métrica.
+    """
+    return {name: accumulator.result() for name, accumulator in accumulators.items()}
+
+def aggregate(dtos: Iterable[CsvDto], names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Percorre o dataset uma única vez alimentando todas as métricas solicitadas.
+
+    Args:
+        dtos (Iterable[CsvDto]): As linhas do dataset (lista ou gerador).
+        names (Optional[Iterable[str]]): Métricas a calcular. Se omitido, calcula todas as registradas.
+
+    Returns:
+        Dict[str, Any]: O resultado de cada métrica, indexado pelo nome registrado.
+    """
+    return finalize(feed(create_accumulators(names), dtos))
+
+def accumulate_chunks(chunks: Iterable[Iterable[CsvDto]], names: Optional[Iterable[str]] = None) -> Dict[str, Accumulator]:
+    """
+    Agrega o dataset bloco a bloco e retorna os acumuladores (ainda não finalizados).
+
+    Os blocos alimentam os mesmos acumuladores, um depois do outro: só o bloco atual fica em
+    memória, e o estado de apoio de cada acumulador (como o registro de pessoas) vale para
+    todos os blocos da agregação e é liberado junto com ela.
+    """
+    accumulators = create_accumulators(names)
+    for chunk in chunks:
+        feed(accumulators, chunk)
+    return accumulators
+
+def aggregate_chunks(chunks: Iterable[Iterable[CsvDto]], names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Agrega o dataset bloco a bloco, mantendo em memória apenas o bloco atual e o estado agregado.
+
+    O estado das métricas de contagem e de top N não depende do número de linhas; as métricas
+    que listam títulos (por classificação, por país e diretores-atores) crescem com o próprio resultado.
+
+    Args:
+        chunks (Iterable[Iterable[CsvDto]]): Os blocos de linhas, na ordem do arquivo.
+        names (Optional[Iterable[str]]): Métricas a calcular. Se omitido, calcula todas as registradas.
+
+    Returns:
+        Dict[str, Any]: O mesmo resultado de `aggregate` sobre o dataset completo.
+    """
+    return finalize(accumulate_chunks(chunks, names))
@@ -0,0 +1,189 @@
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from src.models.model import CsvDto
+from src.utils.aggregator import Accumulator, finalize, merge_accumulators, register_accumulator, registered_accumulators
+from src.utils.sketches import HeavyHitters, HyperLogLog
+
+# Modo aproximado das análises: as contagens exatas por diretor, elenco e país (que crescem com
+# a quantidade de nomes distintos) são substituídas por sketches de memória fixa.
+
+class SketchConfig(NamedTuple):
+    """Limites de erro dos sketches do modo aproximado."""
+    epsilon: float = 0.0001  # Count-Min: erro máximo de cada contagem, como fração do total
+    delta: float = 0.01  # Count-Min: probabilidade de exceder esse erro
+    capacity: int = 1000  # Space-Saving: chaves candidatas acompanhadas
+    distinct_error: float = 0.01  # HyperLogLog: erro relativo típico das contagens de distintos
+
+# Nomes contados localmente antes de irem para os sketches: limita as atualizações dos sketches
+# a uma por nome distinto no intervalo, sem deixar a memória crescer com o catálogo
+PENDING_KEYS = 50_000
+
+# Configuração usada pelos acumuladores criados a partir daqui (os processos filhos herdam via fork)
+_config = SketchConfig()
+
+def configure_sketches(config: SketchConfig) -> None:
+    global _config
+    _config = config
+
+def sketch_config() -> SketchConfig:
+    return _config
+
+class HeavyHittersAccumulator(Accumulator):
+    """
+    Chaves mais frequentes de um campo de lista do CsvDto (diretores, elenco, países), com
+    contagem estimada e o erro máximo de cada uma.
+    """
+
+    def __init__(self, field: str, key_name: str, top_n: Optional[int], count_name: str = "count",
+                 percentage: bool = False):
+        self.field = field
+        self.key_name = key_name
+        self.top_n = top_n
+        self.count_name = count_name
+        self.percentage = percentage
+        self.sketch = HeavyHitters(_config.capacity, _config.epsilon, _config.delta)
+        self.pending = Counter()
+
+    def add(self, dto: CsvDto) -> None:
+        self.pending.update(getattr(dto, self.field))
+        if len(self.pending) >= PENDING_KEYS:
+            self.flush()
+
+    def flush(self) -> None:
+        add = self.sketch.add
+        for key, count in self.pending.items():
+            add(key, count)
+        self.pending.clear()
+
+    def merge(self, other: "HeavyHittersAccumulator") -> None:
+        # As contagens pendentes são somadas sem passar pelos sketches; sketches vazios (blocos
+        # ainda não descarregados) não precisam ser combinados
+        self.pending.update(other.pending)
+        if other.sketch.total:
+            self.sketch.merge(other.sketch)
+        if len(self.pending) >= PENDING_KEYS:
+            self.flush()
+
+    def result(self) -> List[Dict[str, Any]]:
+        self.flush()
+        total = self.sketch.total
+        result = []
+        for key, count, error in self.sketch.top(self.top_n):
+            item = {self.key_name: key, self.count_name: count}
+            if self.percentage:
+                item["percentage"] = round(count / total * 100, 2)
+            item["error"] = error
+            result.append(item)
+
+        logging.info("Mais frequentes (%s, aproximado): %d de %d ocorrências", self.field, len(result), total)
+        return result
+
+class DistinctCountAccumulator(Accumulator):
+    """Quantidade estimada de valores distintos de um campo de lista do CsvDto."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.sketch = HyperLogLog.for_error(_config.distinct_error)
+        self.pending = set()
+
+    def add(self, dto: CsvDto) -> None:
+        self.pending.update(getattr(dto, self.field))
+        if len(self.pending) >= PENDING_KEYS:
+            self.flush()
+
+    def flush(self) -> None:
+        add = self.sketch.add
+        for key in self.pending:
+            add(key)
+        self.pending.clear()
+
+    def merge(self, other: "DistinctCountAccumulator") -> None:
+        self.pending.update(other.pending)
+        self.sketch.merge(other.sketch)
+        if len(self.pending) >= PENDING_KEYS:
+            self.flush()
+
+    def result(self) -> Dict[str, Any]:
+        self.flush()
+        estimate = self.sketch.estimate()
+        logging.info("Distintos (%s, aproximado): %d", self.field, estimate)
+        return {"estimate": estimate, "relative_error": round(self.sketch.relative_error, 4)}
+
+@register_accumulator("approximate_directors", default=False)
+def approximate_directors_accumulator() -> HeavyHittersAccumulator:
+    return HeavyHittersAccumulator("directors", "director", top_n=5)
+
+@register_accumulator("approximate_countries", default=False)
+def approximate_countries_accumulator() -> HeavyHittersAccumulator:
+    return HeavyHittersAccumulator("countries", "country", top_n=None, count_name="total", percentage=True)
+
+@register_accumulator("approximate_cast", default=False)
+def approximate_cast_accumulator() -> HeavyHittersAccumulator:
+    return HeavyHittersAccumulator("cast", "actor", top_n=10)
+
+@register_accumulator("unique_directors", default=False)
+def unique_directors_accumulator() -> DistinctCountAccumulator:
+    return DistinctCountAccumulator("directors")
+
+@register_accumulator("unique_actors", default=False)
+def unique_actors_accumulator() -> DistinctCountAccumulator:
+    return DistinctCountAccumulator("cast")
+
+# Métricas exatas substituídas no modo aproximado: métrica aproximada -> métrica exata
+REPLACED_METRICS = {
+    "approximate_directors": "directors",
+    "approximate_countries": "titles_by_country",
+}
+
+# Métricas que só existem no modo aproximado (seção "Aggregation Mode" dos relatórios)
+EXTRA_METRICS = ("approximate_cast", "unique_directors", "unique_actors")
+
+APPROXIMATE_METRICS = tuple(REPLACED_METRICS) + EXTRA_METRICS
+
+def approximate_metric_names() -> List[str]:
+    """As métricas do modo aproximado: as exatas de memória limitada e as calculadas com sketches."""
+    replaced = set(REPLACED_METRICS.values())
+    return [name for name in registered_accumulators() if name not in replaced] + list(APPROXIMATE_METRICS)
+
+def apply_approximate_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte o resultado das métricas do modo aproximado no formato do modo exato (as chaves
+    `directors` e `titles_by_country`, agora com a coluna `error` e sem as listas de títulos por
+    país) e reúne em `approximate` o modo, os parâmetros e as métricas extras.
+    """
+    results = dict(results)
+    for approximate_name, exact_name in REPLACED_METRICS.items():
+        results[exact_name] = results.pop(approximate_name)
+
+    config = sketch_config()
+    results["approximate"] = {
+        "mode": "approximate",
+        "parameters": config._asdict(),
+        "unique_directors": results.pop("unique_directors"),
+        "unique_actors": results.pop("unique_actors"),
+        "top_cast": results.pop("approximate_cast"),
+    }
+    return results
+
+def merge_approximate(accumulator_sets: Iterable[Dict[str, Accumulator]]) -> Optional[Dict[str, Any]]:
+    """
+    Combina os sketches de vários datasets (regiões ou snapshots de um catálogo) e retorna as
+    métricas aproximadas do conjunto, sem reler nenhum deles.
+
+    Args:
+        accumulator_sets (Iterable[Dict[str, Accumulator]]): Os acumuladores de `APPROXIMATE_METRICS`
+            de cada dataset.
+
+    Returns:
+        Optional[Dict[str, Any]]: O resultado de cada métrica aproximada do conjunto (None se não
+        houver nenhum dataset).
+    """
+    total = None
+    for accumulators in accumulator_sets:
+        if total is None:
+            total = dict(accumulators)
+        else:
+            merge_accumulators(total, accumulators)
+    return finalize(total) if total is not None else None
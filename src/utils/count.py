@@ -1,105 +1,239 @@
 from decimal import ROUND_DOWN, Decimal
 import logging
-from typing import Any, Dict, List
-from collections import Counter, defaultdict
-from datetime import datetime
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from collections import Counter
 
 from src.models.model import CsvDto
-
-def count_movies(dtos: List[CsvDto]) -> Dict[str, Any]:
-    movie_count = sum(1 for dto in dtos if dto.type == "Movie")
-    total_items = len(dtos)
-
-    # Calcula a porcentagem de filmes em relação ao total
-    percentage = (movie_count / total_items * 100) if total_items > 0 else 0
-
-    logging.info(f"Total de filmes: {movie_count} disponíveis no catálogo da Netflix")
-    return {"count": movie_count, "percentage": round(percentage, 2)}
-
-def count_series(dtos: List[CsvDto]) -> Dict[str, Any]:
-    series_count = sum(1 for dto in dtos if dto.type == "TV Show")
-    total_items = len(dtos)
-
-    # Calcula a porcentagem de séries em relação ao total
-    percentage = (series_count / total_items * 100) if total_items > 0 else 0
-
-    logging.info(f"Total de séries: {series_count} disponíveis no catálogo da Netflix")
-    return {"count": series_count, "percentage": round(percentage, 2)}
-
-def count_titles_by_year(dtos: List[CsvDto]) -> List[Dict[str, Any]]:
-    year_counts = Counter()
-
-    for dto in dtos:
-        try:
-            if dto.date_added:
-                date_obj = datetime.strptime(dto.date_added, "%B %d, %Y")
-                year_counts[date_obj.year] += 1
-        except ValueError as e:
-            logging.error(f"Erro ao processar a data: {dto.date_added}. Detalhes: {e}")
-
-    total_count = sum(year_counts.values())
-    result = [
-        {"year": year, "count": count, "percentage": round((count / total_count * 100), 2)}
-        for year, count in year_counts.items()
-    ]
-
-    logging.info(f"Títulos adicionados por ano no catálogo: {result}")
-    return result
-
-def count_titles_by_rating(dtos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    rating_data = defaultdict(lambda: {'total': 0, 'titles': []})
-
-    for dto in dtos:
+from src.utils.aggregator import Accumulator, register_accumulator, run_accumulator
+from src.utils.dates import log_invalid_dates
+from src.utils.people import person_keys
+from src.utils.topk import top_counts
+
+if TYPE_CHECKING:
+    from src.utils.index import CatalogIndex
+
+class TypeCountAccumulator(Accumulator):
+    """Conta os títulos de um tipo ("Movie" ou "TV Show") e a sua porcentagem no catálogo."""
+
+    def __init__(self, title_type: str, label: str):
+        self.title_type = title_type
+        self.label = label
+        self.type_count = 0
+        self.total_items = 0
+
+    def add(self, dto: CsvDto) -> None:
+        self.total_items += 1
+        if dto.type == self.title_type:
+            self.type_count += 1
+
+    def merge(self, other: "TypeCountAccumulator") -> None:
+        self.type_count += other.type_count
+        self.total_items += other.total_items
+
+    def result(self) -> Dict[str, Any]:
+        # Calcula a porcentagem do tipo em relação ao total
+        percentage = (self.type_count / self.total_items * 100) if self.total_items > 0 else 0
+
+        logging.info("Total de %s: %d disponíveis no catálogo da Netflix", self.label, self.type_count)
+        return {"count": self.type_count, "percentage": round(percentage, 2)}
+
+@register_accumulator("total_movies")
+def movie_count_accumulator() -> TypeCountAccumulator:
+    return TypeCountAccumulator("Movie", "filmes")
+
+@register_accumulator("total_series")
+def series_count_accumulator() -> TypeCountAccumulator:
+    return TypeCountAccumulator("TV Show", "séries")
+
+def titles_in_results(results: Dict[str, Any]) -> Optional[int]:
+    """
+    Quantidade de títulos agregados (filmes e séries, os tipos do catálogo), a partir das métricas
+    já calculadas; usada na vazão das etapas. None se as contagens por tipo não foram calculadas.
+    """
+    try:
+        return results["total_movies"]["count"] + results["total_series"]["count"]
+    except (KeyError, TypeError):
+        return None
+
+@register_accumulator("total_by_years")
+class TitlesByYearAccumulator(Accumulator):
+    """Conta os títulos adicionados ao catálogo em cada ano."""
+
+    def __init__(self):
+        self.year_counts = Counter()
+        self.invalid_dates = Counter()
+
+    def add(self, dto: CsvDto) -> None:
+        # Ano convertido na carga do CsvDto; as datas inválidas são resumidas no resultado
+        if dto.year_added is not None:
+            self.year_counts[dto.year_added] += 1
+        elif dto.date_added.strip():
+            self.invalid_dates[dto.date_added] += 1
+
+    def merge(self, other: "TitlesByYearAccumulator") -> None:
+        self.year_counts.update(other.year_counts)
+        self.invalid_dates.update(other.invalid_dates)
+
+    def result(self) -> List[Dict[str, Any]]:
+        log_invalid_dates(self.invalid_dates)
+
+        total_count = sum(self.year_counts.values())
+        result = [
+            {"year": year, "count": count, "percentage": round((count / total_count * 100), 2)}
+            for year, count in self.year_counts.items()
+        ]
+
+        logging.info("Títulos adicionados por ano no catálogo: %d anos, %d títulos", len(result), total_count)
+        return result
+
+@register_accumulator("titles_by_rating")
+class TitlesByRatingAccumulator(Accumulator):
+    """Agrupa os títulos por classificação indicativa."""
+
+    def __init__(self):
+        self.rating_data = {}
+
+    def add(self, dto: CsvDto) -> None:
         rating = dto.rating
         if rating:
-            rating_data[rating]['total'] += 1
-            rating_data[rating]['titles'].append(dto.title)
-
-    result = [
-        {
-            "rating": rating,
-            "total": data['total'],
-            "titles": {i: title for i, title in enumerate(data['titles'])}
-        }
-        for rating, data in rating_data.items()
-    ]
-
-    logging.info(f"Títulos por classificação: {result}")
-    return result
-
-def top_directors(dtos: List[CsvDto], top_n: int = 5) -> List[Dict[str, Any]]:
-    director_counts = Counter(dto.director for dto in dtos if dto.director)
-
-    most_common_directors = director_counts.most_common(top_n)
-
-    result = [{"director": director, "count": count} for director, count in most_common_directors]
-    logging.info(f"Top {top_n} diretores: {result}")
-    return result
-
-def count_titles_by_country(dtos: List[CsvDto]) -> List[Dict[str, Any]]:
-    country_counts = Counter()
-    country_titles = defaultdict(list)
-
-    for dto in dtos:
-        if dto.country.strip():
-            countries = [country.strip() for country in dto.country.split(',')]
-            for country in countries:
-                country_counts[country] += 1
-                country_titles[country].append(dto.title)
-
-    total_titles = sum(country_counts.values())
-
-    result = [
-        {
-            "country": country,
-            "total": count,
-            "percentage": round((count / total_titles * 100), 2),
-            "titles": {i: title for i, title in enumerate(country_titles[country])}
-        }
-        for country, count in country_counts.items()
-    ]
-
-    result.sort(key=lambda x: x['total'], reverse=True)
-
-    logging.info(f"Títulos por país: {result}")
-    return result
+            data = self.rating_data.get(rating)
+            if data is None:
+                data = self.rating_data[rating] = {'total': 0, 'titles': []}
+            data['total'] += 1
+            data['titles'].append(dto.title)
+
+    def merge(self, other: "TitlesByRatingAccumulator") -> None:
+        for rating, other_data in other.rating_data.items():
+            data = self.rating_data.get(rating)
+            if data is None:
+                self.rating_data[rating] = other_data
+            else:
+                data['total'] += other_data['total']
+                data['titles'].extend(other_data['titles'])
+
+    def result(self) -> List[Dict[str, Any]]:
+        result = [
+            {
+                "rating": rating,
+                "total": data['total'],
+                "titles": {i: title for i, title in enumerate(data['titles'])}
+            }
+            for rating, data in self.rating_data.items()
+        ]
+
+        logging.info("Títulos por classificação: %d classificações", len(result))
+        return result
+
+@register_accumulator("directors")
+class TopDirectorsAccumulator(Accumulator):
+    """
+    Conta os títulos de cada diretor e mantém os `top_n` mais frequentes. Títulos com mais de
+    um diretor ("A, B") contam para cada um deles, e uma vez só por título. Os diretores são
+    identificados pelo nome normalizado (como em `src/utils/people.py`) e exibidos com a grafia
+    da primeira ocorrência.
+    """
+
+    def __init__(self, top_n: int = 5):
+        self.top_n = top_n
+        self.director_counts = Counter()
+        self.director_names: Dict[str, str] = {}
+
+    def add(self, dto: CsvDto) -> None:
+        counts = self.director_counts
+        names = self.director_names
+        for key, name in person_keys(dto.directors):
+            counts[key] += 1
+            if key not in names:
+                names[key] = name
+
+    def merge(self, other: "TopDirectorsAccumulator") -> None:
+        self.director_counts.update(other.director_counts)
+        for key, name in other.director_names.items():
+            self.director_names.setdefault(key, name)
+
+    def result(self) -> List[Dict[str, Any]]:
+        most_common_directors = top_counts(self.director_counts, self.top_n)
+
+        result = [{"director": self.director_names[key], "count": count} for key, count in most_common_directors]
+        logging.info("Top %d diretores: %d encontrados", self.top_n, len(result))
+        return result
+
+@register_accumulator("titles_by_country")
+class TitlesByCountryAccumulator(Accumulator):
+    """Conta e agrupa os títulos por país de produção."""
+
+    def __init__(self):
+        self.country_counts = Counter()
+        self.country_titles = {}
+
+    def add(self, dto: CsvDto) -> None:
+        for country in dto.countries:
+            self.country_counts[country] += 1
+            self.country_titles.setdefault(country, []).append(dto.title)
+
+    def merge(self, other: "TitlesByCountryAccumulator") -> None:
+        self.country_counts.update(other.country_counts)
+        for country, titles in other.country_titles.items():
+            self.country_titles.setdefault(country, []).extend(titles)
+
+    def result(self) -> List[Dict[str, Any]]:
+        total_titles = sum(self.country_counts.values())
+
+        result = [
+            {
+                "country": country,
+                "total": count,
+                "percentage": round((count / total_titles * 100), 2),
+                "titles": {i: title for i, title in enumerate(self.country_titles[country])}
+            }
+            for country, count in self.country_counts.items()
+        ]
+
+        result.sort(key=lambda x: x['total'], reverse=True)
+
+        logging.info("Títulos por país: %d países, %d títulos", len(result), total_titles)
+        return result
+
+# As funções abaixo aceitam as linhas do dataset (CsvDto) ou os índices do catálogo (CatalogIndex);
+# com os índices, a resposta é uma consulta, sem percorrer as linhas.
+
+def _is_index(dtos: Any) -> bool:
+    # Um CatalogIndex só existe se o módulo já foi importado: a leitura por objetos não carrega numpy/pandas
+    index = sys.modules.get("src.utils.index")
+    return index is not None and isinstance(dtos, index.CatalogIndex)
+
+def _vectorized() -> ModuleType:
+    from src.utils import vectorized
+    return vectorized
+
+def count_movies(dtos: Union[List[CsvDto], "CatalogIndex"]) -> Dict[str, Any]:
+    if _is_index(dtos):
+        return _vectorized().count_movies(dtos.dataset, dtos)
+    return run_accumulator(movie_count_accumulator(), dtos)
+
+def count_series(dtos: Union[List[CsvDto], "CatalogIndex"]) -> Dict[str, Any]:
+    if _is_index(dtos):
+        return _vectorized().count_series(dtos.dataset, dtos)
+    return run_accumulator(series_count_accumulator(), dtos)
+
+def count_titles_by_year(dtos: Union[List[CsvDto], "CatalogIndex"]) -> List[Dict[str, Any]]:
+    if _is_index(dtos):
+        return _vectorized().count_titles_by_year(dtos.dataset, dtos)
+    return run_accumulator(TitlesByYearAccumulator(), dtos)
+
+def count_titles_by_rating(dtos: Union[List[Dict[str, Any]], "CatalogIndex"]) -> List[Dict[str, Any]]:
+    if _is_index(dtos):
+        return _vectorized().count_titles_by_rating(dtos.dataset, dtos)
+    return run_accumulator(TitlesByRatingAccumulator(), dtos)
+
+def top_directors(dtos: Union[List[CsvDto], "CatalogIndex"], top_n: int = 5) -> List[Dict[str, Any]]:
+    if _is_index(dtos):
+        return _vectorized().top_directors(dtos.dataset, top_n)
+    return run_accumulator(TopDirectorsAccumulator(top_n), dtos)
+
+def count_titles_by_country(dtos: Union[List[CsvDto], "CatalogIndex"]) -> List[Dict[str, Any]]:
+    if _is_index(dtos):
+        return _vectorized().count_titles_by_country(dtos.dataset, dtos)
+    return run_accumulator(TitlesByCountryAccumulator(), dtos)
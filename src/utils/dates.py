@@ -0,0 +1,106 @@
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+# numpy e pandas são importados só nas funções do dataset colunar: a leitura por objetos
+# (CsvDto) usa apenas o parser de datas e não carrega essas bibliotecas
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.models.columnar import ColumnarDataset
+
+# Formato do campo date_added (por exemplo, "September 25, 2021")
+DATE_ADDED_FORMAT = "%B %d, %Y"
+
+# Valor das colunas de data para datas vazias ou inválidas
+MISSING = -1
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+@lru_cache(maxsize=65536)
+def parse_date_added(value: str) -> Optional[date]:
+    """
+    Converte um valor de date_added em data. Cada texto distinto é convertido uma única vez.
+
+    Espaços no início e no fim são ignorados. Retorna None para valores vazios ou inválidos
+    (sem registrar erro: quem chama decide se e como resumir as datas inválidas).
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, DATE_ADDED_FORMAT).date()
+    except ValueError:
+        return None
+
+def year_added(value: str) -> Optional[int]:
+    """Retorna o ano de um valor de date_added (None se vazio ou inválido)."""
+    parsed = parse_date_added(value)
+    return parsed.year if parsed is not None else None
+
+def log_invalid_dates(invalid: Dict[str, int], limit: int = 5) -> None:
+    """Registra um único aviso com o total de datas inválidas e alguns exemplos."""
+    if invalid:
+        logging.warning(
+            "%d datas inválidas ignoradas (%d valores distintos), por exemplo: %s",
+            sum(invalid.values()), len(invalid), list(invalid)[:limit],
+        )
+
+def normalize_dates(dataset: "ColumnarDataset") -> Dict[str, "np.ndarray"]:
+    """
+    Etapa de normalização das datas: converte a coluna date_added em colunas compactas de
+    ano (int16), mês (int8) e dia da semana (int8, 0 = segunda-feira), com -1 para datas
+    vazias ou inválidas.
+
+    Cada data distinta é convertida uma única vez. O resultado fica guardado no dataset
+    (`dataset.dates`) e é reaproveitado nas chamadas seguintes.
+
+    Returns:
+        Dict[str, np.ndarray]: As colunas `year`, `month` e `weekday`, uma posição por linha.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if dataset.dates is not None:
+        return dataset.dates
+
+    if not len(dataset):
+        empty = {"year": np.empty(0, dtype=np.int16), "month": np.empty(0, dtype=np.int8), "weekday": np.empty(0, dtype=np.int8)}
+        dataset.dates = empty
+        return empty
+
+    codes, uniques = pd.factorize(dataset.column("date_added").to_numpy(dtype=object))
+    unique_parts = np.full((len(uniques), 3), MISSING, dtype=np.int16)
+    invalid = {}
+    for i, value in enumerate(uniques):
+        parsed = parse_date_added(value)
+        if parsed is not None:
+            unique_parts[i] = (parsed.year, parsed.month, parsed.weekday())
+        elif value.strip():
+            invalid[value] = 0
+
+    if invalid:
+        counts = np.bincount(codes, minlength=len(uniques))
+        for i, value in enumerate(uniques):
+            if value in invalid:
+                invalid[value] = int(counts[i])
+        log_invalid_dates(invalid)
+
+    parts = unique_parts[codes]
+    dataset.dates = {
+        "year": parts[:, 0].copy(),
+        "month": parts[:, 1].astype(np.int8),
+        "weekday": parts[:, 2].astype(np.int8),
+    }
+    return dataset.dates
+
+def date_items(dataset: "ColumnarDataset", part: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Retorna as linhas com data válida e o valor da parte informada (year, month ou weekday).
+    """
+    import numpy as np
+
+    values = normalize_dates(dataset)[part]
+    rows = np.flatnonzero(values != MISSING)
+    return rows, values[rows].astype(np.int64)
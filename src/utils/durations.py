@@ -0,0 +1,57 @@
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
+
+# numpy e pandas são importados só em `duration_items` (dataset colunar)
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.models.columnar import ColumnarDataset
+
+# Unidades do campo duration: minutos (filmes) e temporadas (séries)
+MINUTES = "min"
+SEASONS = "seasons"
+
+_DURATION_PATTERN = re.compile(r"(\d+)\s*(min|seasons?)", re.IGNORECASE)
+
+class Duration(NamedTuple):
+    value: int
+    unit: str
+
+@lru_cache(maxsize=4096)
+def parse_duration(value: str) -> Optional[Duration]:
+    """
+    Converte um valor de duration ("90 min", "1 Season", "3 Seasons") em valor e unidade.
+
+    Retorna None para valores vazios ou em outro formato.
+    """
+    match = _DURATION_PATTERN.fullmatch(value.strip())
+    if match is None:
+        return None
+    unit = MINUTES if match.group(2).lower() == MINUTES else SEASONS
+    return Duration(int(match.group(1)), unit)
+
+def duration_value(value: str, unit: str) -> Optional[int]:
+    """Retorna a duração na unidade informada (None se vazia, inválida ou em outra unidade)."""
+    duration = parse_duration(value)
+    return duration.value if duration is not None and duration.unit == unit else None
+
+def duration_items(dataset: "ColumnarDataset", unit: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Retorna as linhas cuja duração está na unidade informada e o valor de cada uma.
+
+    Cada valor distinto da coluna é convertido uma única vez.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(dataset.column("duration").to_numpy(dtype=object))
+    unique_values = np.full(len(uniques), -1, dtype=np.int64)
+    for i, value in enumerate(uniques):
+        parsed = duration_value(value, unit)
+        if parsed is not None:
+            unique_values[i] = parsed
+
+    values = unique_values[codes]
+    rows = np.flatnonzero(values >= 0)
+    return rows, values[rows]
@@ -0,0 +1,176 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.columnar import ColumnarDataset
+from src.utils.dates import date_items
+
+# Campos indexados: campo -> coluna de origem no dataset
+INDEXED_FIELDS = {
+    "director": "director",
+    "cast": "cast",
+    "country": "country",
+    "rating": "rating",
+    "type": "type",
+    "year_added": "date_added",
+    "month_added": "date_added",
+    "weekday_added": "date_added",
+}
+
+# Campos derivados da data de inclusão normalizada: campo -> parte da data
+DATE_FIELDS = {"year_added": "year", "month_added": "month", "weekday_added": "weekday"}
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+class FieldIndex:
+    """
+    Índice invertido de um campo: para cada valor, as linhas (ordenadas) em que ele aparece.
+
+    Os valores ficam na ordem de primeira aparição no dataset. Nos campos de lista, uma linha
+    aparece uma vez para cada ocorrência do valor (como na contagem original por linha).
+    """
+
+    def __init__(self, rows: np.ndarray, items: np.ndarray, size: int):
+        """
+        Args:
+            rows (np.ndarray): A linha de origem de cada item, em ordem não decrescente.
+            items (np.ndarray): O valor de cada item.
+            size (int): A quantidade de linhas do dataset.
+        """
+        self.size = size
+        codes, uniques = pd.factorize(items)
+        self.values: List[Any] = [value.item() if isinstance(value, np.generic) else value for value in uniques]
+        self.rows = rows.astype(np.int32, copy=False)
+        self.codes = codes.astype(np.int32, copy=False)
+
+        counts = np.bincount(self.codes, minlength=len(self.values))
+        order = np.argsort(self.codes, kind="stable")
+        postings = np.split(self.rows[order], np.cumsum(counts)[:-1]) if len(self.values) else []
+        self.postings: Dict[Any, np.ndarray] = dict(zip(self.values, postings))
+
+        # Se nenhum valor se repete dentro de uma linha, as linhas de cada valor já são únicas
+        pairs = self.rows.astype(np.int64) * max(len(self.values), 1) + self.codes
+        self.unique_rows = len(np.unique(pairs)) == len(pairs)
+
+    def lookup_unique(self, value: Any) -> np.ndarray:
+        """Retorna as linhas em que o valor aparece, sem repetições."""
+        rows = self.lookup(value)
+        return rows if self.unique_rows else np.unique(rows)
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """Retorna as linhas em que o valor aparece (vazio se o valor não existir)."""
+        return self.postings.get(value, _EMPTY)
+
+    def counts(self, rows: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """
+        Conta as ocorrências de cada valor, opcionalmente só entre as linhas informadas.
+        """
+        if rows is None:
+            return {value: len(posting) for value, posting in self.postings.items()}
+
+        selected = np.zeros(self.size, dtype=bool)
+        selected[rows] = True
+        counts = np.bincount(self.codes[selected[self.rows]], minlength=len(self.values))
+        return {self.values[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+def _column_items(dataset: ColumnarDataset, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    values = dataset.column(column).to_numpy(dtype=object)
+    rows = np.flatnonzero(values != "")
+    return rows, values[rows]
+
+class CatalogIndex:
+    """
+    Índices invertidos do catálogo (diretor, elenco, país, classificação, tipo e ano, mês e dia
+    da semana de inclusão), com uma pequena API de filtro e agrupamento que responde às
+    consultas sem percorrer o dataset.
+
+    Cada índice é construído na primeira consulta ao campo (ou de uma vez, com `build`).
+
+    Exemplo:
+        index = CatalogIndex(dataset)
+        rows = index.filter(director="Martin Scorsese", country="United States", rating="R")
+        index.titles(rows)
+        index.group_by("year_added", rows)
+    """
+
+    def __init__(self, dataset: ColumnarDataset):
+        self.dataset = dataset
+        self._fields: Dict[str, FieldIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def build(self, fields: Iterable[str] = INDEXED_FIELDS) -> "CatalogIndex":
+        """Constrói antecipadamente os índices informados (padrão: todos)."""
+        for field in fields:
+            self.field(field)
+        return self
+
+    def field(self, field: str) -> FieldIndex:
+        """Retorna o índice do campo, construindo-o na primeira chamada."""
+        index = self._fields.get(field)
+        if index is None:
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Campo não indexado: {field}. Campos disponíveis: {list(INDEXED_FIELDS)}")
+            column = INDEXED_FIELDS[field]
+            if field in DATE_FIELDS:
+                rows, items = date_items(self.dataset, DATE_FIELDS[field])
+            elif column in self.dataset.lists:
+                rows, items = self.dataset.exploded(column)
+                items = np.asarray(items, dtype=object)
+            else:
+                rows, items = _column_items(self.dataset, column)
+            index = self._fields[field] = FieldIndex(rows, items, len(self.dataset))
+        return index
+
+    def lookup(self, field: str, value: Any) -> np.ndarray:
+        """Retorna as linhas (ordenadas) em que o campo tem o valor informado."""
+        return self.field(field).lookup(value)
+
+    def filter(self, **criteria: Any) -> np.ndarray:
+        """
+        Retorna as linhas que atendem a todos os critérios (interseção dos índices).
+
+        Cada critério é `campo=valor` ou `campo=[valor, ...]` (qualquer um dos valores).
+        Sem critérios, retorna todas as linhas.
+        """
+        if not criteria:
+            return np.arange(len(self.dataset), dtype=np.int32)
+
+        matches = []
+        for field, value in criteria.items():
+            index = self.field(field)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                postings = [index.lookup(item) for item in value]
+                matches.append(np.unique(np.concatenate(postings)) if postings else _EMPTY)
+            else:
+                matches.append(index.lookup_unique(value))
+
+        # Interseção a partir do menor conjunto: cada linha restante é procurada (busca binária)
+        # nos demais, que já estão ordenados
+        matches.sort(key=len)
+        rows = matches[0]
+        for other in matches[1:]:
+            if not len(rows):
+                break
+            positions = np.searchsorted(other, rows)
+            found = positions < len(other)
+            found[found] = other[positions[found]] == rows[found]
+            rows = rows[found]
+        return rows
+
+    def count(self, **criteria: Any) -> int:
+        """Retorna a quantidade de títulos que atendem aos critérios."""
+        return len(self.filter(**criteria))
+
+    def group_by(self, field: str, rows: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """
+        Conta os títulos por valor do campo, opcionalmente só entre as linhas informadas
+        (por exemplo, o resultado de `filter`). As chaves seguem a ordem de primeira aparição.
+        """
+        return self.field(field).counts(rows)
+
+    def titles(self, rows: np.ndarray) -> List[str]:
+        """Retorna os títulos das linhas informadas."""
+        return self.dataset.column("title").to_numpy(dtype=object)[rows].tolist()
@@ -1,80 +1,104 @@
-from collections import defaultdict
 import logging
 from typing import Any, Dict, List
 
 from src.models.model import CsvDto
+from src.utils.aggregator import Accumulator, register_accumulator, run_accumulator
+from src.utils.people import DirectorsAsActorsAccumulator
+from src.utils.topk import TopK
+
+@register_accumulator("columns")
+class ColumnsAccumulator(Accumulator):
+    """Guarda os nomes das colunas a partir da primeira linha do dataset."""
+
+    def __init__(self):
+        self.columns = None
+
+    def add(self, dto: CsvDto) -> None:
+        if self.columns is None:
+            self.columns = list(dto.columns)
+
+    def merge(self, other: "ColumnsAccumulator") -> None:
+        if self.columns is None:
+            self.columns = other.columns
+
+    def result(self) -> List[str]:
+        if self.columns is None:
+            logging.warning("A lista de DTOs está vazia.")
+            return []
+
+        logging.info("Colunas do objeto: %s", self.columns)
+        return self.columns
+
+class LongestAccumulator(Accumulator):
+    """
+    Mantém os `top_n` títulos de um tipo com a maior duração no campo informado do CsvDto
+    (`duration_minutes` ou `seasons`), com um heap limitado (sem guardar nem ordenar todos os títulos).
+    """
+
+    def __init__(self, title_type: str, field: str, key: str, top_n: int = 5):
+        self.title_type = title_type
+        self.field = field
+        self.key = key
+        self.top_n = top_n
+        self.top = TopK(top_n)
+
+    def add(self, dto: CsvDto) -> None:
+        if dto.type == self.title_type:
+            value = getattr(dto, self.field)
+            if value is not None:
+                self.top.push(value, dto.title)
+
+    def merge(self, other: "LongestAccumulator") -> None:
+        self.top.merge(other.top)
+
+    def result(self) -> List[Dict[str, Any]]:
+        return [{'title': title, self.key: value} for value, title in self.top.items()]
+
+@register_accumulator("longest_movies")
+class LongestMoviesAccumulator(LongestAccumulator):
+    """Mantém os `top_n` filmes mais longos (em minutos)."""
+
+    def __init__(self, top_n: int = 5):
+        super().__init__("Movie", "duration_minutes", "duration", top_n)
+
+    def result(self) -> List[Dict[str, Any]]:
+        longest_movies = super().result()
+        logging.info("Top %d filmes mais longos: %d encontrados", self.top_n, len(longest_movies))
+        return longest_movies
+
+@register_accumulator("longest_series")
+class LongestSeriesAccumulator(LongestAccumulator):
+    """Mantém as `top_n` séries com mais temporadas (incluindo as de "1 Season")."""
+
+    def __init__(self, top_n: int = 5):
+        super().__init__("TV Show", "seasons", "seasons", top_n)
+
+    def result(self) -> List[Dict[str, Any]]:
+        longest_series = super().result()
+        logging.info("Top %d séries mais longas: %d encontradas", self.top_n, len(longest_series))
+        return longest_series
 
 def list_columns(dtos: List[CsvDto]) -> List[str]:
     """
     Retorna uma lista com os nomes das colunas de um objeto DTO.
     """
-    if not dtos:
-        logging.warning("A lista de DTOs está vazia.")
-        return []
-
-    columns = list(vars(dtos[0]).keys())
-    logging.info(f"Colunas do objeto: {columns}")
-    return columns
+    return run_accumulator(ColumnsAccumulator(), dtos[:1])
 
 def list_longest_movies(dtos: List[CsvDto], top_n: int = 5) -> List[Dict[str, Any]]:
     """
     Retorna uma lista dos filmes com as maiores durações, limitando-se ao top_n especificado.
     """
-    movie_durations = []
-
-    for dto in dtos:
-        if dto.type == "Movie":
-            try:
-                duration_str = dto.duration
-                if "min" in duration_str:
-                    minutes = int(duration_str.split()[0])
-                    movie_durations.append({'title': dto.title, 'duration': minutes})
-            except (ValueError, AttributeError) as e:
-                logging.warning(f"Erro ao processar a duração do filme '{dto.title}': {e}")
-                continue
-
-    # Ordenar os filmes pela duração em ordem decrescente
-    longest_movies = sorted(movie_durations, key=lambda movie: movie['duration'], reverse=True)
-
-    logging.info(f"Top {top_n} filmes mais longos: {longest_movies[:top_n]}")
-    return longest_movies[:top_n]
+    return run_accumulator(LongestMoviesAccumulator(top_n), dtos)
 
 def list_longest_series(dtos: List[CsvDto], top_n: int = 5) -> List[Dict[str, Any]]:
     """
     Retorna uma lista das séries com o maior número de temporadas, limitando-se ao top_n especificado.
     """
-    series_seasons_count = []
-
-    for dto in dtos:
-        if dto.type == "TV Show":
-            try:
-                duration_str = dto.duration
-                if "Seasons" in duration_str:
-                    seasons = int(duration_str.split()[0])
-                    series_seasons_count.append({'title': dto.title, 'seasons': seasons})
-            except (ValueError, AttributeError) as e:
-                logging.warning(f"Erro ao processar a quantidade de temporadas da série '{dto.title}': {e}")
-                continue
-
-    # Ordenar as séries pelo número de temporadas em ordem decrescente
-    longest_series = sorted(series_seasons_count, key=lambda series: series['seasons'], reverse=True)
-
-    logging.info(f"Top {top_n} séries mais longas: {longest_series[:top_n]}")
-    return longest_series[:top_n]
+    return run_accumulator(LongestSeriesAccumulator(top_n), dtos)
 
 def list_directors_as_actors(dtos: List[CsvDto]) -> List[Dict[str, Any]]:
     """
     Retorna uma lista de diretores que também atuaram em suas próprias produções, com a contagem de aparições e títulos.
+    Os nomes são comparados normalizados (espaços e maiúsculas), com cada diretor de "A, B" considerado.
     """
-    directors_with_roles = defaultdict(lambda: {"director": "", "count": 0, "titles": []})
-
-    for dto in dtos:
-        if dto.director and dto.director in dto.cast:
-            director_info = directors_with_roles[dto.director]
-            director_info["director"] = dto.director
-            director_info["count"] += 1
-            director_info["titles"].append(dto.title)
-
-    result = list(directors_with_roles.values())
-    logging.info(f"Diretores que atuaram em suas próprias produções: {result}")
-    return result
+    return run_accumulator(DirectorsAsActorsAccumulator(), dtos)
@@ -0,0 +1,191 @@
+import csv
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.models.model import DEFAULT_CHUNK_SIZE, CsvDto
+from src.utils.aggregator import Accumulator, accumulate_chunks, finalize, merge_accumulators
+
+# Tamanho dos blocos lidos ao procurar os limites dos shards
+_SCAN_BLOCK_SIZE = 1 << 20
+
+# Shards por processo: mais shards que processos equilibra a carga entre eles
+SHARDS_PER_WORKER = 4
+
+def _count_quotes(file, start: int, end: int) -> int:
+    file.seek(start)
+    quotes = 0
+    remaining = end - start
+    while remaining > 0:
+        block = file.read(min(_SCAN_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        quotes += block.count(b'"')
+        remaining -= len(block)
+    return quotes
+
+def _next_record_start(file, offset: int, quotes_before: int) -> Tuple[int, int]:
+    """
+    Procura, a partir de `offset`, o início do próximo registro: a posição logo após uma
+    quebra de linha que não esteja dentro de um campo entre aspas.
+
+    Uma quebra de linha fica fora de aspas quando o número de aspas desde o início do arquivo
+    é par (aspas escapadas, `""`, somam duas e não alteram a paridade).
+
+    Returns:
+        Tuple[int, int]: A posição encontrada (ou o fim do arquivo) e o número de aspas antes dela.
+    """
+    file.seek(offset)
+    position = offset
+    quotes = quotes_before
+    while True:
+        block = file.read(_SCAN_BLOCK_SIZE)
+        if not block:
+            return position, quotes
+
+        cursor = 0
+        while True:
+            newline = block.find(b'\n', cursor)
+            if newline < 0:
+                quotes += block.count(b'"', cursor)
+                break
+            quotes += block.count(b'"', cursor, newline)
+            cursor = newline + 1
+            if quotes % 2 == 0:
+                return position + cursor, quotes
+
+        position += len(block)
+
+def split_csv_shards(file_path: str, shard_count: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Divide um arquivo CSV em intervalos de bytes alinhados ao início de registros.
+
+    Campos entre aspas com quebras de linha (como `description` e `cast`) nunca são cortados.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        shard_count (int): A quantidade desejada de shards.
+
+    Returns:
+        Tuple[List[str], List[Tuple[int, int]]]: As colunas do cabeçalho e os intervalos
+        (início, fim) de cada shard, na ordem do arquivo.
+    """
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as file:
+        data_start, quotes = _next_record_start(file, 0, 0)
+        file.seek(0)
+        header_line = file.read(data_start).decode('utf-8')
+        header = next(csv.reader(io.StringIO(header_line)), [])
+
+        shard_size = max(1, (file_size - data_start) // max(1, shard_count))
+        boundaries = [data_start]
+        position = data_start
+        for i in range(1, shard_count):
+            target = data_start + i * shard_size
+            if target <= boundaries[-1]:
+                continue
+            quotes += _count_quotes(file, position, target)
+            position, quotes = _next_record_start(file, target, quotes)
+            if position >= file_size:
+                break
+            boundaries.append(position)
+        boundaries.append(file_size)
+
+    shards = [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+    return header, shards
+
+def iter_block_dto(header: List[str], data: bytes) -> Iterator[CsvDto]:
+    """
+    Lê os registros de um bloco de bytes do CSV (alinhado ao início de registros, sem o cabeçalho)
+    como objetos CsvDto.
+    """
+    # Mesma decodificação e tratamento de quebras de linha do `open(..., mode='r')` usado na leitura serial
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    for row in csv.DictReader(text, fieldnames=header):
+        yield CsvDto(**row)
+
+def iter_shard_dto(file_path: str, header: List[str], start: int, end: int) -> Iterator[CsvDto]:
+    """
+    Lê os registros de um shard (intervalo de bytes) do CSV como objetos CsvDto.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    yield from iter_block_dto(header, data)
+
+def _chunks(rows: Iterable[CsvDto], chunk_size: int) -> Iterator[List[CsvDto]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _aggregate_shard(
+    file_path: str,
+    header: List[str],
+    shard: Tuple[int, int],
+    names: Optional[List[str]],
+    chunk_size: int,
+) -> Dict[str, Accumulator]:
+    # Executado nos processos filhos: devolve os acumuladores parciais do shard
+    start, end = shard
+    return accumulate_chunks(_chunks(iter_shard_dto(file_path, header, start, end), chunk_size), names)
+
+def aggregate_block(
+    header: List[str],
+    data: bytes,
+    names: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Accumulator]:
+    """
+    Agrega um bloco de bytes do CSV (ver `iter_block_dto`) e devolve os acumuladores parciais,
+    a serem combinados na ordem do arquivo.
+    """
+    return accumulate_chunks(_chunks(iter_block_dto(header, data), chunk_size), names)
+
+def aggregate_parallel(
+    file_path: str,
+    workers: int,
+    names: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Agrega o CSV em paralelo: o arquivo é dividido em shards, cada shard é lido e agregado
+    em um processo separado e os acumuladores parciais são combinados no processo principal.
+
+    A combinação segue a ordem dos shards no arquivo, então o resultado é idêntico ao da
+    leitura serial.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        workers (int): A quantidade de processos.
+        names (Optional[Iterable[str]]): Métricas a calcular. Se omitido, calcula todas as registradas.
+        chunk_size (int): A quantidade de linhas por bloco dentro de cada shard.
+
+    Returns:
+        Dict[str, Any]: O mesmo resultado de `aggregate` sobre o dataset completo.
+    """
+    names = list(names) if names is not None else None
+    header, shards = split_csv_shards(file_path, workers * SHARDS_PER_WORKER)
+    logging.info("Agregação paralela: %d shards em %d processos", len(shards), workers)
+
+    total = accumulate_chunks([], names)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(
+            _aggregate_shard,
+            [file_path] * len(shards),
+            [header] * len(shards),
+            shards,
+            [names] * len(shards),
+            [chunk_size] * len(shards),
+        )
+        for partial in partials:
+            merge_accumulators(total, partial)
+
+    return finalize(total)
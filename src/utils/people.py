@@ -0,0 +1,341 @@
+import logging
+import unicodedata
+from collections import Counter
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.models.model import CsvDto
+from src.utils.aggregator import Accumulator, register_accumulator, run_accumulator
+from src.utils.topk import top_counts
+
+# Pessoas do catálogo (diretores e elenco) como entidades: cada nome é normalizado e recebe um id
+# inteiro uma única vez, e as métricas sobre pessoas trabalham com conjuntos de ids por título.
+
+@lru_cache(maxsize=4096)
+def normalize_name(name: str) -> str:
+    """
+    Forma canônica de um nome de pessoa, usada para comparar nomes entre colunas e títulos:
+    Unicode normalizado (NFKC), espaços repetidos ou nas pontas removidos e sem diferença entre
+    maiúsculas e minúsculas.
+    """
+    return " ".join(unicodedata.normalize("NFKC", name).split()).casefold()
+
+def display_name(name: str) -> str:
+    """Grafia exibida de um nome: a original, sem os espaços repetidos ou nas pontas."""
+    return " ".join(name.split())
+
+@lru_cache(maxsize=4096)
+def person_keys(names: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Pessoas distintas de um campo de nomes (por exemplo, os diretores de um título), como pares
+    (nome normalizado, grafia exibida) na ordem do campo: "Bob, bob" é uma única pessoa.
+    """
+    keys = {}
+    for name in names:
+        key = normalize_name(name)
+        if key and key not in keys:
+            keys[key] = display_name(name)
+    return tuple(keys.items())
+
+class PersonRegistry:
+    """
+    Ids inteiros das pessoas do catálogo. Cada nome normalizado recebe um id (sequencial) na
+    primeira vez em que aparece; o nome exibido é a grafia dessa primeira ocorrência.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        # Cada grafia já vista aponta direto para o id, sem normalizar o nome de novo
+        self._spellings: Dict[str, int] = {}
+        # Os mesmos diretores se repetem entre os títulos: a tupla de ids de cada campo é reaproveitada
+        self._groups: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Os caches (grafias e grupos) não vão para outros processos: são refeitos conforme o uso
+        return {"_ids": self._ids, "names": self.names}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._ids = state["_ids"]
+        self.names = state["names"]
+        self._spellings = {}
+        self._groups = {}
+
+    def intern(self, name: str) -> int:
+        """Retorna o id da pessoa, registrando-a se for a primeira ocorrência do nome."""
+        person = self._spellings.get(name)
+        if person is None:
+            key = normalize_name(name)
+            person = self._ids.get(key)
+            if person is None:
+                person = self._ids[key] = len(self.names)
+                self.names.append(display_name(name))
+            self._spellings[name] = person
+        return person
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Retorna o id da pessoa (None se o nome nunca apareceu)."""
+        return self._ids.get(normalize_name(name))
+
+    def name(self, person: int) -> str:
+        return self.names[person]
+
+    def group(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Ids de uma lista de nomes (por exemplo, os diretores de um título), sem repetição e na ordem do campo."""
+        people = self._groups.get(names)
+        if people is None:
+            people = self._groups[names] = tuple(dict.fromkeys(self.intern(name) for name in names if name.strip()))
+        return people
+
+    def people(self, names: Iterable[str]) -> FrozenSet[int]:
+        """Conjunto de ids de uma lista de nomes (por exemplo, o elenco de um título)."""
+        # Caso comum: todas as grafias já vistas, resolvido sem laço em Python
+        people = frozenset(map(self._spellings.get, names))
+        if None in people:
+            people = frozenset(self.intern(name) for name in names if name.strip())
+        return people
+
+    def translate(self, other: "PersonRegistry", person: int) -> int:
+        """Converte um id de `other` (de outro processo ou de outro dataset) para o id deste registro."""
+        return self.intern(other.names[person])
+
+class PersonAccumulator(Accumulator):
+    """
+    Base das métricas sobre pessoas: converte os diretores e o elenco de cada título em ids do
+    registro e repassa para `add_title`, que também é usado pelo `PersonIndex`.
+
+    Sem `registry`, o acumulador tem um registro próprio, que vale para toda a agregação (todos
+    os blocos de `accumulate_chunks` alimentam o mesmo acumulador) e é liberado junto com ela:
+    os nomes lidos não ficam retidos no processo entre uma agregação e outra.
+    """
+
+    def __init__(self, registry: Optional[PersonRegistry] = None):
+        self.registry = registry if registry is not None else PersonRegistry()
+
+    def add(self, dto: CsvDto) -> None:
+        registry = self.registry
+        self.add_title(dto.title, registry.group(dto.directors), registry.people(dto.cast), dto.directors)
+
+    def add_title(self, title: str, directors: Tuple[int, ...], cast: FrozenSet[int], director_names: Tuple[str, ...]) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "PersonAccumulator") -> None:
+        # Acumuladores com o mesmo registro (os do `PersonIndex`) usam os mesmos ids; os de outra
+        # agregação (outro shard ou outro processo) têm os ids convertidos pelo nome
+        if other.registry is self.registry:
+            self.merge_people(other, None)
+        else:
+            self.merge_people(other, partial(self.registry.translate, other.registry))
+
+    def merge_people(self, other: "PersonAccumulator", convert: Optional[Callable[[int], int]]) -> None:
+        raise NotImplementedError
+
+@register_accumulator("directors_actors")
+class DirectorsAsActorsAccumulator(PersonAccumulator):
+    """
+    Agrupa os diretores que também aparecem no elenco das próprias produções: a interseção entre
+    os ids dos diretores e o conjunto de ids do elenco de cada título (todos os diretores de
+    "A, B" são considerados, e os nomes são comparados já normalizados).
+    """
+
+    def __init__(self, registry: Optional[PersonRegistry] = None):
+        super().__init__(registry)
+        self.directors_with_roles: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, dto: CsvDto) -> None:
+        # Sem diretor ou sem elenco não há interseção: o elenco nem é convertido em ids
+        director_names = dto.directors
+        if director_names and dto.cast:
+            registry = self.registry
+            directors = registry.group(director_names)
+            cast = registry.people(dto.cast)
+            if not cast.isdisjoint(directors):
+                self.add_title(dto.title, directors, cast, director_names)
+
+    def add_title(self, title: str, directors: Tuple[int, ...], cast: FrozenSet[int], director_names: Tuple[str, ...]) -> None:
+        for person in directors:
+            if person in cast:
+                director_info = self.directors_with_roles.get(person)
+                if director_info is None:
+                    # Exibido com a grafia do campo de diretores do primeiro título em que atuou
+                    name = next(name for name in director_names if self.registry.lookup(name) == person)
+                    director_info = self.directors_with_roles[person] = {
+                        "director": display_name(name), "count": 0, "titles": [],
+                    }
+                director_info["count"] += 1
+                director_info["titles"].append(title)
+
+    def merge_people(self, other: "DirectorsAsActorsAccumulator", convert: Optional[Callable[[int], int]]) -> None:
+        for person, other_info in other.directors_with_roles.items():
+            if convert is not None:
+                person = convert(person)
+            director_info = self.directors_with_roles.get(person)
+            if director_info is None:
+                self.directors_with_roles[person] = other_info
+            else:
+                director_info["count"] += other_info["count"]
+                director_info["titles"].extend(other_info["titles"])
+
+    def result(self) -> List[Dict[str, Any]]:
+        result = list(self.directors_with_roles.values())
+        logging.info("Diretores que atuaram em suas próprias produções: %d diretores", len(result))
+        return result
+
+@register_accumulator("prolific_actors", default=False)
+class ProlificActorsAccumulator(PersonAccumulator):
+    """Conta os títulos de cada pessoa do elenco e mantém as `top_n` mais frequentes."""
+
+    def __init__(self, top_n: int = 10, registry: Optional[PersonRegistry] = None):
+        super().__init__(registry)
+        self.top_n = top_n
+        self.actor_counts = Counter()
+
+    def add(self, dto: CsvDto) -> None:
+        if dto.cast:
+            self.actor_counts.update(self.registry.people(dto.cast))
+
+    def add_title(self, title: str, directors: Tuple[int, ...], cast: FrozenSet[int], director_names: Tuple[str, ...]) -> None:
+        self.actor_counts.update(cast)
+
+    def merge_people(self, other: "ProlificActorsAccumulator", convert: Optional[Callable[[int], int]]) -> None:
+        if convert is None:
+            self.actor_counts.update(other.actor_counts)
+        else:
+            for person, count in other.actor_counts.items():
+                self.actor_counts[convert(person)] += count
+
+    def result(self) -> List[Dict[str, Any]]:
+        name = self.registry.name
+        result = [{"actor": name(person), "count": count} for person, count in top_counts(self.actor_counts, self.top_n)]
+        logging.info("Top %d atores: %d encontrados", self.top_n, len(result))
+        return result
+
+# Pares (diretor, ator) guardados como um único inteiro: o id do diretor nos bits altos
+_PAIR_SHIFT = 32
+_PAIR_MASK = (1 << _PAIR_SHIFT) - 1
+
+@register_accumulator("collaborations", default=False)
+class CollaborationsAccumulator(PersonAccumulator):
+    """
+    Conta os títulos de cada par diretor–ator (cada diretor do título com cada pessoa do elenco,
+    exceto ele mesmo) e mantém os `top_n` pares mais frequentes.
+    """
+
+    def __init__(self, top_n: int = 10, registry: Optional[PersonRegistry] = None):
+        super().__init__(registry)
+        self.top_n = top_n
+        self.pair_counts = Counter()
+
+    def add(self, dto: CsvDto) -> None:
+        if dto.directors and dto.cast:
+            super().add(dto)
+
+    def add_title(self, title: str, directors: Tuple[int, ...], cast: FrozenSet[int], director_names: Tuple[str, ...]) -> None:
+        for director in directors:
+            high = director << _PAIR_SHIFT
+            self.pair_counts.update(high | actor for actor in cast if actor != director)
+
+    def merge_people(self, other: "CollaborationsAccumulator", convert: Optional[Callable[[int], int]]) -> None:
+        if convert is None:
+            self.pair_counts.update(other.pair_counts)
+        else:
+            for pair, count in other.pair_counts.items():
+                self.pair_counts[convert(pair >> _PAIR_SHIFT) << _PAIR_SHIFT | convert(pair & _PAIR_MASK)] += count
+
+    def result(self) -> List[Dict[str, Any]]:
+        name = self.registry.name
+        result = [
+            {"director": name(pair >> _PAIR_SHIFT), "actor": name(pair & _PAIR_MASK), "count": count}
+            for pair, count in top_counts(self.pair_counts, self.top_n)
+        ]
+        logging.info("Top %d parcerias diretor-ator: %d encontradas", self.top_n, len(result))
+        return result
+
+class PersonIndex:
+    """
+    Índice das pessoas de um catálogo já carregado: o registro de ids e, para cada título, a tupla
+    de ids dos diretores e o conjunto de ids do elenco. As consultas usam os mesmos acumuladores
+    da leitura em streaming, sem converter nenhum nome de novo.
+    """
+
+    def __init__(self, registry: Optional[PersonRegistry] = None):
+        # Registro próprio por padrão: os ids do índice não dependem do que o processo já leu
+        self.registry = registry if registry is not None else PersonRegistry()
+        self.titles: List[str] = []
+        self.director_names: List[Tuple[str, ...]] = []
+        self.directors: List[Tuple[int, ...]] = []
+        self.cast: List[FrozenSet[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def add(self, dto: CsvDto) -> None:
+        self.add_names(dto.title, dto.directors, dto.cast)
+
+    def add_names(self, title: str, director_names: Tuple[str, ...], cast_names: Iterable[str]) -> None:
+        """Inclui um título a partir dos nomes já separados (por exemplo, vindos do dataset colunar)."""
+        self.titles.append(title)
+        self.director_names.append(director_names)
+        self.directors.append(self.registry.group(director_names))
+        self.cast.append(self.registry.people(cast_names))
+
+    @classmethod
+    def build(cls, dtos: Iterable[CsvDto]) -> "PersonIndex":
+        index = cls()
+        for dto in dtos:
+            index.add(dto)
+        logging.info("Índice de pessoas: %d títulos, %d pessoas", len(index), len(index.registry))
+        return index
+
+    def _run(self, accumulator: PersonAccumulator) -> Any:
+        add_title = accumulator.add_title
+        for title, directors, cast, director_names in zip(self.titles, self.directors, self.cast, self.director_names):
+            add_title(title, directors, cast, director_names)
+        return accumulator.result()
+
+    def titles_with(self, name: str) -> List[str]:
+        """Títulos em que a pessoa aparece como diretora ou no elenco."""
+        person = self.registry.lookup(name)
+        if person is None:
+            return []
+        return [
+            title for title, directors, cast in zip(self.titles, self.directors, self.cast)
+            if person in cast or person in directors
+        ]
+
+    def directors_as_actors(self) -> List[Dict[str, Any]]:
+        return self._run(DirectorsAsActorsAccumulator(self.registry))
+
+    def prolific_actors(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        return self._run(ProlificActorsAccumulator(top_n, self.registry))
+
+    def collaborations(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        return self._run(CollaborationsAccumulator(top_n, self.registry))
+
+def directors_in_cast(director_names: Iterable[str], cast: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Diretores de um título que também estão no elenco, como (nome normalizado, grafia do campo de
+    diretores), sem repetição. Para quem guarda o estado por nome (por exemplo, a análise incremental).
+    """
+    cast_keys = {normalize_name(name) for name in cast}
+    matches = {}
+    for name in director_names:
+        key = normalize_name(name)
+        if key and key in cast_keys and key not in matches:
+            matches[key] = display_name(name)
+    return list(matches.items())
+
+def list_prolific_actors(dtos: Iterable[CsvDto], top_n: int = 10) -> List[Dict[str, Any]]:
+    """
+    Retorna as `top_n` pessoas do elenco com mais títulos, com a contagem de cada uma.
+    """
+    return run_accumulator(ProlificActorsAccumulator(top_n), dtos)
+
+def list_collaborations(dtos: Iterable[CsvDto], top_n: int = 10) -> List[Dict[str, Any]]:
+    """
+    Retorna os `top_n` pares diretor–ator que mais trabalharam juntos, com a quantidade de títulos.
+    """
+    return run_accumulator(CollaborationsAccumulator(top_n), dtos)
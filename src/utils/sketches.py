@@ -0,0 +1,338 @@
+import heapq
+import json
+import math
+import operator
+import struct
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+# Estruturas probabilísticas de memória fixa para catálogos muito grandes: o estado não cresce
+# com a quantidade de linhas nem com a quantidade de chaves distintas. Todas podem ser combinadas
+# (`merge`) entre shards, datasets e snapshots e gravadas em bytes (`to_bytes`/`from_bytes`).
+
+# Maior profundidade do Count-Min: cada linha usa 4 bytes de um único blake2b (até 64 bytes)
+MAX_CMS_DEPTH = 16
+
+def hash64(key: str) -> int:
+    """Hash de 64 bits da chave (blake2b), estável entre processos e execuções."""
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+@lru_cache(maxsize=None)
+def _row_hashes(depth: int) -> struct.Struct:
+    return struct.Struct(f'<{depth}I')
+
+def _cms_indexes(key: str, width: int, depth: int) -> List[int]:
+    # Um hash de 32 bits por linha, todos tirados do mesmo digest. Sem cache: as contagens
+    # pendentes dos acumuladores já agrupam os nomes repetidos antes de chegarem aqui
+    digest = blake2b(key.encode('utf-8'), digest_size=4 * depth).digest()
+    return [value % width for value in _row_hashes(depth).unpack(digest)]
+
+def _check_compatible(sketch, other, *attributes: str) -> None:
+    if type(sketch) is not type(other) or any(getattr(sketch, a) != getattr(other, a) for a in attributes):
+        raise ValueError(f"Sketches com parâmetros diferentes não podem ser combinados: {sketch!r} e {other!r}")
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: estimativa da frequência de cada chave em uma matriz `depth` x `width`.
+
+    A estimativa nunca é menor que a frequência real e, com probabilidade `1 - delta`, excede-a
+    em no máximo `epsilon * total` (`width = e / epsilon`, `depth = ln(1 / delta)`).
+    """
+
+    _HEADER = struct.Struct('<4sIIQ')
+    _MAGIC = b'CMS1'
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError(f"epsilon e delta devem estar entre 0 e 1, recebidos: {epsilon}, {delta}")
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        if self.depth > MAX_CMS_DEPTH:
+            raise ValueError(f"delta muito pequeno (profundidade máxima: {MAX_CMS_DEPTH}), recebido: {delta}")
+        self.total = 0
+        self.rows = [array('q', bytes(8 * self.width)) for _ in range(self.depth)]
+
+    def __repr__(self) -> str:
+        return f"CountMinSketch(width={self.width}, depth={self.depth}, total={self.total})"
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Soma `count` à chave e retorna a nova estimativa (evita uma segunda consulta em `estimate`)."""
+        self.total += count
+        estimate = self.total
+        for row, index in zip(self.rows, _cms_indexes(key, self.width, self.depth)):
+            row[index] += count
+            if row[index] < estimate:
+                estimate = row[index]
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self.rows, _cms_indexes(key, self.width, self.depth)))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        _check_compatible(self, other, 'width', 'depth')
+        self.rows = [array('q', map(operator.add, row, other_row)) for row, other_row in zip(self.rows, other.rows)]
+        self.total += other.total
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self._MAGIC, self.width, self.depth, self.total) + b''.join(
+            row.tobytes() for row in self.rows
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountMinSketch":
+        magic, width, depth, total = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("Os dados não são de um CountMinSketch")
+        sketch = cls.__new__(cls)
+        sketch.width, sketch.depth, sketch.total = width, depth, total
+        offset = cls._HEADER.size
+        sketch.rows = []
+        for _ in range(depth):
+            row = array('q')
+            row.frombytes(data[offset:offset + 8 * width])
+            sketch.rows.append(row)
+            offset += 8 * width
+        return sketch
+
+class SpaceSaving:
+    """
+    Space-Saving (Metwally et al.): acompanha no máximo `capacity` chaves candidatas a mais
+    frequentes. Quando não há espaço, a chave nova substitui a de menor contagem e herda essa
+    contagem como erro.
+
+    Para cada chave acompanhada, `count - error <= frequência real <= count`; qualquer chave com
+    frequência acima de `total / capacity` está entre as acompanhadas.
+
+    Se um limite superior melhor for conhecido para a chave nova (por exemplo, a estimativa de um
+    Count-Min), `add` usa o menor dos dois em vez da contagem herdada, e a chave nem entra se
+    esse limite não superar a menor contagem acompanhada.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError(f"capacity deve ser positivo, recebido: {capacity}")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # Min-heap com uma entrada (contagem, chave) por chave; a contagem da entrada pode estar
+        # desatualizada (menor que a real) e é corrigida só quando a entrada chega ao topo
+        self._heap: List[Tuple[int, str]] = []
+
+    def __repr__(self) -> str:
+        return f"SpaceSaving(capacity={self.capacity}, total={self.total}, keys={len(self.counts)})"
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, key: str, count: int = 1, upper_bound: Optional[int] = None) -> None:
+        self.total += count
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            heapq.heappush(self._heap, (count, key))
+        elif upper_bound is not None and upper_bound <= self._heap[0][0]:
+            # A chave não pode superar a menor contagem acompanhada (o topo do heap nunca a
+            # excede): fica de fora sem trocar a guarda de uma chave por outra equivalente
+            return
+        else:
+            minimum, evicted = self._pop_minimum()
+            del counts[evicted], self.errors[evicted]
+            new_count = minimum + count if upper_bound is None else min(minimum + count, upper_bound)
+            counts[key] = new_count
+            self.errors[key] = new_count - count
+            heapq.heappush(self._heap, (new_count, key))
+
+    def _pop_minimum(self) -> Tuple[int, str]:
+        heap, counts = self._heap, self.counts
+        while True:
+            count, key = heap[0]
+            current = counts[key]
+            if count == current:
+                heapq.heappop(heap)
+                return count, key
+            heapq.heapreplace(heap, (current, key))
+
+    def minimum(self) -> int:
+        """Menor contagem acompanhada (0 enquanto houver espaço): o limite para as chaves não acompanhadas."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def estimate(self, key: str) -> int:
+        return self.counts.get(key, self.minimum())
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Combina dois resumos (Agarwal et al., "Mergeable Summaries"): a contagem de uma chave
+        ausente em um dos lados é o mínimo daquele lado, somado também ao erro; ficam as
+        `capacity` chaves de maior contagem.
+        """
+        _check_compatible(self, other, 'capacity')
+        own_minimum, other_minimum = self.minimum(), other.minimum()
+        counts, errors = {}, {}
+        for key in self.counts.keys() | other.counts.keys():
+            own = key in self.counts
+            theirs = key in other.counts
+            counts[key] = (self.counts[key] if own else own_minimum) + (other.counts[key] if theirs else other_minimum)
+            errors[key] = (
+                (self.errors[key] if own else own_minimum) + (other.errors[key] if theirs else other_minimum)
+            )
+
+        kept = heapq.nlargest(self.capacity, counts.items(), key=lambda item: (item[1], item[0]))
+        self.counts = dict(kept)
+        self.errors = {key: errors[key] for key in self.counts}
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """As `n` chaves de maior contagem (todas se omitido), como (chave, contagem, erro)."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, count, self.errors[key]) for key, count in ranked[:n]]
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            'capacity': self.capacity,
+            'total': self.total,
+            'counters': [[key, count, self.errors[key]] for key, count in self.counts.items()],
+        }, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpaceSaving":
+        state = json.loads(data.decode('utf-8'))
+        sketch = cls(state['capacity'])
+        sketch.total = state['total']
+        for key, count, error in state['counters']:
+            sketch.counts[key] = count
+            sketch.errors[key] = error
+        sketch._heap = [(count, key) for key, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+class HeavyHitters:
+    """
+    Chaves mais frequentes com Space-Saving (quais são as candidatas) e Count-Min (contagem de
+    cada uma): as duas estimativas são limites superiores, então vale a menor delas. A chave que
+    entra no Space-Saving começa com a estimativa do Count-Min, e não com a menor contagem
+    acompanhada, o que mantém as candidatas estáveis quando não há chaves muito frequentes.
+    """
+
+    def __init__(self, capacity: int = 1000, epsilon: float = 0.001, delta: float = 0.01):
+        self.candidates = SpaceSaving(capacity)
+        self.counts = CountMinSketch(epsilon, delta)
+
+    def __repr__(self) -> str:
+        return f"HeavyHitters({self.candidates!r}, {self.counts!r})"
+
+    @property
+    def total(self) -> int:
+        return self.candidates.total
+
+    def add(self, key: str, count: int = 1) -> None:
+        estimate = self.counts.add(key, count)
+        candidates = self.candidates
+        if key in candidates.counts or len(candidates.counts) < candidates.capacity:
+            candidates.add(key, count)
+        else:
+            candidates.add(key, count, upper_bound=estimate)
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.candidates.merge(other.candidates)
+        self.counts.merge(other.counts)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """
+        As `n` chaves de maior contagem estimada, como (chave, contagem, erro máximo): a frequência
+        real está entre `contagem - erro` e `contagem`.
+        """
+        ranked = []
+        for key, count, error in self.candidates.top():
+            estimate = min(count, self.counts.estimate(key))
+            ranked.append((key, estimate, estimate - (count - error)))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:n]
+
+    def to_bytes(self) -> bytes:
+        candidates = self.candidates.to_bytes()
+        return struct.pack('<I', len(candidates)) + candidates + self.counts.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HeavyHitters":
+        (size,) = struct.unpack_from('<I', data)
+        sketch = cls.__new__(cls)
+        sketch.candidates = SpaceSaving.from_bytes(data[4:4 + size])
+        sketch.counts = CountMinSketch.from_bytes(data[4 + size:])
+        return sketch
+
+class HyperLogLog:
+    """
+    HyperLogLog (Flajolet et al.): estimativa da quantidade de chaves distintas com 2^precision
+    registradores de um byte. O erro relativo típico é 1,04 / sqrt(2^precision); `precision`
+    pode ser derivada do erro desejado com `HyperLogLog.for_error`.
+    """
+
+    _HEADER = struct.Struct('<4sB')
+    _MAGIC = b'HLL1'
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision deve estar entre 4 e 18, recebido: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision})"
+
+    @classmethod
+    def for_error(cls, relative_error: float) -> "HyperLogLog":
+        if not 0 < relative_error < 1:
+            raise ValueError(f"relative_error deve estar entre 0 e 1, recebido: {relative_error}")
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(min(18, max(4, precision)))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, key: str) -> None:
+        h = hash64(key)
+        bits = 64 - self.precision
+        index = h >> bits
+        # Posição do primeiro bit 1 nos bits restantes (1 = bit mais significativo)
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Correção para cardinalidades pequenas (contagem linear)
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        _check_compatible(self, other, 'precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self._MAGIC, self.precision) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        magic, precision = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("Os dados não são de um HyperLogLog")
+        sketch = cls(precision)
+        sketch.registers = bytearray(data[cls._HEADER.size:])
+        return sketch
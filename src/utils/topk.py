@@ -0,0 +1,85 @@
+import heapq
+from typing import TYPE_CHECKING, Any, Generic, Hashable, Iterable, List, Mapping, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    import numpy as np
+
+T = TypeVar("T")
+
+class TopK(Generic[T]):
+    """
+    Seleção dos `k` itens de maior pontuação em uma única passada, com um heap limitado a `k`
+    posições (O(n log k) em vez de ordenar todos os itens).
+
+    O resultado é igual ao de uma ordenação estável decrescente seguida de `[:k]`: entre
+    pontuações iguais, prevalece o item que chegou primeiro. Seleções parciais (de blocos
+    consecutivos do dataset) são combinadas com `merge`, sempre na ordem do arquivo.
+    """
+
+    def __init__(self, k: int):
+        if k < 0:
+            raise ValueError("k deve ser maior ou igual a 0")
+        self.k = k
+        self.count = 0  # Quantidade de itens já recebidos (define a ordem de chegada)
+        # Min-heap de (pontuação, -ordem de chegada, item): o topo é o primeiro a sair
+        self.heap: List[Tuple[Any, int, T]] = []
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, score: Any, item: T) -> None:
+        self._push(score, self.count, item)
+        self.count += 1
+
+    def _push(self, score: Any, sequence: int, item: T) -> None:
+        entry = (score, -sequence, item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif self.k and entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+
+    def extend(self, pairs: Iterable[Tuple[Any, T]]) -> None:
+        """Inclui vários pares (pontuação, item)."""
+        for score, item in pairs:
+            self.push(score, item)
+
+    def merge(self, other: "TopK[T]") -> None:
+        """Incorpora a seleção de `other`, calculada sobre os itens seguintes do dataset."""
+        for score, negative_sequence, item in other.heap:
+            self._push(score, self.count - negative_sequence, item)
+        self.count += other.count
+
+    def items(self) -> List[Tuple[Any, T]]:
+        """Retorna os pares (pontuação, item) selecionados, da maior para a menor pontuação."""
+        return [(score, item) for score, _, item in sorted(self.heap, reverse=True)]
+
+def top_counts(counts: Mapping[Hashable, int], top_n: int) -> List[Tuple[Hashable, int]]:
+    """
+    Retorna as `top_n` chaves mais frequentes de uma contagem, como `Counter.most_common`:
+    empates mantêm a ordem das chaves no dicionário.
+    """
+    top = TopK(top_n)
+    for key, count in counts.items():
+        top.push(count, key)
+    return [(key, count) for count, key in top.items()]
+
+def top_indices(values: "np.ndarray", top_n: int) -> "np.ndarray":
+    """
+    Retorna os índices dos `top_n` maiores valores, do maior para o menor, com empates na ordem
+    dos índices (como uma ordenação estável decrescente).
+
+    Usa uma seleção parcial (O(n)) e ordena apenas os candidatos selecionados.
+    """
+    import numpy as np  # Só o dataset colunar usa esta função: a leitura por objetos não carrega o numpy
+
+    values = np.asarray(values)
+    if top_n <= 0 or not len(values):
+        return np.empty(0, dtype=np.intp)
+    if top_n < len(values):
+        threshold = np.partition(values, len(values) - top_n)[len(values) - top_n]
+        above = np.flatnonzero(values > threshold)
+        tied = np.flatnonzero(values == threshold)[:top_n - len(above)]
+        candidates = np.sort(np.concatenate([above, tied]))
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind="stable")]
@@ -0,0 +1,295 @@
+import logging
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.columnar import ColumnarDataset
+from src.utils.dates import WEEKDAYS
+from src.utils.durations import MINUTES, SEASONS, duration_items
+from src.utils.index import CatalogIndex
+from src.utils.people import display_name, normalize_name
+from src.utils.topk import top_indices
+
+# Versões vetorizadas das funções de src/utils/count.py e src/utils/list_columns.py.
+# Todas retornam exatamente as mesmas estruturas das versões baseadas em CsvDto. As contagens
+# são consultas sobre os índices invertidos de src/utils/index.py (CatalogIndex).
+
+def _values(dataset: ColumnarDataset, name: str) -> np.ndarray:
+    return dataset.column(name).to_numpy(dtype=object)
+
+def _group_in_order(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    Agrupa `values` por `keys` preservando a ordem de primeira aparição das chaves
+    e a ordem original dos valores dentro de cada grupo.
+    """
+    codes, uniques = pd.factorize(keys)
+    counts = np.bincount(codes, minlength=len(uniques))
+    order = np.argsort(codes, kind="stable")
+    groups = np.split(values[order], np.cumsum(counts)[:-1]) if len(uniques) else []
+    return uniques, counts, groups
+
+def _normalized(items: pd.Categorical) -> np.ndarray:
+    # Nomes de pessoas normalizados (ver src/utils/people.py), um por item da coluna explodida
+    categories = np.asarray([normalize_name(name) for name in items.categories], dtype=object)
+    return categories[items.codes] if len(categories) else np.empty(len(items), dtype=object)
+
+def _index(dataset: ColumnarDataset, index: Optional[CatalogIndex]) -> CatalogIndex:
+    return index if index is not None else CatalogIndex(dataset)
+
+def _count_type(index: CatalogIndex, title_type: str, label: str) -> Dict[str, Any]:
+    total_items = len(index)
+    type_count = len(index.lookup("type", title_type)) if total_items else 0
+
+    percentage = (type_count / total_items * 100) if total_items > 0 else 0
+
+    logging.info("Total de %s: %d disponíveis no catálogo da Netflix", label, type_count)
+    return {"count": type_count, "percentage": round(percentage, 2)}
+
+def count_movies(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> Dict[str, Any]:
+    return _count_type(_index(dataset, index), "Movie", "filmes")
+
+def count_series(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> Dict[str, Any]:
+    return _count_type(_index(dataset, index), "TV Show", "séries")
+
+def count_titles_by_year(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+    if not len(dataset):
+        return []
+
+    year_counts = _index(dataset, index).group_by("year_added")
+    total_count = sum(year_counts.values())
+
+    result = [
+        {"year": year, "count": count, "percentage": round((count / total_count * 100), 2)}
+        for year, count in year_counts.items()
+    ]
+
+    logging.info("Títulos adicionados por ano no catálogo: %d anos, %d títulos", len(result), total_count)
+    return result
+
+def count_titles_by_month(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Conta os títulos adicionados ao catálogo em cada mês do ano (1 a 12), em ordem de calendário.
+    """
+    if not len(dataset):
+        return []
+
+    month_counts = _index(dataset, index).group_by("month_added")
+    total_count = sum(month_counts.values())
+
+    result = [
+        {"month": month, "count": month_counts[month], "percentage": round((month_counts[month] / total_count * 100), 2)}
+        for month in sorted(month_counts)
+    ]
+
+    logging.info("Títulos adicionados por mês no catálogo: %d meses, %d títulos", len(result), total_count)
+    return result
+
+def count_titles_by_weekday(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Conta os títulos adicionados ao catálogo em cada dia da semana, de segunda a domingo.
+    """
+    if not len(dataset):
+        return []
+
+    weekday_counts = _index(dataset, index).group_by("weekday_added")
+    total_count = sum(weekday_counts.values())
+
+    result = [
+        {"weekday": WEEKDAYS[weekday], "count": weekday_counts[weekday], "percentage": round((weekday_counts[weekday] / total_count * 100), 2)}
+        for weekday in sorted(weekday_counts)
+    ]
+
+    logging.info("Títulos adicionados por dia da semana no catálogo: %d dias, %d títulos", len(result), total_count)
+    return result
+
+def _titles_by_value(index: CatalogIndex, field: str) -> List[Tuple[Any, np.ndarray]]:
+    # Títulos de cada valor do campo, na ordem das linhas
+    titles = index.dataset.column("title").to_numpy(dtype=object)
+    return [(value, titles[rows]) for value, rows in index.field(field).postings.items()]
+
+def count_titles_by_rating(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+    if not len(dataset):
+        return []
+
+    result = [
+        {
+            "rating": rating,
+            "total": len(titles),
+            "titles": {i: title for i, title in enumerate(titles)}
+        }
+        for rating, titles in _titles_by_value(_index(dataset, index), "rating")
+    ]
+
+    logging.info("Títulos por classificação: %d classificações", len(result))
+    return result
+
+def top_directors(dataset: ColumnarDataset, top_n: int = 5, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    Retorna os `top_n` diretores com mais títulos (entre as linhas `rows`, se informadas). Títulos
+    com mais de um diretor contam para cada um, uma vez por título; os diretores são comparados
+    pelo nome normalizado e exibidos com a grafia da primeira ocorrência.
+    """
+    if not len(dataset):
+        return []
+
+    director_rows, directors = dataset.exploded("director")
+    keys = _normalized(directors)
+    names = np.asarray(directors, dtype=object)
+
+    selected = keys != ""
+    if rows is not None:
+        selected &= np.isin(director_rows, rows)
+    director_rows, keys, names = director_rows[selected], keys[selected], names[selected]
+
+    # Cada diretor uma vez por título, mesmo que o nome se repita no campo
+    unique = ~pd.MultiIndex.from_arrays([director_rows, keys]).duplicated()
+    keys, names = keys[unique], names[unique]
+    if not len(keys):
+        return []
+
+    # Códigos na ordem de primeira aparição: empates mantêm essa ordem, como no Counter.most_common
+    codes, _ = pd.factorize(keys)
+    counts = np.bincount(codes)
+    _, first = np.unique(codes, return_index=True)
+    top = top_indices(counts, top_n)
+
+    result = [{"director": display_name(names[first[i]]), "count": int(counts[i])} for i in top]
+    logging.info("Top %d diretores: %d encontrados", top_n, len(result))
+    return result
+
+def count_titles_by_country(dataset: ColumnarDataset, index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+    if not len(dataset):
+        return []
+
+    countries = _titles_by_value(_index(dataset, index), "country")
+    total_titles = sum(len(titles) for _, titles in countries)
+
+    result = [
+        {
+            "country": country,
+            "total": len(country_titles),
+            "percentage": round((len(country_titles) / total_titles * 100), 2),
+            "titles": {i: title for i, title in enumerate(country_titles)}
+        }
+        for country, country_titles in countries
+    ]
+
+    result.sort(key=lambda x: x['total'], reverse=True)
+
+    logging.info("Títulos por país: %d países, %d títulos", len(result), total_titles)
+    return result
+
+def list_columns(dataset: ColumnarDataset) -> List[str]:
+    """
+    Retorna uma lista com os nomes das colunas do dataset.
+    """
+    if not len(dataset):
+        logging.warning("O dataset está vazio.")
+        return []
+
+    columns = list(dataset.columns)
+    logging.info("Colunas do objeto: %s", columns)
+    return columns
+
+def _longest(dataset: ColumnarDataset, title_type: str, unit: str, key: str, top_n: int) -> List[Dict[str, Any]]:
+    if not len(dataset):
+        return []
+
+    rows, values = duration_items(dataset, unit)
+    matches = (dataset.column("type").to_numpy(dtype=object)[rows] == title_type)
+    rows, values = rows[matches], values[matches]
+    titles = _values(dataset, "title")
+
+    top = top_indices(values, top_n)
+    return [{'title': titles[rows[i]], key: int(values[i])} for i in top]
+
+def list_longest_movies(dataset: ColumnarDataset, top_n: int = 5) -> List[Dict[str, Any]]:
+    """
+    Retorna uma lista dos filmes com as maiores durações, limitando-se ao top_n especificado.
+    """
+    longest_movies = _longest(dataset, "Movie", MINUTES, "duration", top_n)
+    logging.info("Top %d filmes mais longos: %d encontrados", top_n, len(longest_movies))
+    return longest_movies
+
+def list_longest_series(dataset: ColumnarDataset, top_n: int = 5) -> List[Dict[str, Any]]:
+    """
+    Retorna uma lista das séries com o maior número de temporadas, limitando-se ao top_n especificado.
+    """
+    longest_series = _longest(dataset, "TV Show", SEASONS, "seasons", top_n)
+    logging.info("Top %d séries mais longas: %d encontradas", top_n, len(longest_series))
+    return longest_series
+
+def list_directors_as_actors(dataset: ColumnarDataset) -> List[Dict[str, Any]]:
+    """
+    Retorna uma lista de diretores que também atuaram em suas próprias produções, com a contagem de aparições e títulos.
+    """
+    if not len(dataset):
+        return []
+
+    director_rows, directors = dataset.exploded("director")
+    cast_rows, cast = dataset.exploded("cast")
+
+    # Nomes normalizados uma vez por valor distinto (categorias), depois expandidos pelos códigos
+    director_keys = _normalized(directors)
+    cast_keys = _normalized(cast)
+
+    # Junção por (linha, nome normalizado): diretores do título que também estão no elenco dele,
+    # sem repetir o mesmo diretor no mesmo título
+    matches = pd.MultiIndex.from_arrays([director_rows, director_keys])
+    matched = matches.isin(pd.MultiIndex.from_arrays([cast_rows, cast_keys])) & (director_keys != "")
+    matched &= ~matches.duplicated()
+    rows = director_rows[matched]
+    keys = director_keys[matched]
+    names = np.asarray(directors, dtype=object)[matched]
+
+    # Cada diretor é exibido com a grafia do primeiro título em que atuou
+    _, counts, groups = _group_in_order(keys, _values(dataset, "title")[rows])
+    _, first = np.unique(pd.factorize(keys)[0], return_index=True)
+    display = [display_name(name) for name in names[first]]
+
+    result = [
+        {"director": director, "count": int(count), "titles": list(titles)}
+        for director, count, titles in zip(display, counts, groups)
+    ]
+    logging.info("Diretores que atuaram em suas próprias produções: %d diretores", len(result))
+    return result
+
+def aggregate_columnar(
+    dataset: ColumnarDataset,
+    index: Optional[CatalogIndex] = None,
+    stage: Optional[Callable[[str], ContextManager]] = None,
+) -> Dict[str, Any]:
+    """
+    Calcula todas as métricas do catálogo sobre o dataset colunar.
+
+    Args:
+        dataset (ColumnarDataset): O dataset colunar.
+        index (Optional[CatalogIndex]): Os índices do catálogo (se omitido, são construídos aqui).
+        stage (Optional[Callable]): Fábrica de contexto chamada com o nome de cada métrica, para
+            medir cada uma separadamente (por exemplo, `Instrumentation.stage`).
+
+    Returns:
+        Dict[str, Any]: O mesmo dicionário retornado por `src.utils.aggregator.aggregate`.
+    """
+    index = _index(dataset, index)
+    stage = stage or (lambda name: nullcontext())
+    metrics = {
+        "columns": lambda: list_columns(dataset),
+        "total_movies": lambda: count_movies(dataset, index),
+        "directors": lambda: top_directors(dataset),
+        "directors_actors": lambda: list_directors_as_actors(dataset),
+        "total_series": lambda: count_series(dataset, index),
+        "total_by_years": lambda: count_titles_by_year(dataset, index),
+        "titles_by_rating": lambda: count_titles_by_rating(dataset, index),
+        "longest_movies": lambda: list_longest_movies(dataset),
+        "longest_series": lambda: list_longest_series(dataset),
+        "titles_by_country": lambda: count_titles_by_country(dataset, index),
+    }
+
+    results = {}
+    for name, metric in metrics.items():
+        with stage(name):
+            results[name] = metric()
+    return results
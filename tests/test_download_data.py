@@ -0,0 +1,167 @@
+"""
+Download em streaming contra um servidor local (`http.server`): download completo, reutilização
+com 304, retomada de um `.part` truncado, recuperação de um 416 e falha com 404.
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services import download_data
+from src.services.download_data import METADATA_FILE, create_session, download_file
+
+CONTENT = b"show_id,type,title\n" + b"".join(b"s%d,Movie,Title %d\n" % (i, i) for i in range(5_000))
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+class CatalogHandler(SimpleHTTPRequestHandler):
+    """Serve os arquivos do diretório com ETag, respostas condicionais (304) e Range/If-Range (206/416)."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.received.append(dict(self.headers))
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self._respond(404)
+            return
+        with open(path, 'rb') as file:
+            data = file.read()
+        etag = _etag(data)
+
+        if self.headers.get('If-None-Match') == etag:
+            self._respond(304)
+            return
+
+        start = 0
+        byte_range = self.headers.get('Range')
+        if byte_range and self.headers.get('If-Range') == etag:
+            start = int(byte_range[len('bytes='):].split('-', 1)[0])
+            if start >= len(data):
+                self._respond(416, {'Content-Range': f"bytes */{len(data)}"})
+                return
+            self._respond(206, {'Content-Range': f"bytes {start}-{len(data) - 1}/{len(data)}"}, data[start:], etag)
+        else:
+            self._respond(200, {}, data, etag)
+
+    def _respond(self, status, headers=None, body=b"", etag=None):
+        self.server.statuses.append(status)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        # Transferência interrompida: o corpo é cortado no meio e a conexão, fechada
+        if body and self.server.cut_responses:
+            self.server.cut_responses -= 1
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / "www"
+    root.mkdir()
+    (root / "catalog.csv").write_bytes(CONTENT)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(CatalogHandler, directory=str(root)))
+    httpd.received = []
+    httpd.statuses = []
+    httpd.cut_responses = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/catalog.csv"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture(autouse=True)
+def _small_chunks(monkeypatch):
+    # Blocos pequenos: uma transferência cortada no meio já deixa parte do arquivo gravada no `.part`
+    monkeypatch.setattr(download_data, 'DOWNLOAD_CHUNK_SIZE', 4096)
+
+@pytest.fixture
+def session():
+    # Sem espera entre as novas tentativas da sessão
+    return create_session(backoff_factor=0)
+
+@pytest.fixture
+def output_path(tmp_path):
+    return str(tmp_path / "raw" / "catalog.csv")
+
+def test_downloads_the_whole_file(server, session, output_path):
+    assert download_file(server.url, output_path, session=session) == output_path
+
+    with open(output_path, 'rb') as file:
+        assert file.read() == CONTENT
+    assert not os.path.exists(f"{output_path}.part")
+    assert server.statuses == [200]
+
+def test_reuses_the_previous_download_on_304(server, session, output_path, tmp_path):
+    download_file(server.url, output_path, session=session)
+
+    other_path = str(tmp_path / "raw" / "other.csv")
+    assert download_file(server.url, other_path, session=session) == output_path
+    assert server.received[-1]['If-None-Match'] == _etag(CONTENT)
+    assert server.statuses == [200, 304]
+    assert not os.path.exists(other_path)
+
+def test_resumes_a_truncated_part_on_the_next_run(server, session, output_path):
+    server.cut_responses = 1
+    assert download_file(server.url, output_path, session=session, retries=0) is None
+    part_size = os.path.getsize(f"{output_path}.part")
+    assert 0 < part_size < len(CONTENT)
+
+    assert download_file(server.url, output_path, session=session) == output_path
+    assert server.received[-1]['Range'] == f"bytes={part_size}-"
+    assert server.received[-1]['If-Range'] == _etag(CONTENT)
+    assert server.statuses == [200, 206]
+    with open(output_path, 'rb') as file:
+        assert file.read() == CONTENT
+
+def test_retries_an_interrupted_transfer_from_where_it_stopped(server, session, output_path):
+    server.cut_responses = 1
+    chunks = []
+
+    path = download_file(server.url, output_path, session=session, retries=1, on_chunk=lambda chunk, position: chunks.append(position))
+
+    assert path == output_path
+    assert server.statuses == [200, 206]
+    # A nova tentativa continua do que já estava gravado, não do início
+    resumed_at = int(server.received[-1]['Range'][len("bytes="):-1])
+    assert 0 < resumed_at < len(CONTENT)
+    assert resumed_at in chunks
+    with open(output_path, 'rb') as file:
+        assert file.read() == CONTENT
+
+def test_discards_a_stale_part_on_416(server, session, output_path):
+    # Execução anterior que parou depois de receber tudo, antes de renomear o `.part`
+    os.makedirs(os.path.dirname(output_path))
+    part_path = f"{output_path}.part"
+    with open(part_path, 'wb') as file:
+        file.write(CONTENT)
+    with open(os.path.join(os.path.dirname(output_path), METADATA_FILE), 'w', encoding='utf-8') as file:
+        json.dump({server.url: {'partial': {'path': part_path, 'etag': _etag(CONTENT)}}}, file)
+
+    assert download_file(server.url, output_path, session=session) == output_path
+    assert server.statuses == [416, 200]
+    assert 'Range' not in server.received[-1]
+    assert not os.path.exists(part_path)
+    with open(output_path, 'rb') as file:
+        assert file.read() == CONTENT
+
+def test_returns_none_on_404(server, session, output_path):
+    url = server.url.replace("catalog.csv", "missing.csv")
+
+    assert download_file(url, output_path, session=session) is None
+    assert server.statuses == [404]
+    assert not os.path.exists(output_path)
@@ -0,0 +1,55 @@
+"""
+A análise incremental produz o mesmo resultado (inclusive a ordem das listas) que a agregação
+completa do mesmo snapshot.
+"""
+import csv
+import logging
+import random
+
+import pytest
+
+from benchmarks.synthetic_catalog import generate_catalog
+from src.models.model import read_csv_to_dto
+from src.services.incremental import run_incremental
+from src.utils.aggregator import aggregate
+
+ROWS = 2_000
+
+@pytest.fixture(autouse=True)
+def _quiet_logging():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+def _read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+def _write_rows(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(rows)
+
+def test_incremental_results_match_a_full_recompute(tmp_path):
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    state_path = str(tmp_path / "state.pkl")
+    generate_catalog(str(first), ROWS, seed=3)
+
+    header, *rows = _read_rows(first)
+    rng = random.Random(3)
+    # Títulos do início removidos e incluídos de novo no final, alguns removidos e a ordem embaralhada no meio
+    moved = rows[:50]
+    kept = rows[50:-50]
+    middle = kept[len(kept) // 3:2 * len(kept) // 3]
+    rng.shuffle(middle)
+    kept[len(kept) // 3:2 * len(kept) // 3] = middle
+    _write_rows(second, [header] + kept + moved)
+
+    run_incremental(str(first), state_path)
+    results, changes = run_incremental(str(second), state_path)
+
+    assert len(changes["removed"]) == 50
+    expected = aggregate(read_csv_to_dto(str(second)))
+    for name in ("directors_actors", "total_by_years", "titles_by_rating", "titles_by_country"):
+        assert results[name] == expected[name], name
+    assert results == expected
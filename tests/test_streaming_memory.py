@@ -0,0 +1,49 @@
+"""
+A leitura em blocos mantém a memória limitada: o pico da agregação não cresce com o número de linhas.
+"""
+import logging
+import tracemalloc
+
+import pytest
+
+from benchmarks.bench_streaming_memory import BOUNDED_METRICS, PROCESS_CACHES
+from benchmarks.synthetic_catalog import generate_catalog
+from src.models.model import read_csv_in_chunks
+from src.utils.aggregator import accumulate_chunks
+
+ROWS = 20_000
+FACTOR = 4
+CHUNK_SIZE = 2_000
+TOLERANCE = 1.5
+
+@pytest.fixture(autouse=True)
+def _quiet_logging():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+def _peak_memory(csv_path: str) -> int:
+    """Pico do tracemalloc de `accumulate_chunks`, partindo dos caches do processo vazios."""
+    for cache in PROCESS_CACHES:
+        cache.cache_clear()
+    tracemalloc.start()
+    try:
+        accumulate_chunks(read_csv_in_chunks(csv_path, CHUNK_SIZE), BOUNDED_METRICS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def test_streaming_peak_memory_does_not_grow_with_rows(tmp_path):
+    small = tmp_path / "small.csv"
+    large = tmp_path / "large.csv"
+    # Sementes diferentes: os dois catálogos têm nomes diferentes, com o mesmo número de nomes distintos
+    generate_catalog(str(small), ROWS, seed=1, names=ROWS * FACTOR)
+    generate_catalog(str(large), ROWS * FACTOR, seed=2, names=ROWS * FACTOR)
+
+    small_peak = _peak_memory(str(small))
+    large_peak = _peak_memory(str(large))
+
+    assert large_peak <= small_peak * TOLERANCE, (
+        f"Pico de {large_peak / 2 ** 20:.2f} MB com {FACTOR}× as linhas, contra {small_peak / 2 ** 20:.2f} MB"
+    )